@@ -0,0 +1,91 @@
+"""
+Benchmark load seluruh corpus komik: json.load penuh vs comicmeta.read_header
+vs model.Comic (yang dipakai existing_comics di scrapemulti.py).
+
+Setiap mode jalan di subprocess sendiri (supaya heap / max RSS tidak saling
+mempengaruhi) dan menyimpan semua hasil di dict seperti get_all_existing_comics().
+Dilaporkan waktu load, peak + retained memori Python (tracemalloc, ronde
+terpisah karena tracemalloc memperlambat) dan max RSS proses.
+
+    python bench/bench_load.py [--dir comics] [--rounds 3]
+"""
+import argparse, json, os, resource, statistics, subprocess, sys, time, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import comicmeta, model
+
+MODES = ("json", "header", "model")
+
+def load_json(directory):
+    existing = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.json'):
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            existing[data.get('url')] = data
+    return existing
+
+def load_header(directory):
+    return {h.get('url'): h for h in comicmeta.iter_headers(directory)}
+
+LOADERS = {"json": load_json, "header": load_header, "model": model.load_dir}
+
+def run_mode(mode, directory, rounds):
+    """Dijalankan di subprocess; cetak hasil sebagai JSON"""
+    loader = LOADERS[mode]
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = loader(directory)
+        times.append(time.perf_counter() - start)
+        del result
+    tracemalloc.start()
+    result = loader(directory)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(json.dumps({
+        "files": len(result),
+        "chapters": sum(len(r.get('chapters', [])) for r in result.values()),
+        "seconds": statistics.median(times),
+        "first": times[0],
+        "peak_mb": peak / 2**20,
+        "retained_mb": retained / 2**20,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark load corpus komik (json.load vs comicmeta)")
+    parser.add_argument('--dir', default=os.path.join(ROOT, "comics"))
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.dir, args.rounds)
+        return
+
+    size = sum(os.path.getsize(os.path.join(args.dir, f)) for f in os.listdir(args.dir) if f.endswith('.json'))
+    print(f"Corpus: {args.dir} ({size / 2**20:.1f} MB)")
+    results = {}
+    for mode in MODES:
+        out = subprocess.run([sys.executable, __file__, '--dir', args.dir, '--rounds', str(args.rounds), '--mode', mode],
+                             check=True, capture_output=True, text=True).stdout
+        results[mode] = json.loads(out)
+
+    print(f"{'mode':8} {'file':>6} {'chapter':>8} {'median s':>9} {'ronde 1':>8} {'peak MB':>8} {'retained':>9} {'max RSS':>8}")
+    for mode, r in results.items():
+        print(f"{mode:8} {r['files']:>6} {r['chapters']:>8} {r['seconds']:>9.2f} {r['first']:>8.2f} "
+              f"{r['peak_mb']:>8.1f} {r['retained_mb']:>9.1f} {r['rss_mb']:>8.1f}")
+    full = results["json"]
+    for mode in MODES[1:]:
+        light = results[mode]
+        if full['files'] != light['files'] or full['chapters'] != light['chapters']:
+            print(f"PERINGATAN: jumlah file/chapter {mode} berbeda dengan json")
+        print(f"{mode} vs json: waktu x{full['seconds'] / light['seconds']:.2f}, "
+              f"peak x{full['peak_mb'] / light['peak_mb']:.1f}, retained x{full['retained_mb'] / light['retained_mb']:.1f}, "
+              f"RSS x{full['rss_mb'] / light['rss_mb']:.1f}")
+
+if __name__ == "__main__":
+    main()
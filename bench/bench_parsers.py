@@ -0,0 +1,161 @@
+"""
+Micro-benchmark extractor scrape.py di atas fixture HTML komikindo (bench/fixtures).
+
+Untuk setiap extractor dilaporkan ops/detik (median beberapa ronde), alokasi
+per panggilan (tracemalloc) dan fingerprint output. Fingerprint ikut dicek
+terhadap baseline supaya perubahan hasil parsing (regresi atau markup baru)
+langsung kelihatan, bukan hanya perubahan kecepatan. Angka ops/detik hanya
+bisa dibandingkan dengan baseline yang dibuat di mesin yang sama.
+
+    python bench/bench_parsers.py                    # jalankan & bandingkan dengan baseline
+    python bench/bench_parsers.py --save-baseline    # simpan hasil sebagai baseline baru
+    python bench/bench_parsers.py -k chapter         # hanya case yang namanya mengandung 'chapter'
+"""
+import argparse, hashlib, json, os, statistics, sys, time, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(ROOT, "bench", "fixtures")
+BASELINE = os.path.join(ROOT, "bench", "baseline.json")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from bs4 import BeautifulSoup
+import scrape
+
+def fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+def parsed(name):
+    return BeautifulSoup(fixture(name), 'html.parser')
+
+# === CASES ===
+# (nama, setup() -> argumen, fungsi yang diukur)
+def list_posts():
+    s = parsed("list.html")
+    return (s.select('.listupd .animepost .animposx a[itemprop="url"]'),)
+
+def list_hrefs():
+    s = parsed("list.html")
+    return ([a.get('href') for a in s.find_all('a')],)
+
+CASES = [
+    ("soup:list", lambda: (fixture("list.html"),), lambda html: BeautifulSoup(html, 'html.parser')),
+    ("soup:detail_long", lambda: (fixture("detail_long.html"),), lambda html: BeautifulSoup(html, 'html.parser')),
+    ("soup:chapter_webtoon_long", lambda: (fixture("chapter_webtoon_long.html"),), lambda html: BeautifulSoup(html, 'html.parser')),
+    ("extract_title_from_list", list_posts, lambda posts: [scrape.extract_title_from_list(a) for a in posts]),
+    ("is_comic_url", list_hrefs, lambda hrefs: [scrape.is_comic_url(h) for h in hrefs]),
+    ("extract_comic_info:detail", lambda: (parsed("detail.html"),),
+     lambda s: _without_timestamp(scrape.extract_comic_info(s, "https://komikindo.ch/komik/x/", "X"))),
+    ("extract_comic_info:detail_long", lambda: (parsed("detail_long.html"),),
+     lambda s: _without_timestamp(scrape.extract_comic_info(s, "https://komikindo.ch/komik/x/", "X"))),
+    ("extract_chapters:detail", lambda: (parsed("detail.html"),), scrape.extract_chapters),
+    ("extract_chapters:detail_long", lambda: (parsed("detail_long.html"),), scrape.extract_chapters),
+    ("extract_chapter_images:chapter", lambda: (parsed("chapter.html"),), scrape.extract_chapter_images),
+    ("extract_chapter_images:webtoon_long", lambda: (parsed("chapter_webtoon_long.html"),), scrape.extract_chapter_images),
+]
+
+def _without_timestamp(info):
+    info.pop('scraped_at', None)
+    return info
+
+def fingerprint(result):
+    if isinstance(result, BeautifulSoup):
+        result = len(result.find_all(True))
+    data = json.dumps(result, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:12]
+
+# === RUNNER ===
+def run_case(setup, func, rounds, min_time):
+    args = setup()
+    result = func(*args)
+
+    # Kalibrasi jumlah loop supaya satu ronde >= min_time
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(*args)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(*args)
+        per_call.append((time.perf_counter() - start) / loops)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    stats = tracemalloc.take_snapshot().compare_to(before, 'filename')
+    tracemalloc.stop()
+    blocks = sum(max(stat.count_diff, 0) for stat in stats)
+
+    median = statistics.median(per_call)
+    return {
+        "ops_per_sec": round(1.0 / median, 2),
+        "median_ms": round(median * 1000, 4),
+        "stdev_ms": round(statistics.pstdev(per_call) * 1000, 4),
+        "alloc_peak_kib": round(peak / 1024, 1),
+        "retained_blocks": blocks,
+        "output": fingerprint(result),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extractor parser komikindo")
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='Durasi minimal satu ronde (detik)')
+    parser.add_argument('-k', dest='keyword', help='Hanya jalankan case yang namanya mengandung teks ini')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='Batas perlambatan relatif sebelum dianggap regresi (default 0.15)')
+    parser.add_argument('--json', metavar='FILE', help='Tulis hasil mentah ke file JSON')
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f).get("results", {})
+
+    results = {}
+    failures = []
+    print(f"{'case':38} {'ops/s':>10} {'median ms':>10} {'peak KiB':>9} {'retained':>8}  vs baseline")
+    for name, setup, func in CASES:
+        if args.keyword and args.keyword not in name:
+            continue
+        r = results[name] = run_case(setup, func, args.rounds, args.min_time)
+        note = ""
+        base = baseline.get(name)
+        if base:
+            delta = r["ops_per_sec"] / base["ops_per_sec"] - 1
+            note = f"{delta:+.1%}"
+            if delta < -args.tolerance:
+                note += " LEBIH LAMBAT"
+                failures.append(name)
+            if r["output"] != base["output"]:
+                note += " OUTPUT BERUBAH"
+                failures.append(name)
+        print(f"{name:38} {r['ops_per_sec']:>10.1f} {r['median_ms']:>10.3f} {r['alloc_peak_kib']:>9.1f} {r['retained_blocks']:>8}  {note}")
+
+    payload = {"python": sys.version.split()[0], "results": results}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+            f.write('\n')
+        print(f"Baseline disimpan: {args.baseline}")
+    if failures:
+        print(f"Regresi: {', '.join(sorted(set(failures)))}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark fetch chapter penuh (get + BeautifulSoup) vs chapterstream.fetch_images.
+
+Halaman chapter diambil dari rekaman transport.py (--record-dir) atau fixture
+bench/fixtures/chapter*.html, lalu dilayani server HTTP/1.1 lokal dengan
+gzip / identity. Rekaman / fixture hanya punya footer pendek; --pad-kb
+menambah markup komentar + script sebelum </body> untuk meniru halaman asli
+yang footer-nya besar. Per mode dilaporkan byte di kabel, byte setelah decode,
+waktu total, dan apakah images sama persis dengan jalur lama.
+
+    python bench/bench_stream.py [--record-dir recordings] [--encoding gzip] [--pad-kb 0]
+"""
+import argparse, glob, gzip, json, os, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bs4 import BeautifulSoup
+import chapterstream, extract_plan, metrics, transport
+
+FIXTURE_DIR = os.path.join(ROOT, "bench", "fixtures")
+
+def load_pages(record_dir):
+    pages = []
+    if record_dir:
+        for path in sorted(glob.glob(os.path.join(record_dir, '*', '*.gz'))):
+            with gzip.open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+            if meta['status'] == 200 and metrics.page_type(meta['url']) == "chapter":
+                pages.append(body)
+    if not pages:
+        for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, 'chapter*.html'))):
+            with open(path, 'rb') as f:
+                pages.append(f.read())
+    return pages
+
+def pad(page, kb):
+    """Tambah widget komentar / script footer sebelum </body>"""
+    filler, i = [], 0
+    while sum(map(len, filler)) < kb * 1024:
+        filler.append(f'<div class="comment" id="comment-{i}"><p>Komentar pembaca nomor {i} untuk chapter ini.</p></div>\n'
+                      f'<script>window.__ads = (window.__ads || []).concat([{{slot: "slot-{i}", size: [300, 250]}}]);</script>\n')
+        i += 1
+    return page.replace(b'</body>', ''.join(filler).encode('utf-8') + b'</body>', 1)
+
+def serve(pages, encoding):
+    bodies = [gzip.compress(p, 6) if encoding == "gzip" else p for p in pages]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def handle(self):
+            try:
+                super().handle()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client berhenti membaca di tengah body
+
+        def do_GET(self):
+            body = bodies[int(self.path.strip('/').split('-chapter-')[1])]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            if encoding != "identity":
+                self.send_header("Content-Encoding", encoding)
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def full(url):
+    r = transport.fetch(url)
+    r.encoding = 'utf-8'
+    images = extract_plan.CHAPTER_IMAGES.run(BeautifulSoup(r.text, 'html.parser')) or []
+    return images, transport.wire_bytes(r), len(r.content)
+
+def streamed(url):
+    before = metrics.REGISTRY.value("scraper_wire_bytes_total"), metrics.REGISTRY.value("scraper_decoded_bytes_total")
+    images, html = chapterstream.fetch_images(url, printer=lambda *a: None)
+    if images is None:
+        images = extract_plan.CHAPTER_IMAGES.run(BeautifulSoup(html, 'html.parser')) or []
+    return (images, metrics.REGISTRY.value("scraper_wire_bytes_total") - before[0],
+            metrics.REGISTRY.value("scraper_decoded_bytes_total") - before[1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming fetch halaman chapter")
+    parser.add_argument('--record-dir', help='Ambil halaman chapter dari rekaman transport.py (default fixture)')
+    parser.add_argument('--encoding', choices=("gzip", "identity"), default="gzip")
+    parser.add_argument('--pad-kb', type=int, default=0, help='Tambahan markup footer per halaman (KB)')
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    pages = [pad(p, args.pad_kb) for p in load_pages(args.record_dir)]
+    server = serve(pages, args.encoding)
+    base = f"http://127.0.0.1:{server.server_address[1]}/komik-chapter-"
+    urls = [f"{base}{i}/" for i in range(len(pages))]
+    print(f"{len(pages)} halaman chapter ({sum(map(len, pages)) / 1024:.0f} KB), Content-Encoding {args.encoding}")
+
+    results = {}
+    for name, fetch in (("penuh", full), ("stream", streamed)):
+        times = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            out = [fetch(url) for url in urls]
+            times.append(time.perf_counter() - start)
+        results[name] = out
+        wire = sum(o[1] for o in out)
+        decoded = sum(o[2] for o in out)
+        print(f"{name:7} kabel {wire / 1024:>8.1f} KB | decode {decoded / 1024:>8.1f} KB | "
+              f"{min(times) * 1000 / len(urls):>6.2f} ms/chapter")
+
+    same = sum(a[0] == b[0] for a, b in zip(results["penuh"], results["stream"]))
+    wire_full = sum(o[1] for o in results["penuh"])
+    wire_stream = sum(o[1] for o in results["stream"])
+    print(f"images sama: {same}/{len(urls)} | byte kabel dihemat {(wire_full - wire_stream) / 1024:.1f} KB "
+          f"({1 - wire_stream / wire_full:.0%}), rata-rata {(wire_full - wire_stream) / len(urls) / 1024:.1f} KB/chapter")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
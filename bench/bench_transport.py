@@ -0,0 +1,252 @@
+"""
+Benchmark backend fetch transport.py terhadap server test lokal.
+
+Dua server lokal melayani fixture HTML (bench/fixtures) dengan latency
+buatan per request dan Content-Encoding br/gzip sesuai Accept-Encoding:
+- HTTP/1.1 : http.server (ThreadingHTTPServer, keep-alive)
+- HTTP/2   : h2c (HTTP/2 tanpa TLS) di atas paket h2, stream dilayani paralel
+
+Mode yang dibandingkan (thread worker seperti scrapemulti.py):
+- requests/1.1 : backend lama, satu requests.Session per thread
+- httpx/1.1    : satu httpx.Client bersama, HTTP/1.1
+- httpx/2      : satu httpx.Client bersama, HTTP/2 multiplex di satu koneksi
+
+Dilaporkan request/detik, jumlah koneksi TCP yang dibuka ke server, dan byte
+di kabel vs byte setelah decode per page type (transport.wire_bytes).
+
+    python bench/bench_transport.py [--requests 300] [--threads 5] [--latency 0.05]
+"""
+import argparse, gzip, os, socket, socketserver, statistics, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests
+import metrics, transport
+
+try:
+    import h2.config, h2.connection, h2.events
+except ImportError:  # tanpa h2 mode httpx/2 dilewati
+    h2 = None
+
+FIXTURE_DIR = os.path.join(ROOT, "bench", "fixtures")
+# Campuran request seperti run update: sebagian besar halaman chapter
+PAGES = (("list", "/komik-terbaru/page/{i}/", "list.html", 1),
+         ("detail", "/komik/komik-{i}/", "detail.html", 2),
+         ("chapter", "/komik-{i}-chapter-{i}/", "chapter.html", 12))
+
+def load_pages():
+    pages = {}
+    for kind, _, name, _ in PAGES:
+        with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+            pages[kind] = f.read()
+    return pages
+
+def workload(count):
+    urls = []
+    cycle = [(kind, pattern) for kind, pattern, _, weight in PAGES for _ in range(weight)]
+    for i in range(count):
+        kind, pattern = cycle[i % len(cycle)]
+        urls.append(pattern.format(i=i))
+    return urls
+
+# === BODY TERKOMPRESI ===
+class Bodies:
+    def __init__(self, pages):
+        self.pages = pages
+        self.cache = {}
+
+    def get(self, path, accept):
+        kind = metrics.page_type(path)
+        offered = {part.split(';')[0].strip() for part in (accept or '').split(',')}
+        encoding = "br" if transport.brotli and "br" in offered else "gzip" if "gzip" in offered else "identity"
+        key = (kind, encoding)
+        if key not in self.cache:
+            raw = self.pages[kind]
+            if encoding == "br":
+                raw = transport.brotli.compress(raw)
+            elif encoding == "gzip":
+                raw = gzip.compress(raw, 6)
+            self.cache[key] = raw
+        return self.cache[key], encoding
+
+# === SERVER HTTP/1.1 ===
+def http1_server(bodies, latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # tanpa ini header + body kena delayed ACK 40 ms
+
+        def setup(self):
+            super().setup()
+            with server.lock:
+                server.connections += 1
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency)
+            body, encoding = bodies.get(self.path, self.headers.get('Accept-Encoding'))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            if encoding != "identity":
+                self.send_header("Content-Encoding", encoding)
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    return server
+
+# === SERVER HTTP/2 (h2c) ===
+class H2Handler(socketserver.BaseRequestHandler):
+    """Satu koneksi HTTP/2; tiap stream dijawab di thread sendiri supaya benar-benar paralel"""
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding='utf-8'))
+        self.cond = threading.Condition()
+        with self.cond:
+            self.conn.initiate_connection()
+            self.request.sendall(self.conn.data_to_send())
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                return
+            with self.cond:
+                events = self.conn.receive_data(data)
+                self.request.sendall(self.conn.data_to_send())
+                self.cond.notify_all()  # WindowUpdated: pengirim body yang menunggu boleh lanjut
+            for event in events:
+                if isinstance(event, h2.events.RequestReceived):
+                    threading.Thread(target=self.respond, args=(event.stream_id, dict(event.headers)), daemon=True).start()
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+
+    def respond(self, stream_id, headers):
+        time.sleep(self.server.latency)
+        body, encoding = self.server.bodies.get(headers[':path'], headers.get('accept-encoding'))
+        response = [(':status', '200'), ('content-type', 'text/html; charset=UTF-8'), ('content-length', str(len(body)))]
+        if encoding != "identity":
+            response.append(('content-encoding', encoding))
+        with self.cond:
+            self.conn.send_headers(stream_id, response)
+            self.request.sendall(self.conn.data_to_send())
+        while body:
+            with self.cond:
+                while min(self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size) <= 0:
+                    self.cond.wait()
+                size = min(self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size)
+                chunk, body = body[:size], body[size:]
+                self.conn.send_data(stream_id, chunk, end_stream=not body)
+                self.request.sendall(self.conn.data_to_send())
+
+def http2_server(bodies, latency):
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), H2Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.bodies = bodies
+    server.latency = latency
+    return server
+
+# === CLIENT ===
+def run(mode, base, urls, threads):
+    if mode == "requests/1.1":
+        fetcher = transport.Transport()
+        local = threading.local()
+
+        def session():
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+            return local.session
+    else:
+        fetcher = transport.Transport(backend="httpx", client=transport.make_client(
+            http2=mode == "httpx/2", prior_knowledge=mode == "httpx/2"))
+        session = lambda: None
+
+    stats = {}
+    lock = threading.Lock()
+    protocols = set()
+
+    def one(path):
+        start = time.perf_counter()
+        r = fetcher.fetch(base + path, session=session(), timeout=30)
+        r.raise_for_status()
+        elapsed = time.perf_counter() - start
+        kind = metrics.page_type(path)
+        with lock:
+            entry = stats.setdefault(kind, {"count": 0, "wire": 0, "decoded": 0, "latency": []})
+            entry["count"] += 1
+            entry["wire"] += transport.wire_bytes(r)
+            entry["decoded"] += len(r.content)
+            entry["latency"].append(elapsed)
+            protocols.add(transport.protocol(r))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(one, urls))
+    elapsed = time.perf_counter() - start
+    if fetcher.client is not None:
+        fetcher.client.close()
+    return elapsed, stats, protocols
+
+# === MAIN ===
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend HTTP transport.py (requests vs httpx HTTP/2)")
+    parser.add_argument('--requests', type=int, default=300, help='Jumlah request per mode (default 300)')
+    parser.add_argument('--threads', type=int, default=5, help='Thread worker (default 5, seperti MAX_THREADS)')
+    parser.add_argument('--latency', type=float, default=0.05, help='Latency server per request dalam detik (default 0.05)')
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    if transport.httpx is None:
+        sys.exit("Butuh httpx: pip install 'httpx[http2]'")
+    bodies = Bodies(load_pages())
+    servers = {"1.1": http1_server(bodies, args.latency)}
+    if h2 is not None:
+        servers["2"] = http2_server(bodies, args.latency)
+    for server in servers.values():
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    modes = ["requests/1.1", "httpx/1.1"] + (["httpx/2"] if h2 is not None else [])
+    urls = workload(args.requests)
+    print(f"{args.requests} request x {args.rounds} ronde, {args.threads} thread, latency server {args.latency * 1000:.0f} ms, "
+          f"Accept-Encoding: {transport.ACCEPT_ENCODING}")
+    print(f"{'mode':13} {'protokol':9} {'req/s':>8} {'koneksi':>8} {'p50 ms':>7} {'p95 ms':>7}")
+    results = {}
+    for mode in modes:
+        server = servers[mode.rsplit('/', 1)[1]]
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        rates, connections = [], []
+        for _ in range(args.rounds):
+            before = server.connections
+            elapsed, stats, protocols = run(mode, base, urls, args.threads)
+            rates.append(len(urls) / elapsed)
+            connections.append(server.connections - before)
+        latencies = sorted(x for entry in stats.values() for x in entry["latency"])
+        results[mode] = (statistics.median(rates), stats)
+        print(f"{mode:13} {','.join(sorted(protocols)):9} {statistics.median(rates):>8.1f} {max(connections):>8} "
+              f"{latencies[len(latencies) // 2] * 1000:>7.1f} {latencies[int(len(latencies) * 0.95)] * 1000:>7.1f}")
+
+    base_rate = results["requests/1.1"][0]
+    for mode in modes[1:]:
+        print(f"{mode} vs requests/1.1: req/s x{results[mode][0] / base_rate:.2f}")
+
+    print(f"\n{'page type':10} {'request':>8} {'kabel KB':>9} {'decode KB':>10} {'rasio':>6}   (ronde terakhir, {modes[-1]})")
+    for kind, entry in sorted(results[modes[-1]][1].items()):
+        print(f"{kind:10} {entry['count']:>8} {entry['wire'] / 1024:>9.1f} {entry['decoded'] / 1024:>10.1f} "
+              f"{entry['decoded'] / max(entry['wire'], 1):>6.1f}")
+
+    for server in servers.values():
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
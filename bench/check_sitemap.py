@@ -0,0 +1,124 @@
+"""
+Cek otomatis discovery sitemap.py di atas fixture bench/fixtures/sitemap (tanpa network).
+
+Fixture dipasang sebagai rekaman transport (mode replay) di folder sementara,
+lalu tiga run discovery dijalankan berurutan dengan state yang sama:
+
+1. run pertama (tanpa state): semua URL komik dari sitemap komik diantrekan,
+   termasuk isi komik-sitemap2.xml.gz; chapter, arsip /komik/ dan sitemap
+   non-komik tidak. Satu komik ditandai gagal.
+2. run kedua: sitemap anak yang <lastmod>-nya sama dilewati, hanya komik yang
+   gagal (pending) yang diantrekan lagi.
+3. run ketiga: index dan komik-sitemap.xml diganti versi dengan <lastmod>
+   lebih baru; hanya sitemap itu yang dibaca ulang dan hanya komik yang
+   berubah sejak `since` yang diantrekan.
+
+    python bench/check_sitemap.py      # exit 1 kalau ada hasil yang beda
+"""
+import os, sys, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import sitemap, transport
+
+BASE = sitemap.BASE_URL
+KOMIK = f"{BASE}/komik"
+FIRST_RUN = [  # urutan: lastmod terbaru dulu
+    f"{KOMIK}/contoh-komik-baru-sitemap/",
+    f"{KOMIK}/10-nen-buri-ni-saikai-shita-kusogaki-wa-seijun-bishoujo-jk-ni-seichou-shiteita/",
+    f"{KOMIK}/797922-1st-year-max-level-manager/",
+    f"{KOMIK}/1-million-times-attack-speed/",
+    f"{KOMIK}/393629-99-wooden-stick/",
+    f"{KOMIK}/1-nen-a-gumi-no-monster/",
+    f"{KOMIK}/10-nenmae-ni-time-leap-shite-osananajimi-no-ojousama-wo-tasuketara-iinazuke-ni-narimashita/",
+]
+FROM_GZ = {FIRST_RUN[0], FIRST_RUN[2], FIRST_RUN[6]}
+FAILED = FIRST_RUN[0]
+KNOWN = FIRST_RUN[5]  # sudah ada di corpus sebelum run pertama
+
+UPDATED_INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+	<sitemap><loc>{base}/komik-sitemap.xml</loc><lastmod>2025-06-07T00:00:00+00:00</lastmod></sitemap>
+	<sitemap><loc>{base}/komik-sitemap2.xml.gz</loc><lastmod>2025-06-05T11:00:00+07:00</lastmod></sitemap>
+</sitemapindex>
+"""
+UPDATED_KOMIK = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+	<url><loc>{komik}/393629-99-wooden-stick/</loc><lastmod>2025-06-01T08:00:00+07:00</lastmod></url>
+	<url><loc>{komik}/1-nen-a-gumi-no-monster/</loc><lastmod>2025-06-07T00:00:00+00:00</lastmod></url>
+</urlset>
+"""
+
+class Checker:
+    def __init__(self):
+        self.failures = []
+
+    def equal(self, name, got, expected):
+        ok = got == expected
+        print(f"   {'OK   ' if ok else 'GAGAL'} {name}")
+        if not ok:
+            print(f"         dapat:    {got!r}\n         harapan:  {expected!r}")
+            self.failures.append(name)
+
+def discover(state, existing, lines):
+    discovery = sitemap.Discovery(state)
+    found = discovery.run(existing, printer=lines.append)
+    return discovery, [c['url'] for c in found or []]
+
+def main():
+    check = Checker()
+    with tempfile.TemporaryDirectory() as tmp:
+        record_dir, state = os.path.join(tmp, "rec"), os.path.join(tmp, "sitemap_state.json")
+        sitemap.import_fixtures(record_dir, printer=lambda line: None)
+        transport.configure("replay", record_dir)
+        existing = {KNOWN: {"title": "1-nen A-gumi no Monster", "url": KNOWN}}
+
+        print("Run 1 (tanpa state)")
+        lines = []
+        discovery, queued = discover(state, existing, lines)
+        check.equal("URL komik yang diantrekan", queued, FIRST_RUN)
+        check.equal("isi sitemap .xml.gz ikut terbaca", FROM_GZ <= set(queued), True)
+        check.equal("sitemap anak yang dibaca", sorted(discovery.sitemaps),
+                    [f"{BASE}/komik-sitemap.xml", f"{BASE}/komik-sitemap2.xml.gz"])
+        for url in queued:
+            if url == FAILED:
+                discovery.mark_failed(url)
+            else:
+                discovery.mark_done(url)
+                existing[url] = {"title": sitemap.title_from_url(url), "url": url}
+        discovery.save(printer=lines.append)
+        saved = sitemap.Discovery(state).state
+        check.equal("since = lastmod terbaru", saved["since"], "2025-06-05T04:00:00+00:00")
+        check.equal("pending = komik yang gagal", saved["pending"], [FAILED])
+
+        print("Run 2 (sitemap tidak berubah)")
+        lines = []
+        discovery, queued = discover(state, existing, lines)
+        check.equal("sitemap anak dilewati", any("2 sitemap tidak berubah dilewati" in line for line in lines), True)
+        check.equal("hanya pending yang diantrekan", queued, [FAILED])
+        discovery.mark_done(FAILED)
+        discovery.save(printer=lines.append)
+        saved = sitemap.Discovery(state).state
+        check.equal("pending kosong setelah selesai", saved["pending"], [])
+        check.equal("since tetap", saved["since"], "2025-06-05T04:00:00+00:00")
+
+        print("Run 3 (komik-sitemap.xml berubah)")
+        for name, body in (("sitemap_index.xml", UPDATED_INDEX), ("komik-sitemap.xml", UPDATED_KOMIK)):
+            transport.write_record(record_dir, f"{BASE}/{name}", 200, {"content-type": "application/xml"},
+                                   body.format(base=BASE, komik=KOMIK).encode('utf-8'))
+        lines = []
+        discovery, queued = discover(state, existing, lines)
+        check.equal("hanya sitemap yang berubah dibaca ulang", any("1 sitemap tidak berubah dilewati" in line for line in lines), True)
+        check.equal("hanya komik yang berubah sejak since", queued, [KNOWN])
+        discovery.mark_done(KNOWN)
+        discovery.save(printer=lines.append)
+        check.equal("since maju", sitemap.Discovery(state).state["since"], "2025-06-07T00:00:00+00:00")
+
+    if check.failures:
+        print(f"Gagal: {len(check.failures)} cek")
+        sys.exit(1)
+    print("Semua cek sitemap lolos")
+
+if __name__ == "__main__":
+    main()
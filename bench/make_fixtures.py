@@ -0,0 +1,166 @@
+"""
+Bangun ulang fixture HTML komikindo untuk benchmark parser dari data di comics/.
+
+Markup meniru tema komikindo (struktur yang dipakai selector di scrape.py).
+Fixture hasil generate di-commit, jadi script ini hanya perlu dijalankan lagi
+kalau markup situs berubah dan fixture perlu disesuaikan:
+
+    python bench/make_fixtures.py
+"""
+import json, os, sys
+from html import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMICS_DIR = os.path.join(ROOT, "comics")
+FIXTURE_DIR = os.path.join(ROOT, "bench", "fixtures")
+
+# Komik sumber: satu standar, satu dengan chapter list sangat panjang,
+# dan satu webtoon dengan chapter sangat panjang (ratusan gambar)
+DETAIL_SOURCE = "Absolute-Sword-Sense.json"
+DETAIL_LONG_SOURCE = "Apotheosis.json"
+WEBTOON_SOURCE = "+99-Wooden-Stick.json"
+LIST_SIZE = 30
+
+HEADER = """<!DOCTYPE html>
+<html lang="id"><head><meta charset="UTF-8"><title>{title} - Komikindo</title>
+<link rel="stylesheet" href="https://komikindo.ch/wp-content/themes/komikindo/style.css">
+<script type="text/javascript">var ajaxurl = "https://komikindo.ch/wp-admin/admin-ajax.php";</script>
+</head><body class="wp-theme-komikindo">
+<div id="header"><div class="container"><a class="logo" href="https://komikindo.ch/"><img src="https://komikindo.ch/wp-content/uploads/logo.png" alt="Komikindo"></a>
+<ul class="menu"><li><a href="https://komikindo.ch/">Home</a></li><li><a href="https://komikindo.ch/daftar-manga/">Daftar Komik</a></li><li><a href="https://komikindo.ch/komik-terbaru/">Komik Terbaru</a></li></ul>
+<form class="search" action="https://komikindo.ch/"><input type="text" name="s" placeholder="Search..."></form></div></div>
+"""
+
+FOOTER = """<div id="comments" class="comments-area"><div id="disqus_thread"></div>
+<script>var disqus_config = function () { this.page.url = "{url}"; };</script>
+<script src="https://komikindo.disqus.com/embed.js" async></script></div>
+<div class="widget related"><h3>Komik Populer</h3><ul>{related}</ul></div>
+<div id="footer"><div class="container"><p>Baca komik online bahasa Indonesia gratis. Semua komik di website ini hanya preview dari komik aslinya.</p>
+<p>&copy; 2025 Komikindo</p></div></div>
+<script src="https://komikindo.ch/wp-includes/js/jquery/jquery.min.js"></script>
+<script src="https://komikindo.ch/wp-content/themes/komikindo/js/script.js"></script>
+</body></html>
+"""
+
+def load(name):
+    with open(os.path.join(COMICS_DIR, name), encoding='utf-8') as f:
+        return json.load(f)
+
+def related(comics):
+    return ''.join(f'<li><a href="{escape(c["url"])}">{escape(c["title"])}</a></li>' for c in comics)
+
+def chapter_url(comic, ch):
+    return ch.get('url') or f'{comic["url"].rstrip("/")}-chapter-{ch["number"]}/'
+
+# === LIST PAGE ===
+def list_page(comics):
+    posts = []
+    for c in comics:
+        latest = c['chapters'][-1] if c['chapters'] else {"number": "1"}
+        posts.append(f"""<div class="animepost"><div class="animposx">
+<a href="{escape(c['url'])}" title="Komik {escape(c['title'])}" itemprop="url" rel="bookmark">
+<div class="limit"><div class="typeflag {escape(c.get('type') or 'Manga')}"></div>
+<img src="{escape(c.get('cover_image') or '')}" alt="Komik {escape(c['title'])}" itemprop="image" loading="lazy"></div>
+<div class="bigors"><div class="tt"><h4>Komik {escape(c['title'])}</h4></div></div></a>
+<div class="adds"><div class="lsch"><a href="{escape(chapter_url(c, latest))}">Ch.{escape(latest['number'])}</a><span class="datech">{escape(latest.get('date', ''))}</span></div></div>
+</div></div>""")
+    body = f"""<div id="content"><div class="postbody"><div class="bixbox">
+<div class="releases"><h1>Komik Terbaru</h1></div>
+<div class="listupd">
+{chr(10).join(posts)}
+</div>
+<div class="pagination"><span aria-current="page" class="page-numbers current">1</span>
+<a class="page-numbers" href="https://komikindo.ch/komik-terbaru/page/2/">2</a>
+<a class="page-numbers" href="https://komikindo.ch/komik-terbaru/page/3/">3</a>
+<a class="next page-numbers" href="https://komikindo.ch/komik-terbaru/page/2/">Next &raquo;</a></div>
+</div></div></div>
+"""
+    return (HEADER.format(title="Komik Terbaru") + body
+            + FOOTER.replace("{url}", "https://komikindo.ch/komik-terbaru/").replace("{related}", related(comics[:8])))
+
+# === DETAIL PAGE ===
+def detail_page(c, others):
+    chapters = []
+    for ch in reversed(c['chapters']):  # situs menampilkan chapter terbaru di atas
+        url = escape(chapter_url(c, ch))
+        chapters.append(f'<li><span class="lchx"><a href="{url}">Chapter <chapter>{escape(ch["number"])}</chapter></a></span>'
+                        f'<span class="dt"><a href="{url}">{escape(ch.get("date", ""))}</a></span></li>')
+    synopsis = ''.join(f'<p>{escape(line)}</p>' for line in c.get('synopsis', '').split('\n'))
+    body = f"""<div id="content"><div class="postbody"><article id="post-1" class="post-1 manga type-manga">
+<div class="infoanime">
+<div class="thumb"><img src="{escape(c.get('cover_image') or '')}" alt="Komik {escape(c['title'])}" itemprop="image"></div>
+<div class="infox"><h1 class="entry-title" itemprop="name">Komik {escape(c['title'])}</h1>
+<div class="spe">
+<span><b>Judul Alternatif:</b> {escape(', '.join(c.get('alternative_titles', [])))}</span>
+<span><b>Status:</b> {escape(c.get('status', ''))}</span>
+<span><b>Pengarang:</b> {escape(', '.join(c.get('author', [])))}</span>
+<span><b>Ilustrator:</b> {escape(', '.join(c.get('illustrator', [])))}</span>
+<span><b>Grafis:</b> <a href="https://komikindo.ch/grafis/{escape(c.get('demographic', '').lower())}/">{escape(c.get('demographic', ''))}</a></span>
+<span><b>Tema:</b> {', '.join(f'<a href="https://komikindo.ch/tema/{escape(t.lower())}/">{escape(t)}</a>' for t in c.get('themes', []))}</span>
+<span><b>Jenis Komik:</b> <a href="https://komikindo.ch/jenis-komik/{escape(c.get('type', '').lower())}/">{escape(c.get('type', ''))}</a></span>
+</div>
+<div class="genre-info">{''.join(f'<a href="https://komikindo.ch/genres/{escape(g.lower())}/" rel="tag">{escape(g)}</a>' for g in c.get('genres', []))}</div>
+</div>
+<div class="rtg"><div class="ratingmanga" itemprop="aggregateRating" itemscope itemtype="https://schema.org/AggregateRating">
+<i itemprop="ratingValue">{c.get('rating', 0.0)}</i><div class="votescount">{c.get('votes', 0)} Votes</div></div></div>
+</div>
+<div class="desc"><div class="entry-content entry-content-single" itemprop="description">
+<p>{escape(c.get('type') or 'Manga')} {escape(c['title'])} yang dibuat oleh komikus bernama</p>
+{synopsis}
+</div></div>
+<div class="listinfo"><ul><li><b>Chapter Terbaru:</b> <span class="datech">{escape(c['chapters'][-1].get('date', '') if c['chapters'] else '')}</span></li></ul></div>
+<div class="bxcl scrolling" id="chapter_list"><ul>
+{chr(10).join(chapters)}
+</ul></div>
+</article></div></div>
+"""
+    return (HEADER.format(title=f"Komik {escape(c['title'])}") + body
+            + FOOTER.replace("{url}", escape(c['url'])).replace("{related}", related(others)))
+
+# === CHAPTER PAGE ===
+def chapter_page(c, ch, others, lazy=False):
+    if lazy:
+        # Webtoon panjang: gambar di-lazy-load, hanya data-src yang berisi URL
+        imgs = ''.join(f'<img data-src="{escape(src)}" class="lazyload" alt="{escape(c["title"])} Chapter {escape(ch["number"])} - {i}">'
+                       for i, src in enumerate(ch['images'], 1))
+    else:
+        imgs = ''.join(f'<img src="{escape(src)}" alt="{escape(c["title"])} Chapter {escape(ch["number"])} - {i}" width="720">'
+                       for i, src in enumerate(ch['images'], 1))
+    body = f"""<div id="content"><div class="postbody"><article>
+<div class="dtlx"><h1 class="entry-title">{escape(c['title'])} Chapter {escape(ch['number'])}</h1>
+<div class="allc">Semua chapter ada di <a href="{escape(c['url'])}">{escape(c['title'])}</a></div></div>
+<div class="navig"><div class="nextprev"><a href="{escape(c['url'])}" rel="prev">Prev</a><a href="{escape(c['url'])}" rel="next">Next</a></div></div>
+<div class="chapter-area"><div class="chapter-content">
+<div class="img-landmine" id="Baca_Komik">{imgs}</div>
+</div></div>
+<div class="navig"><div class="nextprev"><a href="{escape(c['url'])}" rel="prev">Prev</a><a href="{escape(c['url'])}" rel="next">Next</a></div></div>
+</article></div></div>
+"""
+    return (HEADER.format(title=f"{escape(c['title'])} Chapter {escape(ch['number'])}") + body
+            + FOOTER.replace("{url}", escape(chapter_url(c, ch))).replace("{related}", related(others)))
+
+def write(name, html):
+    path = os.path.join(FIXTURE_DIR, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    print(f"   {name}: {len(html.encode('utf-8')) / 1024:.0f} KiB")
+
+if __name__ == "__main__":
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    names = sorted(f for f in os.listdir(COMICS_DIR) if f.endswith('.json'))
+    if not names:
+        sys.exit("comics/ kosong, tidak bisa generate fixture")
+    listing = [load(n) for n in names[:LIST_SIZE]]
+    for c in listing:
+        c['chapters'] = c['chapters'][-1:]
+
+    detail = load(DETAIL_SOURCE)
+    detail_long = load(DETAIL_LONG_SOURCE)
+    webtoon = load(WEBTOON_SOURCE)
+    longest = max(webtoon['chapters'], key=lambda ch: len(ch['images']))
+
+    write("list.html", list_page(listing))
+    write("detail.html", detail_page(detail, listing[:8]))
+    write("detail_long.html", detail_page(detail_long, listing[:8]))
+    write("chapter.html", chapter_page(detail, detail['chapters'][-1], listing[:8]))
+    write("chapter_webtoon_long.html", chapter_page(webtoon, longest, listing[:8], lazy=True))
@@ -0,0 +1,112 @@
+"""
+Batas waktu run (--deadline / --time-budget).
+
+Biaya setiap job diperkirakan dari latency request yang sudah terukur di
+metrics (p90 per page type + rata-rata parse) ditambah jeda antar chapter.
+Job yang perkiraannya melewati sisa waktu (dikurangi RESERVE untuk flush dan
+laporan) tidak dimulai; chapter loop berhenti sebelum request yang tidak
+akan sempat selesai. Semua yang ditunda dicatat dan diringkas di akhir run,
+opsional ditulis ke JSON (--deferred-out) untuk run berikutnya.
+"""
+import json, re, threading, time
+from datetime import datetime, timedelta
+import metrics
+
+# === KONFIGURASI ===
+DEFAULT_REQUEST_SECONDS = 3.0   # sebelum ada request yang terukur
+SAFETY = 1.25                   # pengali perkiraan biaya
+RESERVE = 30.0                  # detik yang disisakan untuk simpan + laporan
+
+def parse_deadline(value):
+    """'23:30' (hari ini / besok kalau sudah lewat), '2026-01-31 23:30' atau ISO -> epoch"""
+    value = value.strip()
+    if re.fullmatch(r'\d{1,2}:\d{2}', value):
+        hour, minute = map(int, value.split(':'))
+        target = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target <= datetime.now():
+            target += timedelta(days=1)
+        return target.timestamp()
+    return datetime.fromisoformat(value).timestamp()
+
+# === BUDGET ===
+class Budget:
+    def __init__(self, deadline=None):
+        self.deadline = deadline
+        self.deferred = []
+        self.lock = threading.Lock()
+
+    def remaining(self):
+        return None if self.deadline is None else self.deadline - time.time()
+
+    def request_seconds(self, kind):
+        hists = metrics.REGISTRY.histograms("scraper_request_seconds")
+        hist = hists.get((("page_type", kind),))
+        if not hist or not hist.count:
+            measured = [h for h in hists.values() if h.count]
+            hist = max(measured, key=lambda h: h.count) if measured else None
+        latency = hist.quantile(0.9) if hist else DEFAULT_REQUEST_SECONDS
+        requests_done = sum(h.count for h in hists.values())
+        parse = metrics.REGISTRY.value("scraper_parse_seconds")
+        return latency + (parse / requests_done if requests_done else 0.0)
+
+    def cost(self, chapters, delay=0.0, detail=True):
+        """Perkiraan detik untuk 1 halaman detail (opsional) + N chapter"""
+        seconds = chapters * (self.request_seconds("chapter") + delay)
+        if detail:
+            seconds += self.request_seconds("detail")
+        return seconds
+
+    def allows(self, seconds):
+        remaining = self.remaining()
+        return remaining is None or remaining - RESERVE >= seconds * SAFETY
+
+    def defer(self, title, url, reason, chapters=None):
+        metrics.inc("scraper_deferred_total", reason=reason)
+        with self.lock:
+            self.deferred.append({"title": title, "url": url, "reason": reason, "chapters": chapters})
+
+    def summary(self, printer=print):
+        if self.deadline is None:
+            return
+        remaining = self.remaining()
+        printer(f"   Budget waktu: sisa {remaining:.0f}s dari deadline "
+                f"{datetime.fromtimestamp(self.deadline).strftime('%Y-%m-%d %H:%M:%S')}")
+        if not self.deferred:
+            printer("   Tidak ada pekerjaan yang ditunda.")
+            return
+        by_reason = {}
+        for item in self.deferred:
+            count, chapters = by_reason.get(item['reason'], (0, 0))
+            by_reason[item['reason']] = (count + 1, chapters + (item['chapters'] or 0))
+        printer("   Ditunda: " + ", ".join(f"{reason} {count} komik (~{chapters} chapter)"
+                                         for reason, (count, chapters) in sorted(by_reason.items())))
+        for item in self.deferred[:10]:
+            printer(f"      - {item['title']} ({item['reason']}, ~{item['chapters'] or '?'} chapter)")
+        if len(self.deferred) > 10:
+            printer(f"      ... dan {len(self.deferred) - 10} lainnya")
+
+# === HELPER UNTUK SCRIPT ===
+BUDGET = Budget()
+OUTPUT = None
+
+def configure(deadline=None, time_budget=None, output=None):
+    global BUDGET, OUTPUT
+    candidates = [d for d in (deadline, time.time() + time_budget if time_budget else None) if d]
+    BUDGET = Budget(min(candidates) if candidates else None)
+    OUTPUT = output
+
+def cost(chapters, delay=0.0, detail=True):
+    return BUDGET.cost(chapters, delay, detail)
+
+def allows(seconds):
+    return BUDGET.allows(seconds)
+
+def defer(title, url, reason, chapters=None):
+    BUDGET.defer(title, url, reason, chapters)
+
+def finish(printer=print):
+    BUDGET.summary(printer)
+    if OUTPUT and BUDGET.deadline is not None:
+        with open(OUTPUT, 'w', encoding='utf-8') as f:
+            json.dump(BUDGET.deferred, f, ensure_ascii=False, indent=2)
+        printer(f"   Daftar tunda ditulis ke {OUTPUT}")
@@ -0,0 +1,221 @@
+"""
+Change feed append-only (JSON Lines) per run, ditulis setiap save_comic().
+
+Setiap run menulis feed/<run>.jsonl. Satu baris = satu event:
+
+    {"run": ..., "seq": 12, "ts": "...", "type": "new_chapter", "url": <url komik>,
+     "title": ..., "data": {"number": ..., "url": ..., "date": ..., "dated_at": ..., "images": [...]}}
+
+Tipe event: new_comic (metadata tanpa chapters), new_chapter, chapter_update
+(images berubah), metadata_change (field lama/baru), title_change, url_change
+(record lama di-remap ke URL baru oleh dedup).
+
+Pembanding ("baseline") diambil saat record di-load dari disk dan diperbarui
+setiap kali record disimpan, jadi hanya delta yang masuk feed.
+
+Consumer menyimpan byte offset per file feed. Beberapa run bisa menulis ke
+file masing-masing secara bersamaan, jadi file yang urut lebih awal tetap
+dibaca kalau bertambah setelah offset di-commit:
+
+    python changefeed.py read --consumer reader-app [--commit] [--limit 1000]
+    python changefeed.py offsets
+"""
+import argparse, json, os, sys, threading, time
+from datetime import datetime
+import shard
+
+# === KONFIGURASI ===
+FEED_DIR = "feed"
+OFFSETS_FILE = "offsets.json"
+META_FIELDS = ("cover_image", "alternative_titles", "status", "author", "illustrator", "type",
+               "demographic", "themes", "genres", "rating", "votes", "synopsis", "last_updated")
+
+def images_key(images):
+    return hash(tuple(images or ()))
+
+def summarize(record):
+    """Ringkasan kecil record untuk diff berikutnya"""
+    return {
+        "url": record.get('url'),
+        "title": record.get('title'),
+        "meta": {field: record.get(field) for field in META_FIELDS},
+        # Nomor bisa dobel (mis. '276.HQ' dua kali): kunci nomor + url
+        "chapters": {shard.chapter_key(ch): images_key(ch.get('images')) for ch in record.get('chapters', [])},
+    }
+
+# === WRITER ===
+class ChangeFeed:
+    def __init__(self, feed_dir=FEED_DIR, run_id=None):
+        self.feed_dir = feed_dir
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.path = os.path.join(feed_dir, f"{self.run_id}.jsonl")
+        self.baselines = {}
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.counts = {}
+        self.file = None
+
+    def remember(self, record):
+        """Catat keadaan record seperti di disk (dipanggil saat load)"""
+        if record.get('url'):
+            with self.lock:
+                self.baselines[record['url']] = summarize(record)
+
+    def rename(self, old_url, new_url):
+        """URL komik berubah (remap dedup): baseline lama dipakai untuk URL baru"""
+        with self.lock:
+            if old_url in self.baselines:
+                self.baselines[new_url] = self.baselines.pop(old_url)
+
+    def diff(self, old, record):
+        url, title = record['url'], record.get('title')
+        if old is None:
+            yield "new_comic", {k: v for k, v in record.items() if k != 'chapters'}
+        else:
+            if old.get('url', url) != url:
+                yield "url_change", {"old": old['url'], "new": url}
+            if old['title'] != title:
+                yield "title_change", {"old": old['title'], "new": title}
+            changed = {f: {"old": old['meta'].get(f), "new": record.get(f)}
+                       for f in META_FIELDS if old['meta'].get(f) != record.get(f)}
+            if changed:
+                yield "metadata_change", changed
+        old_chapters = old['chapters'] if old else {}
+        for ch in record.get('chapters', []):
+            before = old_chapters.get(shard.chapter_key(ch))
+            if before is None:
+                yield "new_chapter", ch
+            elif before != images_key(ch.get('images')):
+                yield "chapter_update", ch
+
+    def record_save(self, record):
+        """Tulis event untuk perubahan record sejak baseline; return jumlah event"""
+        url = record.get('url')
+        if not url:
+            return 0
+        with self.lock:
+            events = list(self.diff(self.baselines.get(url), record))
+            self.baselines[url] = summarize(record)
+            if not events:
+                return 0
+            if self.file is None:
+                os.makedirs(self.feed_dir, exist_ok=True)
+                self.file = open(self.path, 'a', encoding='utf-8')
+            ts = datetime.now().isoformat(timespec='seconds')
+            for kind, data in events:
+                self.seq += 1
+                self.counts[kind] = self.counts.get(kind, 0) + 1
+                self.file.write(json.dumps({"run": self.run_id, "seq": self.seq, "ts": ts, "type": kind,
+                                            "url": url, "title": record.get('title'), "data": data},
+                                           ensure_ascii=False) + '\n')
+            self.file.flush()
+            return len(events)
+
+    def close(self, printer=print):
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+                printer(f"   Change feed: {self.seq} event ke {self.path} "
+                        f"({', '.join(f'{k}={v}' for k, v in sorted(self.counts.items()))})")
+
+# === HELPER UNTUK SCRIPT ===
+FEED = None
+
+def configure(feed_dir=FEED_DIR):
+    """feed_dir None = feed mati"""
+    global FEED
+    FEED = ChangeFeed(feed_dir) if feed_dir else None
+
+def remember(record):
+    if FEED:
+        FEED.remember(record)
+
+def rename(old_url, new_url):
+    if FEED:
+        FEED.rename(old_url, new_url)
+
+def record_save(record):
+    return FEED.record_save(record) if FEED else 0
+
+def finish(printer=print):
+    if FEED:
+        FEED.close(printer)
+
+# === CONSUMER ===
+def load_offsets(feed_dir):
+    path = os.path.join(feed_dir, OFFSETS_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def run_order(name):
+    """'YYYYMMDD-HHMMSS-pid.jsonl' -> urutan waktu lalu pid numerik"""
+    stamp, _, pid = name[:-len('.jsonl')].rpartition('-')
+    return (stamp, int(pid)) if pid.isdigit() else (name, 0)
+
+def feed_files(feed_dir):
+    if not os.path.isdir(feed_dir):
+        return []
+    return sorted((f for f in os.listdir(feed_dir) if f.endswith('.jsonl')), key=run_order)
+
+def commit(feed_dir, consumer, positions):
+    """Simpan offset consumer: {nama file: byte offset setelah event terakhir yang diproses}"""
+    offsets = load_offsets(feed_dir)
+    files = offsets.get(consumer, {}).get('files', {})
+    files.update(positions)
+    offsets[consumer] = {"files": files, "committed_at": time.strftime('%Y-%m-%d %H:%M:%S')}
+    tmp = os.path.join(feed_dir, f"{OFFSETS_FILE}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(offsets, f, indent=2)
+    os.replace(tmp, os.path.join(feed_dir, OFFSETS_FILE))
+
+def read_events(feed_dir, consumer):
+    """Yield (posisi, event) setelah offset consumer di setiap file. Baris yang
+    belum lengkap (run masih menulis) dilewati sampai baca berikutnya."""
+    start = load_offsets(feed_dir).get(consumer, {}).get('files', {})
+    for name in feed_files(feed_dir):
+        path = os.path.join(feed_dir, name)
+        if start.get(name, 0) >= os.path.getsize(path):
+            continue
+        with open(path, 'rb') as f:
+            f.seek(start.get(name, 0))
+            for line in iter(f.readline, b''):
+                if not line.endswith(b'\n'):
+                    break
+                yield (name, f.tell()), json.loads(line)
+
+# === CLI ===
+def main():
+    parser = argparse.ArgumentParser(description="Baca change feed komik per consumer")
+    parser.add_argument('--feed-dir', default=FEED_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    rd = sub.add_parser('read', help='Cetak event baru (JSON Lines) sejak offset consumer')
+    rd.add_argument('--consumer', required=True)
+    rd.add_argument('--limit', type=int, help='Maksimum event yang dibaca')
+    rd.add_argument('--commit', action='store_true', help='Simpan offset setelah event terakhir yang dicetak')
+    sub.add_parser('offsets', help='Daftar offset consumer')
+    args = parser.parse_args()
+
+    if args.command == 'offsets':
+        for consumer, pos in sorted(load_offsets(args.feed_dir).items()):
+            print(f"{consumer:20} {len(pos['files'])} file  ({pos['committed_at']})")
+            for name, offset in sorted(pos['files'].items(), key=lambda item: run_order(item[0])):
+                print(f"{'':20}   {name}:{offset}")
+        return
+
+    positions, count = {}, 0
+    for (name, offset), event in read_events(args.feed_dir, args.consumer):
+        sys.stdout.write(json.dumps(event, ensure_ascii=False) + '\n')
+        positions[name] = offset
+        count += 1
+        if args.limit and count >= args.limit:
+            break
+    if args.commit and positions:
+        commit(args.feed_dir, args.consumer, positions)
+    print(f"{count} event" + (f", offset {len(positions)} file di-commit" if args.commit and positions else ""),
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Fetch halaman chapter secara streaming dan berhenti begitu container gambar selesai.
+
+extract_chapter_images() hanya butuh container #Baca_Komik / .chapter-image,
+tapi get() mengunduh seluruh halaman (komentar, widget, script footer), lalu
+r.text dan BeautifulSoup memproses semuanya. Dengan --stream-chapters body
+dibaca per chunk (iter_content / httpx iter_bytes) dan langsung di-feed ke
+HTMLParser incremental; setelah tag penutup container yang berisi gambar,
+pembacaan berhenti dan koneksi ditutup (HTTP/2: hanya stream-nya yang di-reset).
+
+Container dicari sesuai kandidat extract_plan.CHAPTER_IMAGES, tapi dalam
+urutan dokumen (container pertama yang berisi gambar). Kalau sampai akhir
+halaman tidak ada container yang cocok, HTML lengkap dikembalikan untuk parse
+penuh seperti biasa. Cache HTML menyimpan potongan halaman s.d. container
+(cukup untuk reprocess images).
+
+Byte yang tidak diunduh dihitung dari Content-Length (kalau server
+mengirimnya) dan dicetak per chapter; totalnya di metrics
+scraper_stream_saved_bytes_total.
+"""
+import codecs, threading, time
+from html.parser import HTMLParser
+import metrics, transport, html_cache
+
+# === KONFIGURASI ===
+CHUNK_SIZE = 8192
+IMG_ATTRS = ("src", "data-src", "data-lazy-src", "data-original")  # sama dengan extract_plan.parse_images
+CONTAINERS = (  # (selector extract_plan, tag, id, class)
+    ('div#Baca_Komik', 'div', 'Baca_Komik', None),
+    ('div.chapter-image', 'div', None, 'chapter-image'),
+    ('.reader-area', None, None, 'reader-area'),
+    ('.chapter-body', None, None, 'chapter-body'),
+)
+
+# === PARSER INCREMENTAL ===
+class ImageParser(HTMLParser):
+    """Kumpulkan src img di container chapter; done = container berisi gambar sudah ditutup"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.selector = None   # container yang sedang dibaca
+        self.tag = None
+        self.depth = 0
+        self.images, self.seen = [], set()
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self.selector is None:
+            attrs = dict(attrs)
+            classes = (attrs.get('class') or '').split()
+            for selector, want_tag, want_id, want_class in CONTAINERS:
+                if ((want_tag is None or tag == want_tag) and (want_id is None or attrs.get('id') == want_id)
+                        and (want_class is None or want_class in classes)):
+                    self.selector, self.tag, self.depth = selector, tag, 1
+                    return
+            return
+        if tag == 'img':
+            self.handle_img(dict(attrs))
+        elif tag == self.tag:
+            self.depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self.selector is not None and tag == 'img' and not self.done:
+            self.handle_img(dict(attrs))
+
+    def handle_endtag(self, tag):
+        if self.selector is None or self.done or tag != self.tag:
+            return
+        self.depth -= 1
+        if self.depth:
+            return
+        if self.images:
+            self.done = True
+        else:
+            self.selector = None  # container kosong: cari kandidat berikutnya
+
+    def handle_img(self, attrs):
+        src = next((attrs[a] for a in IMG_ATTRS if attrs.get(a)), None)
+        if src and src.startswith(('http://', 'https://')):
+            src = src.split('?')[0].strip()
+            if src not in self.seen:
+                self.seen.add(src)
+                self.images.append(src)
+
+def parse(html):
+    """images dari HTML yang sudah ada (mis. cache), atau None kalau container tidak ketemu"""
+    parser = ImageParser()
+    parser.feed(html)
+    return parser.images if parser.done else None
+
+# === FETCH ===
+ENABLED = False
+_lock = threading.Lock()
+_totals = {"stopped": 0, "full": 0, "read": 0, "saved": 0, "known": 0}
+
+def configure(enabled=False):
+    global ENABLED
+    ENABLED = enabled
+
+def fetch_images(url, session=None, headers=None, printer=print):
+    """(images, None) kalau container ketemu; (None, html lengkap) kalau perlu parse
+    penuh; (None, None) kalau fetch gagal"""
+    cached = html_cache.lookup(url)
+    if cached is not None:
+        images = parse(cached)
+        return (images, None) if images is not None else (None, cached)
+
+    start = time.perf_counter()
+    parser = ImageParser()
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    parts, read = [], 0
+    try:
+        with transport.stream(url, session=session, headers=headers, timeout=15) as r:
+            r.raise_for_status()
+            total = int(r.headers.get('content-length') or 0) or None
+            encoding = r.headers.get('content-encoding') or "identity"
+            for chunk in transport.iter_chunks(r, CHUNK_SIZE):
+                read += len(chunk)
+                text = decoder.decode(chunk)
+                parts.append(text)
+                with metrics.timer("scraper_parse_seconds", stage="stream_chapter"):
+                    parser.feed(text)
+                if parser.done:
+                    break
+            wire = transport.wire_bytes(r)
+            protocol = transport.protocol(r)
+            replayed = wire is None  # rekaman: body sudah lengkap di memori
+            if replayed:
+                wire, total = read, len(r.content)
+    except Exception as e:
+        metrics.record_response(url, time.perf_counter() - start, error=True)
+        printer(f"   Gagal: {e}")
+        return None, None
+
+    metrics.record_response(url, time.perf_counter() - start)
+    metrics.inc("scraper_response_bytes_total", read, page_type="chapter")
+    if transport.TRANSPORT.mode == "live":  # record / replay lewat fetch(), transfer sudah dihitung di sana
+        metrics.record_transfer(url, wire, read, encoding, protocol)
+    html = ''.join(parts)
+    html_cache.store(url, html)
+    if not parser.done:
+        metrics.inc("scraper_stream_total", result="full")
+        with _lock:
+            _totals["full"] += 1
+        return None, html
+
+    # Content-Length = byte di kabel (terkompresi kalau ada Content-Encoding)
+    saved = total - wire if total else None
+    metrics.inc("scraper_stream_total", result="stopped")
+    if replayed:
+        if saved is not None:
+            printer(f"      Stream (replay) berhenti di {wire / 1024:.1f}/{total / 1024:.1f} KB "
+                    f"({saved / total:.0%} tidak diparse)")
+        return parser.images, None
+    with _lock:
+        _totals["stopped"] += 1
+        _totals["read"] += wire
+        if saved is not None:
+            _totals["saved"] += saved
+            _totals["known"] += total
+    if saved is not None:
+        metrics.inc("scraper_stream_saved_bytes_total", saved, page_type="chapter")
+        printer(f"      Stream berhenti di {wire / 1024:.1f}/{total / 1024:.1f} KB "
+                f"({saved / total:.0%} tidak diunduh)")
+    return parser.images, None
+
+def report(printer=print):
+    """Ringkasan di akhir run"""
+    with _lock:
+        totals = dict(_totals)
+    if not totals["stopped"] and not totals["full"]:
+        return
+    saved = (f", {totals['saved'] / 1e6:.1f} MB tidak diunduh ({totals['saved'] / totals['known']:.0%} dari halaman "
+             f"yang Content-Length-nya diketahui)" if totals["known"] else "")
+    printer(f"   stream chapter: {totals['stopped']} berhenti di container, {totals['full']} dibaca penuh, "
+            f"{totals['read'] / 1e6:.1f} MB dibaca{saved}")
@@ -0,0 +1,76 @@
+import argparse
+import profiling, transport, html_cache, shard, budget, changefeed, searchindex, dedup, revisit
+
+# === ARGUMEN COMMAND LINE BERSAMA ===
+def build_parser(description):
+    """Parser argumen yang dipakai semua entry point scraper"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--metrics-out', action='append', default=[], metavar='FILE',
+                        help='Tulis metrics di akhir run: *.json = ringkasan JSON, lainnya = Prometheus text (boleh diulang)')
+    parser.add_argument('--metrics-interval', type=float, default=60.0, metavar='DETIK',
+                        help='Interval ringkasan throughput satu baris (0 = mati, default 60)')
+    parser.add_argument('--profile', type=profiling.parse_modes, default=set(), metavar='MODE',
+                        help='Profiling per stage: cprofile, tracemalloc, sample (pisahkan koma) atau all')
+    parser.add_argument('--profile-dir', metavar='DIR',
+                        help='Folder laporan profiling (default profiles/<timestamp>)')
+    parser.add_argument('--profile-interval', type=float, default=0.01, metavar='DETIK',
+                        help='Interval sampling stack untuk mode sample (default 0.01)')
+    parser.add_argument('--http-mode', choices=transport.MODES, default='live',
+                        help='live = request biasa, record = simpan response, replay = tanpa network dari rekaman')
+    parser.add_argument('--record-dir', default=transport.RECORD_DIR, metavar='DIR',
+                        help='Folder rekaman HTTP (default recordings)')
+    parser.add_argument('--replay-latency', type=transport.parse_latency, default=0.0, metavar='DETIK',
+                        help="Latency simulasi per request saat replay: angka detik atau 'recorded'")
+    parser.add_argument('--replay-jitter', type=float, default=0.0, metavar='DETIK',
+                        help='Tambahan latency acak 0..DETIK saat replay')
+    parser.add_argument('--backend', choices=transport.BACKENDS, default='requests',
+                        help="Backend HTTP live/record: requests (HTTP/1.1) atau httpx (HTTP/2, satu koneksi multiplex per host)")
+    parser.add_argument('--stream-chapters', action='store_true',
+                        help='Baca halaman chapter per chunk dan berhenti setelah container gambar (chapterstream.py)')
+    parser.add_argument('--html-cache', metavar='FILE',
+                        help='Aktifkan cache HTML mentah di file SQLite ini (mis. html_cache.sqlite)')
+    parser.add_argument('--cache-policy', type=html_cache.parse_policy, default=html_cache.parse_policy(None), metavar='SPEC',
+                        help=f'Umur maksimum cache per page type (default {html_cache.DEFAULT_POLICY}), mis. detail=6h')
+    parser.add_argument('--cache-max-mb', type=float, default=html_cache.MAX_MB, metavar='MB',
+                        help=f'Batas ukuran cache, entry paling lama tidak dipakai dibuang dulu (default {html_cache.MAX_MB})')
+    parser.add_argument('--cache-max-age', type=html_cache.parse_duration, metavar='DURASI',
+                        help='Buang entry cache yang lebih tua dari ini (mis. 90d)')
+    parser.add_argument('--rate-limit', type=float, metavar='RPS',
+                        help='Batas rata-rata request per detik untuk proses ini')
+    parser.add_argument('--shard', type=shard.parse_shard, metavar='I/N',
+                        help='Hanya proses komik dengan hash(url) %% N == I, tulis ke shards/shard-I-of-N/')
+    parser.add_argument('--global-rate', type=float, metavar='RPS',
+                        help='Budget request/detik untuk semua shard, dibagi rata ke N runner')
+    parser.add_argument('--discovery', choices=('pages', 'sitemap'), default='pages',
+                        help='pages = paginasi komik-terbaru, sitemap = XML sitemap + lastmod sejak run sebelumnya '
+                             '(sitemap.py; kembali ke pages kalau tidak ada sitemap)')
+    parser.add_argument('--revisit', choices=revisit.MODES, default='tiers',
+                        help='tiers = komik tamat / lama tidak update dicek dengan jeda per tier (revisit.py), '
+                             'all = cek detail semua komik setiap run')
+    parser.add_argument('--refresh', action='append', default=[], metavar='URL',
+                        help='Paksa cek detail komik ini walaupun belum jatuh tempo (url atau slug, boleh diulang)')
+    parser.add_argument('--order', choices=('priority', 'list'), default='priority',
+                        help='priority = update inkremental komik populer dulu (schedule.py), list = urutan halaman list')
+    parser.add_argument('--deadline', type=budget.parse_deadline, metavar='WAKTU',
+                        help="Jam selesai run: '23:30' atau '2026-01-31 23:30'; job yang tidak sempat selesai ditunda")
+    parser.add_argument('--time-budget', type=html_cache.parse_duration, metavar='DURASI',
+                        help='Budget waktu run sejak start, mis. 45m atau 2h')
+    parser.add_argument('--deferred-out', metavar='FILE',
+                        help='Tulis daftar pekerjaan yang ditunda (JSON) saat deadline dipakai')
+    parser.add_argument('--feed-dir', default=changefeed.FEED_DIR, metavar='DIR',
+                        help='Folder change feed JSON Lines per run (default feed)')
+    parser.add_argument('--no-feed', dest='feed_dir', action='store_const', const=None,
+                        help='Jangan tulis change feed')
+    parser.add_argument('--search-index', default=searchindex.INDEX_PATH, metavar='FILE',
+                        help=f'Index pencarian SQLite yang diperbarui setiap simpan (default {searchindex.INDEX_PATH})')
+    parser.add_argument('--no-search-index', dest='search_index', action='store_const', const=None,
+                        help='Jangan perbarui index pencarian')
+    parser.add_argument('--dedup', choices=dedup.MODES, default='report',
+                        help='Cek komik baru terhadap record yang sudah ada (dedup.py): off, report (default), ask, auto')
+    return parser
+
+def request_rate(args):
+    """Rate per proses dari --rate-limit / --global-rate (dibagi jumlah shard)"""
+    rates = [r for r in (args.rate_limit,
+                         args.global_rate / (args.shard[1] if args.shard else 1) if args.global_rate else None) if r]
+    return min(rates) if rates else None
@@ -0,0 +1,233 @@
+"""
+Pembaca metadata file komik tanpa membangun list images.
+
+File komik bisa sampai 3 MB, hampir semuanya URL gambar. read_header()
+menelusuri JSON secara manual di level atas dan di tiap objek chapter:
+nilai yang dibutuhkan di-decode dengan decoder C bawaan json, sedangkan
+array `images` dan field lain yang tidak diminta dilompati tanpa membuat
+objek Python (array string dilompati dengan satu regex match, sisanya
+dengan skip yang paham string).
+
+    header = read_header("comics/Solo-Leveling.json")
+    header["url"], header["status"], header["chapters"]   # nomor chapter saja
+
+Benchmark atas seluruh corpus: python bench/bench_load.py
+"""
+import json, os, re
+from json.decoder import scanstring
+
+# === KONFIGURASI ===
+FIELDS = ("url", "title", "status", "last_updated", "rating", "votes", "type")
+CHAPTER_FIELDS = ("number",)
+
+WS = re.compile(r'[ \t\n\r]*')
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+STRING_ARRAY = re.compile(r'\[[ \t\n\r]*(?:' + _STRING + r'[ \t\n\r]*(?:,[ \t\n\r]*' + _STRING + r'[ \t\n\r]*)*)?\]', re.S)
+SCALAR = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?|true|false|null')
+_decoder = json.JSONDecoder()
+
+# === TOKENIZER ===
+def skip_ws(s, pos):
+    return WS.match(s, pos).end()
+
+def skip_value(s, pos):
+    """Posisi setelah nilai JSON yang dimulai di pos, tanpa membuat objeknya"""
+    ch = s[pos]
+    if ch == '"':
+        return scanstring(s, pos + 1)[1]
+    if ch == '[':
+        # Jalur cepat (array URL images): ']' pertama berada di luar string
+        # kalau jumlah tanda kutip sebelumnya genap dan tidak ada escape
+        end = s.find(']', pos)
+        segment = s[pos + 1:end]
+        if end > 0 and '\\' not in segment and segment.count('"') % 2 == 0 and '[' not in segment and '{' not in segment:
+            return end + 1
+        match = STRING_ARRAY.match(s, pos)
+        if match:
+            return match.end()
+    if ch in '[{':
+        close = ']' if ch == '[' else '}'
+        pos = skip_ws(s, pos + 1)
+        if s[pos] == close:
+            return pos + 1
+        while True:
+            if ch == '{':
+                pos = skip_ws(s, scanstring(s, pos + 1)[1])
+                pos = skip_ws(s, pos + 1)  # ':'
+            pos = skip_ws(s, skip_value(s, pos))
+            if s[pos] == close:
+                return pos + 1
+            pos = skip_ws(s, pos + 1)  # ','
+    match = SCALAR.match(s, pos)
+    if not match:
+        raise ValueError(f"JSON tidak valid di posisi {pos}")
+    return match.end()
+
+def iter_object(s, pos):
+    """Yield (key, posisi nilai) untuk setiap field objek di pos; pemanggil
+    harus mengembalikan posisi setelah nilai lewat .send() atau dibiarkan di-skip"""
+    pos = skip_ws(s, pos + 1)
+    if s[pos] == '}':
+        return pos + 1
+    while True:
+        key, pos = scanstring(s, pos + 1)
+        pos = skip_ws(s, skip_ws(s, pos) + 1)  # ':'
+        end = yield key, pos
+        pos = skip_ws(s, end if end is not None else skip_value(s, pos))
+        if s[pos] == '}':
+            return pos + 1
+        pos = skip_ws(s, pos + 1)  # ','
+
+def walk_object(s, pos, handle):
+    """Jalankan handle(key, pos) -> posisi akhir nilai (atau None = skip) untuk setiap field"""
+    gen = iter_object(s, pos)
+    try:
+        item = next(gen)
+        while True:
+            item = gen.send(handle(*item))
+    except StopIteration as stop:
+        return stop.value
+
+def decode(s, pos):
+    return _decoder.raw_decode(s, pos)
+
+# === READER ===
+class _Done(Exception):
+    """Semua field yang diminta sudah ketemu"""
+
+_key_patterns = {}
+
+def key_pattern(key):
+    pattern = _key_patterns.get(key)
+    if pattern is None:
+        pattern = _key_patterns[key] = re.compile(r'"' + re.escape(key) + r'"[ \t\n\r]*:[ \t\n\r]*')
+    return pattern
+
+def flat_chapter_end(s, pos):
+    """Posisi setelah objek chapter di pos kalau bentuknya 'datar' (skalar + satu
+    array string, tanpa escape), dicek hanya dengan find/count di C. None = tidak."""
+    close = s.find('}', pos)
+    bracket = s.find(']', pos, close)
+    if close < 0 or s.find('\\', pos, close) >= 0:
+        return None
+    # '}' / ']' di dalam string -> jumlah kutip sebelumnya ganjil
+    if s.count('"', pos, close) % 2 or (bracket >= 0 and s.count('"', pos, bracket) % 2):
+        return None
+    opening = s.find('[', pos, close)
+    if (s.find('{', pos + 1, close) >= 0 or (opening >= 0 and s.find('[', opening + 1, close) >= 0)
+            or (bracket >= 0 and s.find(']', bracket + 1, close) >= 0)):
+        return None
+    return close + 1
+
+def read_chapters(s, pos, fields, out):
+    """Nomor (dan field kecil lain) setiap chapter; images hanya dicek kosong/tidak"""
+    pos = skip_ws(s, pos + 1)
+    if s[pos] == ']':
+        return pos + 1
+    while True:
+        chapter = {}
+        end = flat_chapter_end(s, pos)
+        if end is not None:
+            # Di objek datar tanpa escape, '"key":' tidak mungkin muncul di dalam string
+            for key in fields:
+                match = key_pattern(key).search(s, pos, end)
+                if match:
+                    chapter[key] = decode(s, match.end())[0]
+            match = key_pattern('images').search(s, pos, end)
+            if match:
+                start = match.end()
+                chapter['has_images'] = s[start] == '[' and s[skip_ws(s, start + 1)] != ']'
+            pos = end
+        else:
+            def handle(key, vpos):
+                if key == 'images':
+                    chapter['has_images'] = s[vpos] == '[' and s[skip_ws(s, vpos + 1)] != ']'
+                    return None
+                if key in fields:
+                    chapter[key], end = decode(s, vpos)
+                    return end
+                return None
+
+            pos = walk_object(s, pos, handle)
+        out.append(chapter)
+        pos = skip_ws(s, pos)
+        if s[pos] == ']':
+            return pos + 1
+        pos = skip_ws(s, pos + 1)
+
+def read_header(path, fields=FIELDS, chapter_fields=CHAPTER_FIELDS):
+    """Metadata level atas + daftar chapter ringan dari satu file komik.
+
+    Return dict berisi field yang diminta (fields=None = semua field level
+    atas selain chapters) yang ada di file, "chapters" =
+    list nomor chapter, "empty_chapters" = nomor chapter dengan images kosong,
+    dan "path". Kalau chapter_fields lebih dari sekadar number, "chapter_info"
+    berisi dict per chapter. chapter_fields=None = tanpa chapter sama sekali;
+    baca berhenti begitu semua field ketemu (mis. cari file berdasarkan url)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        s = f.read()
+    header = {"path": path}
+    chapters = []
+
+    def handle(key, vpos):
+        if key == 'chapters':
+            if chapter_fields is None:
+                return None
+            return read_chapters(s, vpos, chapter_fields, chapters)
+        if fields is None or key in fields:
+            header[key], end = decode(s, vpos)
+            if chapter_fields is None and fields is not None and len(header) > len(fields):
+                raise _Done
+            return end
+        return None
+
+    try:
+        walk_object(s, skip_ws(s, 0), handle)
+    except _Done:
+        return header
+    if chapter_fields is None:
+        return header
+    header["chapters"] = [ch.get('number') for ch in chapters]
+    header["empty_chapters"] = [ch.get('number') for ch in chapters if not ch.get('has_images')]
+    if tuple(chapter_fields) != CHAPTER_FIELDS:
+        header["chapter_info"] = chapters
+    return header
+
+def chapter_spans(path):
+    """(start, end) byte offset setiap objek chapter di file, untuk membaca satu
+    chapter dengan seek tanpa parse seluruh file. File dibaca sebagai latin-1:
+    byte dari karakter UTF-8 multi-byte tidak pernah berupa karakter ASCII,
+    jadi posisi karakter = posisi byte dan struktur JSON tetap terbaca."""
+    with open(path, 'rb') as f:
+        s = f.read().decode('latin-1')
+    spans = []
+
+    def handle(key, vpos):
+        if key != 'chapters' or s[vpos] != '[':
+            return None
+        pos = skip_ws(s, vpos + 1)
+        if s[pos] == ']':
+            return pos + 1
+        while True:
+            end = flat_chapter_end(s, pos) or skip_value(s, pos)
+            spans.append((pos, end))
+            pos = skip_ws(s, end)
+            if s[pos] == ']':
+                return pos + 1
+            pos = skip_ws(s, pos + 1)
+
+    walk_object(s, skip_ws(s, 0), handle)
+    return spans
+
+def iter_headers(directory, fields=FIELDS, chapter_fields=CHAPTER_FIELDS, printer=print):
+    """read_header() untuk semua *.json di folder; file rusak dilewati dengan warning"""
+    if not os.path.isdir(directory):
+        return
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.json'):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            yield read_header(path, fields, chapter_fields)
+        except (ValueError, IndexError, OSError) as e:
+            printer(f"   Warning: Gagal baca {path}: {e}")
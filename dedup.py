@@ -0,0 +1,265 @@
+"""
+Deteksi komik duplikat (slug berubah / di-list ulang) sebelum backfill penuh.
+
+Sinyal per pasangan komik:
+- title     : MinHash atas shingle 3 karakter dari title + alternative_titles
+              (dinormalisasi seperti searchindex); kandidat dicari lewat LSH
+              (BANDS x ROWS), jadi tidak perlu membandingkan semua pasangan
+- cover     : nama file cover sama (tanpa suffix ukuran -236x319)
+- chapters  : overlap URL chapter; kandidat dicari lewat slug seri di URL
+              chapter (https://komikindo.ch/<slug>-chapter-12/)
+
+Dipakai process_comic() untuk komik "baru" setelah halaman detail diambil:
+kalau ternyata sama dengan record yang sudah ada, record lama dipakai ulang
+dengan URL baru sehingga hanya chapter yang belum ada yang di-scrape. Saat
+record itu disimpan, file <slug lama>.json dihapus (dicatat di alias legacy)
+dan dokumen URL lama dibuang dari index pencarian.
+
+    --dedup off     tanpa pengecekan
+    --dedup report  cetak kandidat saja (default)
+    --dedup ask     tanya di terminal sebelum remap
+    --dedup auto    remap otomatis kalau keputusannya yakin
+
+Duplikat di dalam corpus yang sudah ada:
+
+    python dedup.py report [--dir comics]
+"""
+import argparse, hashlib, os, re, struct, sys, threading
+import changefeed, model, naming, searchindex
+
+# === KONFIGURASI ===
+NUM_PERM = 64
+BANDS, ROWS = 16, 4          # threshold LSH ~ (1/BANDS)^(1/ROWS) = 0.5
+REPORT_TITLE = 0.5           # minimal kemiripan title untuk dilaporkan
+SURE_CHAPTERS = 0.5          # overlap chapter yang dianggap pasti sama
+SURE_TITLE = 0.8
+SURE_TITLE_WITH_COVER = 0.3
+SURE_CHAPTERS_WITH_COVER = 0.1  # cover sama + title mirip tetap butuh overlap chapter (God's Cooking ~ God's Cuisine)
+MAX_COVER_SHARE = 2          # cover dipakai lebih dari ini = gambar default
+MODES = ("off", "report", "ask", "auto")
+
+# NUM_PERM fungsi hash = blake2b 64 byte dengan salt berbeda, dipecah per 32 bit
+_SALTS = [i.to_bytes(16, 'little') for i in range(NUM_PERM // 16)]
+_UNPACK = struct.Struct('<16I').unpack
+
+# === FITUR ===
+def names(record):
+    return [record.get('title') or ''] + list(record.get('alternative_titles') or [])
+
+def shingles(record):
+    out = set()
+    for name in names(record):
+        text = ' '.join(searchindex.WORD.findall(searchindex.normalize(name)))
+        if len(text) <= 3:
+            if text:
+                out.add(text)
+            continue
+        out.update(text[i:i + 3] for i in range(len(text) - 2))
+    return out
+
+def shingle_hashes(shingle):
+    data = shingle.encode('utf-8')
+    out = ()
+    for salt in _SALTS:
+        out += _UNPACK(hashlib.blake2b(data, digest_size=64, salt=salt).digest())
+    return out
+
+def minhash(items):
+    rows = [shingle_hashes(s) for s in items]
+    if not rows:
+        return None
+    return tuple(map(min, zip(*rows)))
+
+def similarity(sig_a, sig_b):
+    """Perkiraan Jaccard dari dua signature MinHash"""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+def cover_key(url):
+    if not url:
+        return None
+    name = os.path.splitext(url.rstrip('/').rsplit('/', 1)[-1])[0]
+    return re.sub(r'-\d+x\d+$', '', name).lower() or None
+
+def chapter_paths(record):
+    if isinstance(record, model.Comic):
+        urls = [ch.url for ch in record.chapters]
+    else:
+        urls = [ch.get('url') for ch in record.get('chapters', [])]
+    return {u.split('//', 1)[-1].split('/', 1)[-1] for u in urls if u}
+
+def series_slug(path):
+    """'apotheosis-chapter-70/' -> 'apotheosis'"""
+    match = re.match(r'(.+?)-chapter-[\w.-]*/?$', path)
+    return match.group(1) if match else None
+
+def slugs(paths):
+    found = {series_slug(p) for p in paths}
+    found.discard(None)
+    return found
+
+# === INDEX ===
+class Index:
+    def __init__(self):
+        self.records = {}     # url -> record
+        self.signatures = {}  # url -> signature MinHash
+        self.buckets = {}     # (band, hash band) -> set url
+        self.covers = {}      # cover key -> set url
+        self.series = {}      # slug seri -> set url
+
+    def add(self, record):
+        url = record.get('url')
+        if not url:
+            return
+        self.records[url] = record
+        sig = self.signatures[url] = minhash(shingles(record))
+        if sig:
+            for band in range(BANDS):
+                self.buckets.setdefault((band, sig[band * ROWS:(band + 1) * ROWS]), set()).add(url)
+        key = cover_key(record.get('cover_image'))
+        if key:
+            self.covers.setdefault(key, set()).add(url)
+        for slug in slugs(chapter_paths(record)):
+            self.series.setdefault(slug, set()).add(url)
+
+    def candidates(self, record, chapter_urls=None, sig=None):
+        """Kandidat duplikat, diurutkan dari yang paling mirip"""
+        sig = sig or minhash(shingles(record))
+        paths = {u.split('//', 1)[-1].split('/', 1)[-1] for u in chapter_urls or [] if u} or chapter_paths(record)
+        found = set()
+        if sig:
+            for band in range(BANDS):
+                found |= self.buckets.get((band, sig[band * ROWS:(band + 1) * ROWS]), set())
+        cover = cover_key(record.get('cover_image'))
+        if not self.placeholder(cover):
+            found |= self.covers.get(cover, set())
+        for slug in slugs(paths):
+            found |= self.series.get(slug, set())
+        found.discard(record.get('url'))
+
+        results = []
+        for url in found:
+            other = self.records[url]
+            title = similarity(sig, self.signatures.get(url))
+            same_cover = bool(cover) and not self.placeholder(cover) and cover == cover_key(other.get('cover_image'))
+            other_paths = chapter_paths(other)
+            overlap = len(paths & other_paths) / min(len(paths), len(other_paths)) if paths and other_paths else 0.0
+            if title < REPORT_TITLE and not same_cover and not overlap:
+                continue
+            sure = (overlap >= SURE_CHAPTERS or title >= SURE_TITLE
+                    or (same_cover and title >= SURE_TITLE_WITH_COVER and overlap >= SURE_CHAPTERS_WITH_COVER))
+            results.append({"url": url, "record": other, "title": round(title, 2), "cover": same_cover,
+                            "chapters": round(overlap, 2), "sure": sure})
+        results.sort(key=lambda c: (-c['sure'], -c['chapters'], -c['title']))
+        return results
+
+    def placeholder(self, cover):
+        """Cover yang dipakai banyak komik (gambar default) bukan sinyal duplikat"""
+        return cover is None or len(self.covers.get(cover, ())) > MAX_COVER_SHARE
+
+    def pairs(self):
+        """Semua pasangan kandidat di dalam index (tanpa perbandingan semua-ke-semua)"""
+        seen = set()
+        for url, record in self.records.items():
+            for cand in self.candidates(record, sig=self.signatures[url]):
+                key = tuple(sorted((url, cand['url'])))
+                if key not in seen:
+                    seen.add(key)
+                    yield record, cand
+
+# === REMAP ===
+def remap(record, url):
+    """Pakai record lama untuk URL baru; baseline change feed ikut pindah. File
+    dan dokumen index URL lama dibuang saat record disimpan dengan URL baru."""
+    old = record.get('url')
+    if isinstance(record, model.Comic):
+        record.load_images()  # baseline diambil dari disk sebelum url diganti
+        record.url = url
+    else:
+        record['url'] = url
+    changefeed.rename(old, url)
+    naming.rename(old, url)
+    searchindex.rename(old, url)
+
+# === HELPER UNTUK SCRIPT ===
+MODE = "report"
+INDEX = None
+_lock = threading.Lock()
+_ask_lock = threading.Lock()
+
+def configure(mode="report"):
+    global MODE, INDEX
+    MODE = mode
+    INDEX = None
+
+def check(comic_data, chapters_data, existing_comics, printer=print):
+    """Record yang sudah ada untuk komik baru ini (sudah di-remap ke URL baru), atau None"""
+    global INDEX
+    if MODE == "off":
+        return None
+    with _lock:
+        if INDEX is None:
+            INDEX = Index()
+            for record in list(existing_comics.values()):
+                INDEX.add(record)
+        found = INDEX.candidates(comic_data, [ch['url'] for ch in chapters_data])
+    if not found:
+        return None
+    best = found[0]
+    other = best['record']
+    printer(f"   Kemungkinan duplikat: '{comic_data.get('title')}' ~ '{other.get('title')}' "
+            f"({len(other.get('chapters') or [])} chapter, {best['url']}) | title {best['title']:.2f}, "
+            f"cover {'sama' if best['cover'] else 'beda'}, chapter overlap {best['chapters']:.2f}"
+            f"{' [yakin]' if best['sure'] else ''}")
+    if MODE == "report":
+        return None
+    if MODE == "ask":
+        if not sys.stdin.isatty():
+            printer("   --dedup ask butuh terminal; dilewati (anggap report)")
+            return None
+        with _ask_lock:
+            answer = input(f"   Pakai record lama untuk {comic_data['url']}? [y/N] ").strip().lower()
+        if answer not in ("y", "ya", "yes"):
+            return None
+    elif not best['sure']:
+        return None
+    with _lock:
+        INDEX.records.pop(best['url'], None)
+        existing_comics.pop(best['url'], None)
+        remap(other, comic_data['url'])
+        INDEX.add(other)
+        existing_comics[comic_data['url']] = other
+    printer(f"   Remap: {best['url']} → {comic_data['url']}")
+    return other
+
+def add(record):
+    """Komik baru yang selesai di-scrape ikut jadi kandidat untuk komik berikutnya"""
+    with _lock:
+        if INDEX is not None:
+            INDEX.add(record)
+
+# === CLI ===
+def main():
+    parser = argparse.ArgumentParser(description="Cari komik duplikat di corpus")
+    sub = parser.add_subparsers(dest='command', required=True)
+    rp = sub.add_parser('report', help='Daftar pasangan kandidat duplikat')
+    rp.add_argument('--dir', default="comics")
+    rp.add_argument('--all', action='store_true', help='Tampilkan juga kandidat yang belum yakin')
+    args = parser.parse_args()
+
+    index = Index()
+    for record in model.load_dir(args.dir).values():
+        index.add(record)
+    count = 0
+    for record, cand in index.pairs():
+        if not cand['sure'] and not args.all:
+            continue
+        count += 1
+        print(f"{'YAKIN ' if cand['sure'] else '      '} {record.title!r} ~ {cand['record'].title!r} | title {cand['title']:.2f}, "
+              f"cover {'sama' if cand['cover'] else 'beda'}, chapter {cand['chapters']:.2f}")
+        print(f"         {record.path} | {cand['record'].path}")
+    print(f"{count} pasangan dari {len(index.records)} komik")
+
+if __name__ == "__main__":
+    main()
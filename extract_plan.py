@@ -0,0 +1,160 @@
+"""
+Rencana ekstraksi deklaratif untuk fallback selector.
+
+Setiap Plan berisi daftar kandidat selector (sudah di-compile soupsieve)
+dan fungsi parse. Kandidat dievaluasi satu per satu dan berhenti di hasil
+pertama yang valid. Kandidat yang paling sering berhasil otomatis naik ke
+depan, jadi halaman berikutnya langsung mencoba selector pemenang. Statistik
+hit per selector ikut masuk metrics (scraper_selector_total) supaya fallback
+yang tidak pernah kena bisa dibuang.
+"""
+import re, threading
+import soupsieve as sv
+import metrics
+
+# === PLAN ===
+class Plan:
+    def __init__(self, name, selectors, parse=None, many=False):
+        self.name = name
+        self.many = many
+        self.parse = parse or (lambda found: found)
+        self.compiled = {sel: sv.compile(sel) for sel in selectors}
+        self.order = tuple(selectors)
+        self.hits = dict.fromkeys(selectors, 0)
+        self.tries = dict.fromkeys(selectors, 0)
+        self.lock = threading.Lock()
+
+    def run(self, soup_obj):
+        """Hasil parse dari kandidat pertama yang cocok, atau None"""
+        for selector in self.order:
+            matcher = self.compiled[selector]
+            found = matcher.select(soup_obj) if self.many else matcher.select_one(soup_obj)
+            value = self.parse(found) if found else None
+            self._record(selector, value is not None)
+            if value is not None:
+                return value
+        return None
+
+    def _record(self, selector, hit):
+        metrics.inc("scraper_selector_total", plan=self.name, selector=selector, result="hit" if hit else "miss")
+        with self.lock:
+            self.tries[selector] += 1
+            if not hit:
+                return
+            self.hits[selector] += 1
+            # Naikkan selector pemenang satu posisi kalau sekarang lebih sering kena
+            order = list(self.order)
+            i = order.index(selector)
+            if i and self.hits[selector] > self.hits[order[i - 1]]:
+                order[i - 1], order[i] = order[i], order[i - 1]
+                self.order = tuple(order)
+
+    def stats(self):
+        with self.lock:
+            return [{"selector": sel, "tries": self.tries[sel], "hits": self.hits[sel]} for sel in self.order]
+
+# === PARSER FIELD ===
+def parse_rating(elem):
+    match = re.search(r'(\d+\.\d+|\d+)', elem.get_text(strip=True))
+    return float(match.group(1)) if match else None
+
+def parse_votes(elem):
+    numbers = re.findall(r'\d+', elem.get_text(strip=True))
+    return int(numbers[0]) if numbers else None
+
+def parse_synopsis(elem):
+    # Hapus baris pembuka "Manhua/Manga/Manhwa X yang dibuat oleh ..."
+    cleaned_lines = []
+    for line in elem.get_text(separator='\n', strip=True).split('\n'):
+        line = line.strip()
+        if line and not re.match(r'^(Manhua|Manga|Manhwa)\s+', line, re.IGNORECASE):
+            cleaned_lines.append(line)
+    return '\n'.join(cleaned_lines) if cleaned_lines else None
+
+def parse_genres(containers):
+    # Container bisa bersarang: link yang sama cukup sekali, urutan dokumen tetap
+    seen, genres = set(), []
+    for container in containers:
+        for a in container.find_all('a'):
+            if id(a) not in seen:
+                seen.add(id(a))
+                genres.append(a.get_text(strip=True))
+    return [g for g in genres if g] or None
+
+def parse_images(container):
+    images = []
+    seen = set()
+    for img in container.find_all('img'):
+        src = (img.get('src') or
+               img.get('data-src') or
+               img.get('data-lazy-src') or
+               img.get('data-original'))
+
+        if src and src.startswith(('http://', 'https://')):
+            # Clean URL
+            src = src.split('?')[0].strip()
+            if src not in seen:
+                seen.add(src)
+                images.append(src)
+    return images or None
+
+# === PLAN PER PAGE TYPE ===
+RATING = Plan("detail.rating", [
+    'i[itemprop="ratingValue"]',
+    '.ratingmanga i',
+    '.rtg i',
+    '.archiveanime-rating i',
+], parse_rating)
+
+VOTES = Plan("detail.votes", [
+    '.votescount',
+    '.rating-count',
+    '.vote-count',
+], parse_votes)
+
+SYNOPSIS = Plan("detail.synopsis", [
+    '.entry-content.entry-content-single',
+    '.entry-content-single',
+    '.synopsis',
+    '.description',
+], parse_synopsis)
+
+# Union semua container seperti select('.genre-info a, ...') lama, tapi cari
+# container dulu lalu link di dalamnya (jauh lebih murah dari selector descendant)
+GENRES = Plan("detail.genres", [
+    '.genre-info, .series-genres, .genres',
+], parse_genres, many=True)
+
+CHAPTER_IMAGES = Plan("chapter.images", [
+    'div#Baca_Komik',
+    'div.chapter-image',
+    '.reader-area',
+    '.chapter-body',
+], parse_images)
+
+LIST_POSTS = Plan("list.posts", [
+    '.listupd .animepost .animposx a[itemprop="url"]',
+    '.animepost a[itemprop="url"]',
+    '.animepost .thumb a',
+    '.film-list a[itemprop="url"]',
+], many=True)
+
+PARENT_COMIC = Plan("chapter.parent", [
+    '.allc a[href*="/komik/"]',
+    '.breadcrumb a[href*="/komik/"]',
+    '.nextprev a[href*="/komik/"]',
+], lambda a: a.get('href') or None)
+
+PLANS = (GENRES, RATING, VOTES, SYNOPSIS, CHAPTER_IMAGES, LIST_POSTS, PARENT_COMIC)
+
+def report(printer=print):
+    """Cetak hit-rate tiap selector; fallback yang tidak pernah kena ditandai"""
+    for plan in PLANS:
+        rows = plan.stats()
+        if not any(r["tries"] for r in rows):
+            continue
+        parts = []
+        for r in rows:
+            rate = r["hits"] / r["tries"] if r["tries"] else 0.0
+            parts.append(f"{r['selector']} {r['hits']}/{r['tries']} ({rate:.0%})" + (" [mati]" if r["tries"] and not r["hits"] else ""))
+        printer(f"   selector {plan.name}: " + " | ".join(parts))
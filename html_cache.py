@@ -0,0 +1,222 @@
+"""
+Cache HTML mentah di disk, dikompresi (zstd kalau ada, zlib kalau tidak), key = URL.
+
+Setiap entry menyimpan body terakhir URL itu beserta waktu fetch. get()
+memakai cache sesuai kebijakan freshness per page type; default chapter
+disimpan selamanya (halaman chapter tidak berubah setelah terbit), detail
+dan list selalu diambil ulang tapi tetap disimpan untuk reprocess offline.
+
+    python html_cache.py stats [--path FILE]
+    python html_cache.py evict --max-mb 1024 [--max-age 30d]
+"""
+import argparse, os, re, sqlite3, threading, time, zlib
+import metrics
+
+try:
+    import zstandard
+except ImportError:  # opsional
+    zstandard = None
+
+# === KONFIGURASI ===
+CACHE_PATH = "html_cache.sqlite"
+MAX_MB = 2048
+DEFAULT_POLICY = "chapter=inf,detail=0,list=0,other=0"
+EVICT_CHECK_EVERY = 200   # cek ukuran setiap N store
+
+def parse_duration(value):
+    """'inf', '0', '90s', '30m', '6h', '2d' -> detik (None = selamanya)"""
+    value = value.strip().lower()
+    if value in ("inf", "forever", "never"):
+        return None
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([smhd]?)', value)
+    if not match:
+        raise ValueError(f"Durasi tidak valid: {value}")
+    number, unit = float(match.group(1)), match.group(2) or 's'
+    return number * {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[unit]
+
+def parse_policy(spec):
+    """'chapter=inf,detail=6h' -> {'chapter': None, 'detail': 21600.0, ...}"""
+    policy = {}
+    for part in f"{DEFAULT_POLICY},{spec or ''}".split(','):
+        if not part.strip():
+            continue
+        kind, _, value = part.partition('=')
+        policy[kind.strip()] = parse_duration(value)
+    return policy
+
+# === KOMPRESI ===
+if zstandard:
+    CODEC = "zstd"
+    _compressor = zstandard.ZstdCompressor(level=10)
+    _decompressor = zstandard.ZstdDecompressor()
+else:
+    CODEC = "zlib"
+
+def compress(data):
+    if CODEC == "zstd":
+        return _compressor.compress(data)
+    return zlib.compress(data, 6)
+
+def decompress(codec, blob):
+    if codec == "zstd":
+        if not zstandard:
+            raise RuntimeError("Entry cache zstd butuh paket zstandard")
+        return _decompressor.decompress(blob)
+    return zlib.decompress(blob)
+
+# === CACHE ===
+class HtmlCache:
+    def __init__(self, path=CACHE_PATH, policy=None, max_bytes=MAX_MB * 1024 * 1024, max_age=None):
+        self.path = path
+        self.policy = policy or parse_policy(None)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.stores = 0
+        conn = self._conn()
+        conn.execute("""CREATE TABLE IF NOT EXISTS pages (
+            url TEXT PRIMARY KEY,
+            page_type TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            codec TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            raw_size INTEGER NOT NULL,
+            body BLOB NOT NULL)""")
+        conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def fresh_for(self, url):
+        """Umur maksimum (detik) untuk URL ini, None = selamanya"""
+        kind = metrics.page_type(url)
+        return self.policy.get(kind, self.policy.get("other", 0))
+
+    def lookup(self, url, fresh=True):
+        """Body HTML dari cache, atau None kalau tidak ada / sudah basi.
+        fresh=False mengabaikan kebijakan freshness (untuk reprocess offline)."""
+        conn = self._conn()
+        row = conn.execute("SELECT fetched_at, codec, body FROM pages WHERE url = ?", (url,)).fetchone()
+        kind = metrics.page_type(url)
+        if row is None:
+            metrics.inc("scraper_cache_total", page_type=kind, result="miss")
+            return None
+        fetched_at, codec, blob = row
+        if fresh:
+            max_age = self.fresh_for(url)
+            if max_age is not None and time.time() - fetched_at >= max_age:
+                metrics.inc("scraper_cache_total", page_type=kind, result="stale")
+                return None
+        conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        conn.commit()
+        metrics.inc("scraper_cache_total", page_type=kind, result="hit")
+        return decompress(codec, blob).decode('utf-8')
+
+    def fetched_at(self, url):
+        """Epoch saat halaman disimpan ke cache, None kalau tidak ada"""
+        row = self._conn().execute("SELECT fetched_at FROM pages WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def store(self, url, html):
+        raw = html.encode('utf-8')
+        blob = compress(raw)
+        now = time.time()
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                     (url, metrics.page_type(url), now, now, CODEC, len(blob), len(raw), blob))
+        conn.commit()
+        with self.lock:
+            self.stores += 1
+            check = self.stores % EVICT_CHECK_EVERY == 0
+        if check:
+            self.evict()
+
+    def urls(self, page_type=None):
+        conn = self._conn()
+        if page_type:
+            rows = conn.execute("SELECT url FROM pages WHERE page_type = ?", (page_type,))
+        else:
+            rows = conn.execute("SELECT url FROM pages")
+        return [row[0] for row in rows]
+
+    def evict(self, max_bytes=None, max_age=None):
+        """Buang entry lebih tua dari max_age, lalu LRU sampai ukuran <= 90% max_bytes"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age = self.max_age if max_age is None else max_age
+        removed = 0
+        with self.lock:
+            conn = self._conn()
+            if max_age:
+                removed += conn.execute("DELETE FROM pages WHERE fetched_at < ?", (time.time() - max_age,)).rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            if max_bytes and total > max_bytes:
+                target = total - int(max_bytes * 0.9)
+                freed = 0
+                victims = []
+                for url, size in conn.execute("SELECT url, size FROM pages ORDER BY accessed_at"):
+                    if freed >= target:
+                        break
+                    victims.append((url,))
+                    freed += size
+                conn.executemany("DELETE FROM pages WHERE url = ?", victims)
+                removed += len(victims)
+            conn.commit()
+        if removed:
+            metrics.inc("scraper_cache_evicted_total", removed)
+        return removed
+
+    def stats(self):
+        conn = self._conn()
+        return conn.execute("""SELECT page_type, COUNT(*), SUM(size), SUM(raw_size), MIN(fetched_at), MAX(fetched_at)
+                               FROM pages GROUP BY page_type ORDER BY page_type""").fetchall()
+
+# === HELPER UNTUK SCRIPT ===
+CACHE = None
+
+def configure(path=None, policy=None, max_mb=MAX_MB, max_age=None):
+    """path None = cache mati"""
+    global CACHE
+    if path:
+        if not isinstance(policy, dict):
+            policy = parse_policy(policy)
+        CACHE = HtmlCache(path, policy, int(max_mb * 1024 * 1024), max_age)
+
+def lookup(url):
+    return CACHE.lookup(url) if CACHE else None
+
+def store(url, html):
+    if CACHE and html:
+        CACHE.store(url, html)
+
+# === CLI ===
+def main():
+    parser = argparse.ArgumentParser(description="Kelola cache HTML komikindo")
+    parser.add_argument('--path', default=CACHE_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help='Ringkasan isi cache per page type')
+    ev = sub.add_parser('evict', help='Jalankan eviction LRU / umur')
+    ev.add_argument('--max-mb', type=float, default=MAX_MB)
+    ev.add_argument('--max-age', type=parse_duration, help='Buang entry lebih tua dari ini (mis. 30d)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        parser.error(f"Cache tidak ditemukan: {args.path}")
+    cache = HtmlCache(args.path)
+    if args.command == 'evict':
+        removed = cache.evict(int(args.max_mb * 1024 * 1024), args.max_age)
+        print(f"Dibuang: {removed} entry")
+    for kind, count, size, raw, oldest, newest in cache.stats():
+        print(f"{kind:8} {count:8} entry  {size / 1e6:9.1f} MB ({raw / 1e6:.1f} MB mentah)  "
+              f"{time.strftime('%Y-%m-%d', time.localtime(oldest))} .. {time.strftime('%Y-%m-%d', time.localtime(newest))}")
+    print(f"codec: {CODEC}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Antrian job tahan-crash di SQLite (WAL) untuk banyak proses worker.
+
+Dua jenis job, key = URL:
+- comic   : ambil halaman detail, simpan metadata, antrekan chapter yang belum punya images
+- chapter : ambil halaman chapter, simpan list images sebagai hasil job
+
+Worker meng-claim job dengan lease (lease_until) dan memperpanjangnya lewat
+heartbeat selama job berjalan. Worker yang mati tidak memperpanjang lease,
+jadi jobnya otomatis kembali ke antrian setelah lease habis. Job yang gagal
+dicoba ulang dengan backoff sampai max_attempts, lalu ditandai failed.
+
+Hasil chapter disimpan dulu di antrian lalu di-flush ke file komik per batch
+(setiap FLUSH_EVERY chapter atau saat chapter komik itu habis) di dalam
+transaksi BEGIN IMMEDIATE, jadi hanya satu proses yang menulis file komik
+pada satu waktu.
+
+    python jobqueue.py seed [--queue jobs.sqlite]       # discovery -> job comic
+    python jobqueue.py work [--workers 4]               # jalankan worker sampai antrian habis
+    python jobqueue.py stats
+    python jobqueue.py retry-failed
+"""
+import json, multiprocessing, os, signal, socket, sqlite3, threading, time
+from contextlib import contextmanager
+import metrics, profiling, transport, html_cache, extract_plan, chapterstream, sitemap, shard, schedule, budget, changefeed, searchindex, naming, revisit
+import scrape
+from cli import build_parser, request_rate
+
+# === KONFIGURASI ===
+QUEUE_PATH = "jobs.sqlite"
+LEASE_SECONDS = 120
+MAX_ATTEMPTS = 5
+RETRY_BASE = 30          # detik, digandakan tiap percobaan gagal
+FLUSH_EVERY = 10         # chapter per flush ke file komik
+PRIORITY_COMIC = 0
+PRIORITY_CHAPTER = 10    # chapter didahulukan supaya komik yang sudah mulai cepat selesai
+
+# === ANTRIAN ===
+class JobQueue:
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        self.local = threading.local()
+        conn = self._conn()
+        conn.execute("""CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            url TEXT NOT NULL UNIQUE,
+            parent TEXT,
+            payload TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            state TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL,
+            lease_owner TEXT,
+            lease_until REAL,
+            not_before REAL NOT NULL DEFAULT 0,
+            last_error TEXT,
+            result TEXT,
+            flushed INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL)""")
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, priority DESC, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_parent ON jobs (parent, state)")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: transaksi diatur manual (BEGIN IMMEDIATE)
+            conn = self.local.conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def exclusive(self):
+        """Transaksi tulis; proses lain menunggu sampai selesai"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def put(self, kind, url, payload, priority=0, parent=None, max_attempts=MAX_ATTEMPTS, conn=None):
+        """Tambah job. Job yang sudah ada: pending -> prioritas dinaikkan,
+        done/failed -> diantrekan ulang, leased -> dibiarkan."""
+        t = time.time()
+        (conn or self._conn()).execute("""
+            INSERT INTO jobs (kind, url, parent, payload, priority, max_attempts, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                payload = excluded.payload,
+                priority = MAX(priority, excluded.priority),
+                state = CASE WHEN state = 'leased' THEN state ELSE 'pending' END,
+                attempts = CASE WHEN state IN ('done', 'failed') THEN 0 ELSE attempts END,
+                not_before = CASE WHEN state IN ('done', 'failed') THEN 0 ELSE not_before END,
+                result = CASE WHEN state = 'leased' THEN result ELSE NULL END,
+                flushed = CASE WHEN state = 'leased' THEN flushed ELSE 0 END,
+                updated_at = excluded.updated_at""",
+            (kind, url, parent, json.dumps(payload, ensure_ascii=False), priority, max_attempts, t, t))
+
+    def claim(self, owner, lease=LEASE_SECONDS):
+        """Ambil job siap dengan prioritas tertinggi, atau None"""
+        t = time.time()
+        with self.exclusive() as conn:
+            # Lease kedaluwarsa = worker mati; kembalikan ke antrian
+            conn.execute("""UPDATE jobs SET lease_owner = NULL, lease_until = NULL, updated_at = ?,
+                                last_error = 'lease kedaluwarsa',
+                                state = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END
+                            WHERE state = 'leased' AND lease_until < ?""", (t, t))
+            row = conn.execute("""SELECT * FROM jobs WHERE state = 'pending' AND not_before <= ?
+                                  ORDER BY priority DESC, id LIMIT 1""", (t,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("""UPDATE jobs SET state = 'leased', lease_owner = ?, lease_until = ?,
+                                attempts = attempts + 1, updated_at = ? WHERE id = ?""",
+                         (owner, t + lease, t, row['id']))
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        job['attempts'] += 1
+        return job
+
+    def heartbeat(self, job_id, owner, lease=LEASE_SECONDS):
+        """Perpanjang lease; False kalau lease sudah diambil worker lain"""
+        cur = self._conn().execute("UPDATE jobs SET lease_until = ?, updated_at = ? WHERE id = ? AND lease_owner = ? AND state = 'leased'",
+                                   (time.time() + lease, time.time(), job_id, owner))
+        return cur.rowcount == 1
+
+    def complete(self, job_id, owner, result=None, conn=None):
+        cur = (conn or self._conn()).execute("""UPDATE jobs SET state = 'done', lease_owner = NULL, lease_until = NULL,
+                                                    result = ?, last_error = NULL, updated_at = ?
+                                                WHERE id = ? AND lease_owner = ? AND state = 'leased'""",
+                                             (None if result is None else json.dumps(result), time.time(), job_id, owner))
+        return cur.rowcount == 1
+
+    def fail(self, job_id, owner, error, retry=True):
+        t = time.time()
+        cur = self._conn().execute("""UPDATE jobs SET lease_owner = NULL, lease_until = NULL, last_error = ?, updated_at = ?,
+                                          state = CASE WHEN ? AND attempts < max_attempts THEN 'pending' ELSE 'failed' END,
+                                          not_before = ? + ? * (1 << MAX(attempts - 1, 0))
+                                      WHERE id = ? AND lease_owner = ? AND state = 'leased'""",
+                                   (str(error)[:500], t, retry, t, RETRY_BASE, job_id, owner))
+        return cur.rowcount == 1
+
+    def release(self, job_id, owner):
+        """Kembalikan job tanpa menghitung percobaan (worker berhenti baik-baik)"""
+        self._conn().execute("""UPDATE jobs SET state = 'pending', lease_owner = NULL, lease_until = NULL,
+                                    attempts = attempts - 1, updated_at = ?
+                                WHERE id = ? AND lease_owner = ? AND state = 'leased'""", (time.time(), job_id, owner))
+
+    def active(self):
+        """Jumlah job pending + leased (0 = antrian habis)"""
+        return self._conn().execute("SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'leased')").fetchone()[0]
+
+    def retry_failed(self):
+        return self._conn().execute("""UPDATE jobs SET state = 'pending', attempts = 0, not_before = 0, updated_at = ?
+                                       WHERE state = 'failed'""", (time.time(),)).rowcount
+
+    def stats(self):
+        return self._conn().execute("""SELECT kind, state, COUNT(*) FROM jobs GROUP BY kind, state ORDER BY kind, state""").fetchall()
+
+# === JOB KOMIK & CHAPTER ===
+def load_record(url, title):
+    path = naming.comic_path(scrape.OUTPUT_DIR, url)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('url') == url:
+            changefeed.remember(data)
+            return data
+    # File lama masih bernama title (belum naming.py migrate)
+    return scrape.load_existing_comic(url)
+
+def run_comic_job(queue, job):
+    url, title = job['url'], job['payload']['title']
+    with profiling.stage("detail"):
+        s_detail = scrape.soup(url)
+        if not s_detail:
+            raise RuntimeError("gagal akses detail")
+        info = scrape.extract_comic_info(s_detail, url, None if job['payload'].get('guessed_title') else title)
+        title = info['title']
+        chapters_data = scrape.extract_chapters(s_detail)
+
+    with queue.exclusive() as conn:
+        flush_chapters(conn, url, title)  # sisa hasil chapter dari run sebelumnya
+        record = load_record(url, title)
+        if record is None:
+            record = {**info, "chapters": []}
+        else:
+            record['title'] = title
+            if info.get('last_updated'):
+                record['last_updated'] = info['last_updated']
+        scrape.save_comic(record)
+        have = {shard.chapter_key(ch) for ch in record['chapters'] if ch.get('images')}
+        missing = [ch for ch in reversed(chapters_data) if shard.chapter_key(ch) not in have]  # dari chapter 1
+        for ch in missing:
+            queue.put("chapter", ch['url'], {"title": title, "number": ch['number'], "date": ch['date'],
+                                             "dated_at": scrape.now()},
+                      job['priority'] + PRIORITY_CHAPTER, parent=url, conn=conn)
+        queue.complete(job['id'], job['lease_owner'], {"chapters": len(chapters_data), "queued": len(missing)}, conn=conn)
+    print(f"[{scrape.now()}]    {title}: {len(chapters_data)} chapter, {len(missing)} diantrekan")
+
+def run_chapter_job(queue, job):
+    with profiling.stage("chapters"):
+        images = scrape.chapter_images(job['url'])
+        if images is None:
+            raise RuntimeError("gagal akses chapter")
+    with queue.exclusive() as conn:
+        if not queue.complete(job['id'], job['lease_owner'], {"images": images}, conn=conn):
+            return
+        pending = conn.execute("SELECT COUNT(*) FROM jobs WHERE parent = ? AND state IN ('pending', 'leased')",
+                               (job['parent'],)).fetchone()[0]
+        unflushed = conn.execute("SELECT COUNT(*) FROM jobs WHERE parent = ? AND state = 'done' AND NOT flushed",
+                                 (job['parent'],)).fetchone()[0]
+        if unflushed >= FLUSH_EVERY or not pending:
+            flush_chapters(conn, job['parent'], job['payload']['title'])
+    metrics.sleep(scrape.DELAY_CHAPTER)
+
+def flush_chapters(conn, comic_url, title):
+    """Tulis hasil chapter yang sudah selesai ke file komik (di dalam transaksi exclusive)"""
+    rows = conn.execute("SELECT id, url, payload, result FROM jobs WHERE parent = ? AND state = 'done' AND NOT flushed",
+                        (comic_url,)).fetchall()
+    record = load_record(comic_url, title)
+    if not rows or record is None:
+        return
+    # Nomor bisa dobel (mis. '276.HQ' dua kali): cocokkan nomor + url chapter job
+    chapters = {shard.chapter_key(ch): ch for ch in record['chapters']}
+    for row in rows:
+        payload, result = json.loads(row['payload']), json.loads(row['result'])
+        chapters[(payload['number'], shard.canonical_url(row['url']))] = {"number": payload['number'], "url": row['url'],
+                                       "date": payload['date'], "dated_at": payload.get('dated_at'),
+                                       "images": result['images']}
+    record['chapters'] = sorted(chapters.values(), key=shard.chapter_sort_key)
+    scrape.save_comic(record)
+    conn.executemany("UPDATE jobs SET flushed = 1 WHERE id = ?", [(row['id'],) for row in rows])
+
+HANDLERS = {"comic": run_comic_job, "chapter": run_chapter_job}
+
+# === WORKER ===
+class Heartbeat(threading.Thread):
+    """Perpanjang lease job yang sedang jalan setiap lease/3 detik"""
+
+    def __init__(self, queue, job, lease):
+        super().__init__(daemon=True)
+        self.queue, self.job, self.lease = queue, job, lease
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self):
+        while not self.stopped.wait(self.lease / 3):
+            if not self.queue.heartbeat(self.job['id'], self.job['lease_owner'], self.lease):
+                self.lost = True
+                return
+
+def work(queue_path, lease=LEASE_SECONDS, wait=False):
+    """Loop worker: claim -> jalankan -> complete/fail sampai antrian habis"""
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    queue = JobQueue(queue_path)
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    done = failed = 0
+    print(f"[{scrape.now()}] Worker {owner} mulai")
+    job = None
+    try:
+        while True:
+            if not budget.allows(budget.cost(1, scrape.DELAY_CHAPTER, detail=False)):
+                print(f"[{scrape.now()}] Deadline dekat, berhenti mengambil job ({queue.active()} job tersisa di antrian)")
+                break
+            job = queue.claim(owner, lease)
+            if job is None:
+                if not wait and not queue.active():
+                    break
+                time.sleep(1.0)
+                continue
+            job['lease_owner'] = owner
+            beat = Heartbeat(queue, job, lease)
+            beat.start()
+            try:
+                HANDLERS[job['kind']](queue, job)
+                done += 1
+            except Exception as e:
+                failed += 1
+                print(f"[{scrape.now()}]    Gagal {job['kind']} {job['url']} (percobaan {job['attempts']}): {e}")
+                queue.fail(job['id'], owner, e)
+            finally:
+                beat.stopped.set()
+            if beat.lost:
+                print(f"[{scrape.now()}]    Lease {job['url']} hilang (diambil worker lain)")
+            job = None
+    except KeyboardInterrupt:
+        if job:
+            queue.release(job['id'], owner)
+        print(f"[{scrape.now()}] Worker {owner} dihentikan")
+    print(f"[{scrape.now()}] Worker {owner} selesai: {done} job, {failed} gagal")
+    return done
+
+def worker_main(args):
+    metrics.configure(args.metrics_out, args.metrics_interval)
+    profiling.configure(args.profile, args.profile_dir, args.profile_interval)
+    transport.configure(args.http_mode, args.record_dir, args.replay_latency, args.replay_jitter, request_rate(args),
+                        args.backend)
+    html_cache.configure(args.html_cache, args.cache_policy, args.cache_max_mb, args.cache_max_age)
+    chapterstream.configure(args.stream_chapters)
+    budget.configure(args.deadline, args.time_budget)
+    changefeed.configure(args.feed_dir)
+    searchindex.configure(args.search_index)
+    work(args.queue, args.lease, args.wait)
+    extract_plan.report(print)
+    chapterstream.report(print)
+    metrics.finish(print)
+    profiling.finish(print)
+    changefeed.finish(print)
+
+def seed(args):
+    transport.configure(args.http_mode, args.record_dir, args.replay_latency, args.replay_jitter, request_rate(args),
+                        args.backend)
+    html_cache.configure(args.html_cache, args.cache_policy, args.cache_max_mb, args.cache_max_age)
+    revisit.configure(args.revisit, args.refresh, args.shard)
+    queue = JobQueue(args.queue)
+    existing_comics = scrape.get_all_existing_comics()
+    all_comics = scrape.discover(args, existing_comics)
+    all_comics = revisit.select(all_comics, existing_comics)
+    if args.order == 'priority':
+        all_comics = schedule.order(all_comics, existing_comics)
+    with queue.exclusive() as conn:
+        for rank, comic in enumerate(all_comics):
+            # Urutan jadwal -> prioritas menurun; chapter tetap di atas komiknya
+            priority = PRIORITY_COMIC + (len(all_comics) - rank) * PRIORITY_CHAPTER * 2
+            payload = {"title": comic['title'], **({"guessed_title": True} if comic.get('guessed_title') else {})}
+            queue.put("comic", comic['url'], payload, priority, conn=conn)
+            sitemap.done(comic['url'])  # sudah aman di antrian
+            revisit.checked(comic['url'])  # worker pasti mengambil detail-nya
+    print(f"[{scrape.now()}] {len(all_comics)} job komik diantrekan ke {args.queue}")
+    sitemap.finish(print)
+    revisit.finish(print)
+
+# === CLI ===
+def main():
+    parser = build_parser("Antrian job scraper KomikIndo (SQLite, banyak worker)")
+    parser.add_argument('command', choices=('seed', 'work', 'stats', 'retry-failed'))
+    parser.add_argument('--queue', default=QUEUE_PATH, metavar='FILE')
+    parser.add_argument('--workers', type=int, default=1, help='Jumlah proses worker (work)')
+    parser.add_argument('--lease', type=float, default=LEASE_SECONDS, metavar='DETIK')
+    parser.add_argument('--wait', action='store_true', help='Worker tetap menunggu job baru saat antrian kosong')
+    args = parser.parse_args()
+
+    if args.command == 'seed':
+        seed(args)
+    elif args.command == 'work' and args.workers == 1:
+        worker_main(args)
+    elif args.command == 'work':
+        procs = [multiprocessing.Process(target=worker_main, args=(args,)) for _ in range(args.workers)]
+        for p in procs:
+            p.start()
+        try:
+            for p in procs:
+                p.join()
+        except KeyboardInterrupt:
+            for p in procs:
+                p.join()
+    elif args.command == 'retry-failed':
+        print(f"{JobQueue(args.queue).retry_failed()} job failed diantrekan ulang")
+    for kind, state, count in JobQueue(args.queue).stats():
+        print(f"{kind:8} {state:8} {count}")
+
+if __name__ == "__main__":
+    main()
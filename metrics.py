@@ -0,0 +1,287 @@
+import json, threading, time, re
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+# === KONFIGURASI ===
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SUMMARY_INTERVAL = 60.0
+
+def now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+# === PAGE TYPE ===
+def page_type(url):
+    """Kelompokkan URL komikindo: list, detail, atau chapter"""
+    if not url:
+        return "unknown"
+    if '/komik-terbaru/' in url:
+        return "list"
+    if re.search(r'-chapter-\d+', url) or re.search(r'/chapter-\d+', url):
+        return "chapter"
+    if '/komik/' in url:
+        return "detail"
+    if '/feed/' in url:
+        return "feed"
+    return "other"
+
+# === COUNTER & HISTOGRAM ===
+class Counter:
+    kind = "counter"
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # slot terakhir = +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Estimasi quantile dari bucket (interpolasi linear, seperti histogram_quantile)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, bound in enumerate(self.buckets):
+            if seen + self.counts[i] >= rank:
+                if not self.counts[i]:
+                    return bound
+                return lower + (bound - lower) * (rank - seen) / self.counts[i]
+            seen += self.counts[i]
+            lower = bound
+        return self.buckets[-1]
+
+# === REGISTRY ===
+class Registry:
+    """Kumpulan counter/histogram berlabel, aman dipakai dari banyak thread"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self.help = {}
+        self.started = time.time()
+
+    def _get(self, cls, name, labels, **kwargs):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self.metrics.get(key)
+        if metric is None:
+            metric = self.metrics[key] = cls(**kwargs)
+        return metric
+
+    def describe(self, name, text):
+        self.help[name] = text
+
+    def inc(self, name, amount=1, **labels):
+        with self.lock:
+            self._get(Counter, name, labels).inc(amount)
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        with self.lock:
+            self._get(Histogram, name, labels, buckets=buckets).observe(value)
+
+    def value(self, name, **labels):
+        """Total counter (atau jumlah observasi histogram) untuk label yang cocok"""
+        total = 0.0
+        with self.lock:
+            for (metric_name, metric_labels), metric in self.metrics.items():
+                if metric_name != name:
+                    continue
+                if any(dict(metric_labels).get(k) != v for k, v in labels.items()):
+                    continue
+                total += metric.value if metric.kind == "counter" else metric.sum
+        return total
+
+    def histograms(self, name):
+        with self.lock:
+            return {labels: metric for (metric_name, labels), metric in self.metrics.items()
+                    if metric_name == name and metric.kind == "histogram"}
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    # === EXPORT ===
+    def to_prometheus(self):
+        lines = []
+        with self.lock:
+            items = sorted(self.metrics.items(), key=lambda kv: kv[0])
+            seen = set()
+            for (name, labels), metric in items:
+                if name not in seen:
+                    seen.add(name)
+                    if name in self.help:
+                        lines.append(f"# HELP {name} {self.help[name]}")
+                    lines.append(f"# TYPE {name} {metric.kind}")
+                if metric.kind == "counter":
+                    lines.append(f"{name}{_labels(labels)} {metric.value:g}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets + ("+Inf",), metric.counts):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else f"{bound:g}"
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {metric.sum:g}")
+                lines.append(f"{name}_count{_labels(labels)} {metric.count}")
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self):
+        summary = {"started_at": datetime.fromtimestamp(self.started).strftime('%Y-%m-%d %H:%M:%S'),
+                   "elapsed_seconds": round(time.time() - self.started, 3),
+                   "metrics": {}}
+        with self.lock:
+            for (name, labels), metric in sorted(self.metrics.items(), key=lambda kv: kv[0]):
+                entry = {"labels": dict(labels)}
+                if metric.kind == "counter":
+                    entry["value"] = metric.value
+                else:
+                    entry.update({
+                        "count": metric.count,
+                        "sum": round(metric.sum, 6),
+                        "p50": round(metric.quantile(0.5), 6),
+                        "p95": round(metric.quantile(0.95), 6),
+                    })
+                summary["metrics"].setdefault(name, []).append(entry)
+        return summary
+
+def _labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for k, v in labels:
+        v = str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+REGISTRY = Registry()
+REGISTRY.describe("scraper_requests_total", "HTTP request per page type dan hasil")
+REGISTRY.describe("scraper_request_seconds", "Latency HTTP request per page type")
+REGISTRY.describe("scraper_response_bytes_total", "Byte body response yang diunduh per page type")
+REGISTRY.describe("scraper_wire_bytes_total", "Byte body di network (sebelum decode gzip/br) per page type, encoding, protokol")
+REGISTRY.describe("scraper_decoded_bytes_total", "Byte body setelah decode, pasangan scraper_wire_bytes_total")
+REGISTRY.describe("scraper_parse_seconds", "Waktu parsing HTML dan extract per stage")
+REGISTRY.describe("scraper_save_seconds", "Waktu menulis file komik ke disk")
+REGISTRY.describe("scraper_saved_bytes_total", "Byte JSON yang ditulis ke disk")
+REGISTRY.describe("scraper_sleep_seconds_total", "Waktu tidur (delay) antar request")
+
+# === HELPER UNTUK SCRIPT ===
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+
+def timed(name, **labels):
+    """Decorator: catat durasi fungsi ke histogram `name`"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with REGISTRY.timer(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def sleep(seconds):
+    """time.sleep yang tercatat, supaya waktu tidur bisa dipisah dari waktu kerja"""
+    time.sleep(seconds)
+    REGISTRY.inc("scraper_sleep_seconds_total", seconds)
+
+def record_response(url, seconds, body=None, error=False):
+    kind = page_type(url)
+    REGISTRY.observe("scraper_request_seconds", seconds, page_type=kind)
+    REGISTRY.inc("scraper_requests_total", page_type=kind, status="error" if error else "ok")
+    if body is not None:
+        REGISTRY.inc("scraper_response_bytes_total", len(body), page_type=kind)
+
+def record_transfer(url, wire, decoded, encoding, protocol):
+    labels = {"page_type": page_type(url), "encoding": encoding, "protocol": protocol}
+    REGISTRY.inc("scraper_wire_bytes_total", wire, **labels)
+    REGISTRY.inc("scraper_decoded_bytes_total", decoded, **labels)
+
+def record_save(seconds, size):
+    REGISTRY.observe("scraper_save_seconds", seconds)
+    REGISTRY.inc("scraper_saved_bytes_total", size)
+
+# === RINGKASAN THROUGHPUT ===
+def summary_line():
+    elapsed = max(time.time() - REGISTRY.started, 1e-9)
+    requests_done = REGISTRY.value("scraper_requests_total")
+    errors = REGISTRY.value("scraper_requests_total", status="error")
+    mb = REGISTRY.value("scraper_response_bytes_total") / 1e6
+    parse = REGISTRY.value("scraper_parse_seconds")
+    save = REGISTRY.value("scraper_save_seconds")
+    slept = REGISTRY.value("scraper_sleep_seconds_total")
+    wire = REGISTRY.value("scraper_wire_bytes_total")
+    decoded = REGISTRY.value("scraper_decoded_bytes_total")
+    latency = []
+    for labels, hist in sorted(REGISTRY.histograms("scraper_request_seconds").items()):
+        latency.append(f"{dict(labels).get('page_type')} p50={hist.quantile(0.5):.2f}s p95={hist.quantile(0.95):.2f}s")
+    transfer = f" (kabel {wire / 1e6:.1f} MB, kompresi x{decoded / wire:.1f})" if wire else ""
+    return (f"[metrics] {requests_done:.0f} req ({requests_done / elapsed:.2f}/s, {errors:.0f} gagal) | "
+            f"{mb:.1f} MB{transfer} | parse {parse:.1f}s | save {save:.1f}s | tidur {slept:.1f}s / {elapsed:.0f}s"
+            + (" | " + "; ".join(latency) if latency else ""))
+
+class ThroughputReporter(threading.Thread):
+    def __init__(self, interval, printer=print):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.printer = printer
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.printer(f"[{now()}] {summary_line()}")
+
+    def stop(self):
+        self.stopped.set()
+
+_outputs = []
+_reporter = None
+
+def configure(outputs=(), interval=SUMMARY_INTERVAL, printer=print):
+    """Set file export di akhir run dan mulai ringkasan periodik (interval <= 0 = mati)"""
+    global _reporter
+    _outputs[:] = list(outputs)
+    if interval and interval > 0:
+        _reporter = ThroughputReporter(interval, printer)
+        _reporter.start()
+
+def write(path):
+    if path.endswith('.json'):
+        content = json.dumps(REGISTRY.to_json(), ensure_ascii=False, indent=2)
+    else:
+        content = REGISTRY.to_prometheus()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+def finish(printer=print):
+    """Stop reporter, cetak ringkasan terakhir dan tulis semua export"""
+    if _reporter:
+        _reporter.stop()
+    printer(f"[{now()}] {summary_line()}")
+    for path in _outputs:
+        try:
+            write(path)
+            printer(f"[{now()}] Metrics ditulis: {path}")
+        except Exception as e:
+            printer(f"   Gagal tulis metrics {path}: {e}")
@@ -0,0 +1,179 @@
+"""
+Model komik/chapter ringkas untuk existing_comics di scrapemulti.py.
+
+Record dict penuh menyimpan satu dict per chapter plus list URL gambar,
+padahal yang dibutuhkan selama run hanya "chapter mana yang sudah ada".
+Comic/Chapter memakai __slots__ dan:
+- nomor chapter, tanggal relatif (dan waktu dibacanya) dan prefix URL (https://host/) di-intern,
+  jadi string yang sama dipakai bersama oleh semua chapter
+- list images tidak di-load: Comic dibangun dari comicmeta.read_header()
+  dan images seluruh chapter baru dibaca dari file saat pertama dibutuhkan
+  (Chapter.images / Comic.to_dict())
+- to_dict() menghasilkan schema JSON yang sama dengan save_comic()
+
+Perbandingan memori atas corpus: python bench/bench_load.py
+"""
+import json, sys
+import comicmeta, changefeed, shard
+
+# === KONFIGURASI ===
+# Urutan field = urutan di file komik (extract_comic_info + url/scraped_at)
+FIELDS = ("title", "cover_image", "alternative_titles", "status", "author", "illustrator", "type",
+          "demographic", "themes", "genres", "rating", "votes", "synopsis", "last_updated", "url", "scraped_at")
+CHAPTER_FIELDS = ("number", "url", "date", "dated_at")
+
+def intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def split_url(url):
+    """'https://host/slug-chapter-1/' -> ('https://host/' di-intern, 'slug-chapter-1/')"""
+    if not url:
+        return None, url
+    cut = url.find('/', url.find('//') + 2) + 1
+    if cut <= 0:
+        return None, url
+    return sys.intern(url[:cut]), url[cut:]
+
+# === CHAPTER ===
+class Chapter:
+    __slots__ = ("comic", "number", "date", "dated_at", "has_images", "_prefix", "_path", "_images")
+
+    def __init__(self, number, url=None, date=None, images=None, comic=None, has_images=None, dated_at=None):
+        self.comic = comic
+        self.number = intern(number)
+        self.date = intern(date)
+        self.dated_at = intern(dated_at)
+        self._prefix, self._path = split_url(url)
+        self._images = images
+        self.has_images = bool(images) if has_images is None else has_images
+
+    @property
+    def url(self):
+        return self._prefix + self._path if self._prefix else self._path
+
+    @property
+    def images(self):
+        if self._images is None:
+            if self.comic is not None:
+                self.comic.load_images()
+            if self._images is None:
+                self._images = []
+        return self._images
+
+    @images.setter
+    def images(self, images):
+        self._images = images
+        self.has_images = bool(images)
+
+    @classmethod
+    def from_dict(cls, data, comic=None):
+        return cls(data.get('number'), data.get('url'), data.get('date'), data.get('images'), comic,
+                   dated_at=data.get('dated_at'))
+
+    def to_dict(self):
+        data = {"number": self.number, "url": self.url, "date": self.date}
+        if self.dated_at:
+            data['dated_at'] = self.dated_at  # record lama belum punya field ini
+        data['images'] = self.images
+        return data
+
+    def __repr__(self):
+        return f"Chapter({self.number!r}, images={'?' if self._images is None else len(self._images)})"
+
+# === COMIC ===
+class Comic:
+    __slots__ = FIELDS + ("chapters", "path", "extra", "_loaded")
+
+    def __init__(self, path=None, **fields):
+        self.path = path
+        self.chapters = []
+        self.extra = {}
+        self._loaded = path is None
+        for field in FIELDS:
+            setattr(self, field, fields.get(field))
+
+    def get(self, key, default=None):
+        """Akses ala dict (read-only) untuk helper yang juga menerima record dict"""
+        if key in FIELDS or key == 'chapters':
+            return getattr(self, key)
+        return self.extra.get(key, default)
+
+    def __getitem__(self, key):
+        if key not in FIELDS and key != 'chapters' and key not in self.extra:
+            raise KeyError(key)
+        return self.get(key)
+
+    @property
+    def chapter_refs(self):
+        """Nomor + url tiap chapter sebagai dict (untuk helper shard yang menerima chapter dict)"""
+        return [{"number": ch.number, "url": ch.url} for ch in self.chapters]
+
+    @classmethod
+    def from_header(cls, header):
+        """Dari comicmeta.read_header(path, FIELDS, CHAPTER_FIELDS); images belum di-load"""
+        comic = cls(header['path'], **{field: intern(header.get(field)) if field in ("status", "type", "demographic")
+                                       else header.get(field) for field in FIELDS})
+        comic.chapters = [Chapter(info.get('number'), info.get('url'), info.get('date'), comic=comic,
+                                  has_images=info.get('has_images', False), dated_at=info.get('dated_at'))
+                          for info in header.get('chapter_info', [])]
+        return comic
+
+    @classmethod
+    def from_dict(cls, data):
+        comic = cls(**{field: data.get(field) for field in FIELDS})
+        comic.extra = {k: v for k, v in data.items() if k not in FIELDS and k != 'chapters'}
+        comic.chapters = [Chapter.from_dict(ch, comic) for ch in data.get('chapters', [])]
+        return comic
+
+    def load_images(self):
+        """Baca file sekali dan isi images semua chapter yang belum di-load.
+        Record dari disk sekaligus jadi baseline change feed."""
+        if self._loaded:
+            return
+        self._loaded = True
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        changefeed.remember(data)
+        self.extra.update((k, v) for k, v in data.items() if k not in FIELDS and k != 'chapters')
+        # Nomor chapter bisa dobel di satu komik (mis. dua '70'), jadi pakai nomor + url
+        stored = {(ch.get('number'), ch.get('url')): ch.get('images') or [] for ch in data.get('chapters', [])}
+        for chapter in self.chapters:
+            if chapter._images is None:
+                chapter._images = stored.get((chapter.number, chapter.url), [])
+
+    def add_chapters(self, chapters):
+        """Tambah chapter baru (dict) lalu urutkan seperti save_comic"""
+        self.chapters.extend(Chapter.from_dict(ch, self) for ch in chapters)
+        self.chapters.sort(key=lambda ch: shard.chapter_sort_key({"number": ch.number}))
+
+    def to_dict(self):
+        """Record dengan schema file komik (images di-load kalau belum)"""
+        self.load_images()
+        data = {field: getattr(self, field) for field in FIELDS}
+        data.update(self.extra)
+        data['chapters'] = [ch.to_dict() for ch in self.chapters]
+        return data
+
+    def __repr__(self):
+        return f"Comic({self.title!r}, {len(self.chapters)} chapter)"
+
+# === LOAD ===
+def stored_numbers(record):
+    """Nomor chapter yang images-nya sudah tersimpan (record dict atau Comic)"""
+    if isinstance(record, Comic):
+        return [ch.number for ch in record.chapters if ch.has_images]
+    return [ch['number'] for ch in record.get('chapters', []) if ch.get('images')]
+
+def chapter_dates(record):
+    """Tanggal relatif semua chapter (record dict atau Comic)"""
+    if isinstance(record, Comic):
+        return [ch.date for ch in record.chapters]
+    return [ch.get('date') for ch in record.get('chapters', [])]
+
+def load_dir(directory, printer=print):
+    """Semua komik di folder sebagai Comic, di-index by URL"""
+    comics = {}
+    for header in comicmeta.iter_headers(directory, FIELDS, CHAPTER_FIELDS, printer):
+        if header.get('url'):
+            comics[header['url']] = Comic.from_header(header)
+    return comics
@@ -0,0 +1,206 @@
+"""
+Nama file komik stabil dari slug URL (/komik/<slug>/ -> comics/<slug>.json).
+
+Dulu file dinamai sanitize_filename(title): berubah setiap title di list
+berubah (file lama tertinggal dan ikut ter-load) dan dua komik dengan title
+sama saling menimpa. Sekarang identitas file = slug URL kanonik; title hanya
+dicatat di alias map (comic_aliases.json, di luar folder comics supaya
+tidak dibaca sebagai komik):
+
+    {"titles": {"Solo Leveling": "solo-leveling.json", ...},
+     "legacy": {"Solo-Leveling.json": "solo-leveling.json", ...}}
+
+save_comic() menulis ke path slug lalu menghapus file lain di folder yang
+berisi URL yang sama (nama lama berbasis title). Corpus lama dipindahkan
+sekali dengan:
+
+    python naming.py migrate [--dir comics] [--dry-run]
+"""
+import argparse, hashlib, json, os, re, threading
+from urllib.parse import unquote
+import comicmeta, shard
+
+# === KONFIGURASI ===
+ALIAS_PATH = "comic_aliases.json"
+MAX_SLUG_BYTES = 150
+
+def slug_of(url):
+    """'https://komikindo.ch/komik/797922-1st-year-max-level-manager/' -> '797922-1st-year-max-level-manager'"""
+    canonical = shard.canonical_url(url or '')
+    match = re.search(r'/komik/([^/?#]+)', canonical)
+    slug = unquote(match.group(1)) if match else canonical.split('//', 1)[-1]
+    slug = re.sub(r'[<>:"/\\|?*\s]+', '_', slug).strip('._') or 'komik'
+    if len(slug.encode('utf-8')) > MAX_SLUG_BYTES:
+        # Potong tapi tetap unik
+        digest = hashlib.sha1(slug.encode('utf-8')).hexdigest()[:10]
+        slug = slug.encode('utf-8')[:MAX_SLUG_BYTES - 11].decode('utf-8', 'ignore') + '-' + digest
+    return slug
+
+def filename(url):
+    return f"{slug_of(url)}.json"
+
+def comic_path(directory, url):
+    return os.path.join(directory, filename(url))
+
+# === ALIAS MAP ===
+def load_aliases(path=ALIAS_PATH):
+    if not os.path.exists(path):
+        return {"titles": {}, "legacy": {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data.setdefault("titles", {})
+    data.setdefault("legacy", {})
+    return data
+
+def save_aliases(aliases, path=ALIAS_PATH):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({k: dict(sorted(v.items())) for k, v in aliases.items()}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+# === SAAT SIMPAN ===
+class Files:
+    """url kanonik -> path file di satu folder, dibangun sekali (scan url saja)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.paths = None
+
+    def build(self, printer=print):
+        self.paths = {}
+        for header in comicmeta.iter_headers(self.directory, ("url",), None, printer):
+            if header.get('url'):
+                self.paths.setdefault(shard.canonical_url(header['url']), set()).add(header['path'])
+
+    def others(self, url, path, printer=print):
+        """File lain di folder yang berisi komik dengan url ini"""
+        if self.paths is None:
+            self.build(printer)
+        key = shard.canonical_url(url)
+        found = self.paths.get(key, set()) - {path}
+        self.paths[key] = {path}
+        return sorted(found)
+
+    def take(self, url, printer=print):
+        """Semua file berisi url ini, dikeluarkan dari peta (url lama setelah remap)"""
+        if self.paths is None:
+            self.build(printer)
+        return sorted(self.paths.pop(shard.canonical_url(url), set()))
+
+_lock = threading.Lock()
+_files = {}       # folder -> Files
+_aliases = None   # alias map, di-load saat simpan pertama
+_renamed = {}     # url kanonik baru -> url lama (remap dedup), file lama dihapus saat simpan
+
+def rename(old_url, new_url):
+    """Record di-remap ke URL baru: file URL lama dihapus saat record disimpan dengan URL baru"""
+    if old_url and shard.canonical_url(old_url) != shard.canonical_url(new_url):
+        with _lock:
+            _renamed[shard.canonical_url(new_url)] = old_url
+
+def record_save(record, path, printer=print):
+    """Dipanggil save_comic() setelah file ditulis: hapus file lama komik ini
+    (nama berbasis title, atau slug lama setelah remap dedup) dan perbarui
+    alias title -> file"""
+    global _aliases
+    url = record.get('url')
+    if not url:
+        return
+    directory = os.path.dirname(path)
+    with _lock:
+        files = _files.setdefault(directory, Files(directory))
+        name = os.path.basename(path)
+        removed = []
+        old_files = files.others(url, path, printer)
+        old_url = _renamed.pop(shard.canonical_url(url), None)
+        if old_url:
+            old_files += [old for old in files.take(old_url, printer) if old != path]
+        for old in old_files:
+            try:
+                os.remove(old)
+                removed.append(os.path.basename(old))
+            except FileNotFoundError:
+                pass
+        if _aliases is None:
+            _aliases = load_aliases()
+        changed = bool(removed)
+        if record.get('title') and _aliases["titles"].get(record['title']) != name:
+            _aliases["titles"][record['title']] = name
+            changed = True
+        for old in removed:
+            _aliases["legacy"][old] = name
+        if changed:
+            save_aliases(_aliases)
+    for old in removed:
+        printer(f"   File lama dihapus: {old} → {name}")
+
+# === MIGRASI ===
+def migrate(directory, alias_path=ALIAS_PATH, dry_run=False, printer=print):
+    """Gabungkan semua file per URL ke <slug>.json; file lain dihapus.
+    Chapter digabung dengan shard.merge_record (images terisi tidak ditimpa
+    list kosong), metadata dari record yang scraped_at-nya paling baru."""
+    # Kelompokkan per URL dari header saja; record penuh di-load per kelompok
+    groups, skipped = {}, 0
+    for header in comicmeta.iter_headers(directory, ("url", "title", "scraped_at"), None, printer):
+        if not header.get('url'):
+            printer(f"   Warning: {header['path']} tidak punya url, dilewati")
+            skipped += 1
+            continue
+        groups.setdefault(shard.canonical_url(header['url']), []).append(header)
+
+    aliases = load_aliases(alias_path)
+    renamed = merged_count = removed = 0
+    for key, headers in sorted(groups.items()):
+        headers.sort(key=lambda h: (h.get('scraped_at') or '', os.path.getmtime(h['path'])))
+        target = comic_path(directory, headers[-1]['url'])
+        sources = [h['path'] for h in headers]
+        if sources == [target]:
+            aliases["titles"][headers[-1].get('title')] = os.path.basename(target)
+            continue
+        record = None
+        for path in sources:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = shard.merge_record(record, json.load(f))
+        renamed += 1
+        merged_count += len(sources) > 1
+        printer(f"   {'(dry-run) ' if dry_run else ''}{', '.join(os.path.basename(p) for p in sources)} → "
+                f"{os.path.basename(target)} ({len(record['chapters'])} chapter)")
+        if dry_run:
+            continue
+        tmp = f"{target}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, target)
+        for path in sources:
+            # Filesystem case-insensitive: Solo-Leveling.json == solo-leveling.json
+            if path != target and not os.path.samefile(path, target):
+                os.remove(path)
+                removed += 1
+                aliases["legacy"][os.path.basename(path)] = os.path.basename(target)
+        aliases["titles"][record['title']] = os.path.basename(target)
+    if not dry_run:
+        save_aliases(aliases, alias_path)
+    printer(f"   Migrasi: {len(groups)} komik, {renamed} dipindah ({merged_count} hasil gabungan duplikat), "
+            f"{removed} file lama dihapus, {skipped} file dilewati" + (" (dry-run)" if dry_run else ""))
+
+# === CLI ===
+def main():
+    parser = argparse.ArgumentParser(description="Nama file komik berbasis slug URL")
+    parser.add_argument('--aliases', default=ALIAS_PATH, help=f'File alias title -> file (default {ALIAS_PATH})')
+    sub = parser.add_subparsers(dest='command', required=True)
+    mg = sub.add_parser('migrate', help='Pindahkan file berbasis title ke <slug>.json dan gabungkan duplikat')
+    mg.add_argument('--dir', default="comics")
+    mg.add_argument('--dry-run', action='store_true')
+    lk = sub.add_parser('lookup', help='Cari file dari title (atau nama file lama)')
+    lk.add_argument('name')
+    args = parser.parse_args()
+
+    if args.command == 'migrate':
+        migrate(args.dir, args.aliases, args.dry_run)
+        return
+    aliases = load_aliases(args.aliases)
+    found = aliases["titles"].get(args.name) or aliases["legacy"].get(args.name)
+    print(found or f"Tidak ada alias untuk {args.name!r}")
+
+if __name__ == "__main__":
+    main()
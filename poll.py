@@ -0,0 +1,315 @@
+"""
+Poll feed WordPress untuk deteksi chapter baru tanpa crawl list + detail.
+
+Chapter komikindo adalah post WordPress, jadi /feed/ berisi URL chapter
+terbaru + pubDate dalam satu request kecil. Tiap item dipetakan ke komik
+induknya dengan konvensi URL yang sama dengan is_comic_url() / dedup:
+
+    https://komikindo.ch/<slug seri>-chapter-70/  ->  record yang URL chapter-nya
+                                                      punya slug seri itu (atau
+                                                      /komik/<slug seri>/)
+
+Kalau komik ketemu dan chapter belum ada, hanya halaman chapter itu yang
+diambil (chapter_images / extract_chapter_images) lalu record disimpan.
+Kalau pemetaan gagal (komik baru, slug berubah) atau nomor chapter melompat
+(ada chapter yang tidak masuk feed), parent dicari dari halaman chapter
+(extract_plan.PARENT_COMIC) dan komik diproses lewat halaman detail seperti
+run biasa (process_comic).
+
+Feed diminta dengan If-None-Match / If-Modified-Since (live), dan halaman
+feed berikutnya (?paged=N) hanya dibaca kalau item terlama masih lebih baru
+dari poll sebelumnya. State di poll_state.json:
+
+    {"since": "<pubDate terbaru yang sudah diproses>", "pending": [url chapter gagal],
+     "etag": ..., "last_modified": ...}
+
+    python poll.py                    # sekali (cron)
+    python poll.py --interval 5m      # terus-menerus, cek tiap 5 menit
+
+Replay tanpa network dengan fixture feed:
+
+    python transport.py import https://komikindo.ch/feed/ bench/fixtures/feed.xml
+    python poll.py --http-mode replay
+"""
+import json, os, re, signal, time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import metrics, transport, html_cache, extract_plan, chapterstream, shard, schedule, changefeed, searchindex, dedup, naming
+from cli import build_parser, request_rate
+from scrape import (HEADERS, DELAY_CHAPTER, now, soup, save_comic, get_all_existing_comics, chapter_images,
+                    is_comic_url, process_comic, flush_in_progress)
+import sitemap
+
+# === KONFIGURASI ===
+FEED_URL = "https://komikindo.ch/feed/"
+STATE_PATH = "poll_state.json"
+MAX_FEED_PAGES = 5
+
+def parse_pubdate(value):
+    """'Sat, 18 Oct 2026 09:12:00 +0000' -> datetime UTC, None kalau tidak valid"""
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def format_age(published):
+    """datetime -> '5 menit yang lalu' (format tanggal chapter di halaman detail)"""
+    seconds = max((datetime.now(timezone.utc) - published).total_seconds(), 0)
+    for unit, size in sorted(schedule.AGE_UNITS.items(), key=lambda item: -item[1]):
+        if seconds >= size or unit == "detik":
+            return f"{int(seconds // size)} {unit} yang lalu"
+
+def chapter_slug(url):
+    """Slug seri dari URL chapter (konvensi dedup.series_slug), None kalau bukan URL chapter"""
+    return dedup.series_slug(urlsplit(url).path.lstrip('/'))
+
+def chapter_label(item):
+    """Nomor chapter dari title item ('Apotheosis Chapter 70'), fallback dari URL"""
+    match = re.search(r'chapter\s+([\d.]+)', item['title'] or '', re.I) or re.search(r'-chapter-([\d.]+)', item['url'])
+    return match.group(1).rstrip('.') if match else (item['title'] or item['url'])
+
+# === FEED ===
+def parse_feed(content):
+    """Item RSS2: title, url, published (datetime UTC)"""
+    items = []
+    for elem in ET.fromstring(content).iter('item'):
+        link = (elem.findtext('link') or '').strip()
+        if link:
+            items.append({"title": (elem.findtext('title') or '').strip(), "url": link,
+                          "published": parse_pubdate(elem.findtext('pubDate'))})
+    return items
+
+def fetch_feed(state, since):
+    """(items terbaru dulu, lengkap) atau (None, _) kalau feed tidak berubah (304).
+    lengkap = False kalau halaman feed habis sebelum mencapai since."""
+    items = []
+    for page in range(1, MAX_FEED_PAGES + 1):
+        url = FEED_URL if page == 1 else f"{FEED_URL}?paged={page}"
+        headers = dict(HEADERS)
+        # Conditional GET hanya live: 304 tanpa body tidak boleh masuk rekaman
+        if page == 1 and transport.TRANSPORT.mode == "live":
+            if state.get("etag"):
+                headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                headers["If-Modified-Since"] = state["last_modified"]
+        start = time.perf_counter()
+        try:
+            r = transport.fetch(url, headers=headers, timeout=15)
+            if r.status_code == 304:
+                metrics.record_response(url, time.perf_counter() - start)
+                return None, True
+            if page > 1 and r.status_code == 404:
+                break  # feed habis
+            r.raise_for_status()
+            page_items = parse_feed(r.content)
+        except Exception as e:
+            metrics.record_response(url, time.perf_counter() - start, error=True)
+            print(f"   Gagal: {e}")
+            if page == 1:
+                raise
+            break
+        metrics.record_response(url, time.perf_counter() - start, r.content)
+        if page == 1:
+            state["etag"] = r.headers.get('etag')
+            state["last_modified"] = r.headers.get('last-modified')
+        items += page_items
+        oldest = min((i['published'] for i in page_items if i['published']), default=None)
+        if since is None or not page_items or (oldest is not None and oldest <= since):
+            return items, True
+    return items, since is None
+
+# === PEMETAAN CHAPTER -> KOMIK ===
+class ComicIndex:
+    """slug seri -> url komik, dari URL komik dan URL chapter record yang sudah ada"""
+
+    def __init__(self, comics):
+        self.comics = comics
+        self.slugs = {}
+        for url, record in comics.items():
+            self.add(url, record)
+
+    def add(self, url, record):
+        self.slugs.setdefault(naming.slug_of(url), url)
+        for path in dedup.chapter_paths(record):
+            slug = dedup.series_slug(path)
+            if slug:
+                self.slugs[slug] = url
+
+    def lookup(self, chapter_url):
+        slug = chapter_slug(chapter_url)
+        url = self.slugs.get(slug) if slug else None
+        return self.comics.get(url) if url else None
+
+def chapter_urls(record):
+    return {shard.canonical_url(ch.get('url') or '') for ch in record.get('chapters', [])}
+
+def jumps(record, number):
+    """True kalau chapter ini melompati nomor (ada chapter yang tidak masuk feed)"""
+    new = schedule.chapter_number(number)
+    known = [schedule.chapter_number(ch.get('number')) for ch in record.get('chapters', [])]
+    known = [n for n in known if n is not None]
+    return new is not None and bool(known) and new - max(known) > 1
+
+# === PROSES ITEM ===
+def add_chapter(record, item):
+    """Ambil images satu chapter dan simpan ke record; False kalau halaman gagal"""
+    number = chapter_label(item)
+    print(f"[{now()}]    → Chapter BARU: {number} ({record['title']})")
+    images = chapter_images(item['url'])
+    if images is None:
+        print(f"[{now()}]       Gagal akses chapter")
+        return False
+    print(f"[{now()}]       Found {len(images)} images")
+    record['chapters'].append({
+        "number": number,
+        "url": item['url'],
+        "date": format_age(item['published']) if item['published'] else "",
+        "dated_at": now(),
+        "images": images
+    })
+    record['chapters'].sort(key=shard.chapter_sort_key)
+    save_comic(record)
+    return True
+
+def parent_of(chapter_url):
+    """URL komik induk dari link 'Semua chapter' di halaman chapter"""
+    s_ch = soup(chapter_url)
+    parent = extract_plan.PARENT_COMIC.run(s_ch) if s_ch else None
+    if parent:
+        return parent
+    slug = chapter_slug(chapter_url)
+    return f"https://komikindo.ch/komik/{slug}/" if slug else None
+
+def process_item(item, index):
+    """'chapter' / 'detail' / 'ada' / 'gagal'"""
+    url = item['url']
+    if is_comic_url(url):
+        comic_url = url  # post komik baru, bukan chapter
+    else:
+        record = index.lookup(url)
+        if record is not None and shard.canonical_url(url) in chapter_urls(record):
+            return "ada"
+        if record is not None and not jumps(record, chapter_label(item)):
+            return "chapter" if add_chapter(record, item) else "gagal"
+        if record is not None:
+            print(f"[{now()}]    Chapter {chapter_label(item)} melompat, cek halaman detail {record['title']}")
+            comic_url = record['url']
+        else:
+            comic_url = parent_of(url)
+            print(f"[{now()}]    Komik untuk {url} belum dikenal → {comic_url or 'tidak ketemu'}")
+            if not comic_url:
+                return "gagal"
+
+    existing = index.comics.get(comic_url)
+    comic = {"title": existing['title'] if existing else sitemap.title_from_url(comic_url), "url": comic_url,
+             "scraped_at": now(), "guessed_title": existing is None}
+    result = process_comic(comic, index.comics)
+    record = index.comics.get(comic_url)
+    if record is None:
+        return "gagal"
+    index.add(comic_url, record)
+    if result is None:
+        return "gagal"  # detail gagal diambil: item tetap pending
+    if comic_url != url and shard.canonical_url(url) not in chapter_urls(record):
+        return "gagal"  # chapter dari feed gagal / ditunda, coba lagi poll berikutnya
+    return "detail"
+
+# === STATE ===
+def load_state(path):
+    state = {"since": None, "pending": [], "etag": None, "last_modified": None}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            state.update(json.load(f))
+    return state
+
+def save_state(state, path):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({**state, "updated_at": now()}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+def poll(state, index, counts):
+    """Satu putaran: baca feed, proses item baru + item yang gagal sebelumnya"""
+    since = datetime.fromisoformat(state["since"]) if state["since"] else None
+    items, complete = fetch_feed(state, since)
+    if items is None:
+        print(f"[{now()}] Feed tidak berubah (304)")
+        return
+    pending = set(state["pending"])
+    fresh = [i for i in items if since is None or i['published'] is None or i['published'] > since
+             or i['url'] in pending]
+    seen = set()
+    fresh = [i for i in fresh if not (i['url'] in seen or seen.add(i['url']))]
+    print(f"[{now()}] Feed: {len(items)} item, {len(fresh)} baru sejak {state['since'] or 'awal'}")
+    if not complete:
+        print(f"[{now()}]    Warning: {MAX_FEED_PAGES} halaman feed belum mencapai poll sebelumnya; "
+              f"chapter di antaranya hanya terambil lewat run scrape biasa")
+
+    failed = set()
+    # Terlama dulu: chapter 69 disimpan sebelum 70, tidak dianggap lompatan
+    for item in sorted(fresh, key=lambda i: i['published'] or datetime.min.replace(tzinfo=timezone.utc)):
+        result = process_item(item, index)
+        counts[result] = counts.get(result, 0) + 1
+        metrics.inc("scraper_poll_items_total", result=result)
+        if result == "gagal":
+            failed.add(item['url'])
+        elif result != "ada":
+            metrics.sleep(DELAY_CHAPTER)
+
+    newest = max((i['published'] for i in items if i['published']), default=None)
+    if newest and (since is None or newest > since):
+        state["since"] = newest.isoformat()
+    state["pending"] = sorted(failed | (pending - {i['url'] for i in fresh}))
+
+# === MAIN ===
+def main():
+    parser = build_parser("Poll feed WordPress untuk chapter baru")
+    parser.add_argument('--interval', type=html_cache.parse_duration, metavar='DURASI',
+                        help='Poll terus dengan jeda ini (mis. 5m); tanpa opsi ini poll sekali lalu keluar')
+    parser.add_argument('--state', default=STATE_PATH, help=f'File state poll (default {STATE_PATH})')
+    args = parser.parse_args()
+    # scrape.py memasang handler Ctrl+C miliknya sendiri saat di-import
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    metrics.configure(args.metrics_out, args.metrics_interval)
+    transport.configure(args.http_mode, args.record_dir, args.replay_latency, args.replay_jitter, request_rate(args),
+                        args.backend)
+    html_cache.configure(args.html_cache, args.cache_policy, args.cache_max_mb, args.cache_max_age)
+    chapterstream.configure(args.stream_chapters)
+    changefeed.configure(args.feed_dir)
+    searchindex.configure(args.search_index)
+    dedup.configure(args.dedup)
+
+    state = load_state(args.state)
+    index = ComicIndex(get_all_existing_comics())
+    print(f"[{now()}] Poll {FEED_URL} ({len(index.comics)} komik, {len(index.slugs)} slug seri)"
+          + (f", tiap {args.interval:.0f} detik" if args.interval else ""))
+    counts = {}
+    try:
+        while True:
+            try:
+                poll(state, index, counts)
+            except Exception as e:
+                print(f"[{now()}] Poll gagal: {e}")
+            save_state(state, args.state)
+            if not args.interval:
+                break
+            metrics.sleep(args.interval)
+    except KeyboardInterrupt:
+        print(f"\n[{now()}] Dihentikan, simpan progress")
+        flush_in_progress()
+        save_state(state, args.state)
+
+    print(f"[{now()}] Hasil poll: {', '.join(f'{k}={v}' for k, v in sorted(counts.items())) or 'tidak ada item baru'}")
+    changefeed.finish(print)
+    extract_plan.report(print)
+    chapterstream.report(print)
+    metrics.finish(print)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import cProfile, pstats, io, json, os, sys, threading, time, tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+# === KONFIGURASI ===
+MODES = ("cprofile", "tracemalloc", "sample")
+PROFILE_ROOT = "profiles"
+SAMPLE_INTERVAL = 0.01
+SNAPSHOTS_PER_STAGE = 3   # snapshot tracemalloc mahal, cukup beberapa per stage
+TOP_N = 30
+
+def now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+# === PROFILER PER STAGE ===
+class Profiler:
+    """Profiling per stage (discovery, detail, chapters, save) tanpa ubah kode scraper"""
+
+    def __init__(self, modes=(), run_dir=None, sample_interval=SAMPLE_INTERVAL):
+        self.modes = set(modes)
+        self.run_dir = run_dir
+        self.sample_interval = sample_interval
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.active = {}                       # thread id -> stack nama stage
+        self.wall = defaultdict(float)
+        self.calls = Counter()
+        self.profiles = defaultdict(list)
+        self.skipped_profiles = Counter()
+        self.alloc_diffs = defaultdict(Counter)
+        self.alloc_snapshots = Counter()
+        self.samples = defaultdict(Counter)
+        self.sampler = None
+        self.stopped = threading.Event()
+
+        if "tracemalloc" in self.modes and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        if "sample" in self.modes:
+            self.sampler = threading.Thread(target=self._sample_loop, daemon=True)
+            self.sampler.start()
+
+    @property
+    def enabled(self):
+        return bool(self.modes)
+
+    def _stack(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+            with self.lock:
+                self.active[threading.get_ident()] = stack
+        return stack
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        stack = self._stack()
+        outer = stack[-1] if stack else None
+        profile = None
+        if "cprofile" in self.modes:
+            if outer and outer[1]:
+                outer[1].disable()
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Python 3.12+: hanya satu profiler aktif per interpreter
+                profile = None
+                with self.lock:
+                    self.skipped_profiles[name] += 1
+
+        snapshot = None
+        if "tracemalloc" in self.modes:
+            with self.lock:
+                take = self.alloc_snapshots[name] < SNAPSHOTS_PER_STAGE
+                if take:
+                    self.alloc_snapshots[name] += 1
+            if take:
+                snapshot = _snapshot()
+
+        stack.append((name, profile))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if profile:
+                profile.disable()
+            if snapshot:
+                diff = _snapshot().compare_to(snapshot, 'lineno')
+            with self.lock:
+                self.wall[name] += elapsed
+                self.calls[name] += 1
+                if profile:
+                    self.profiles[name].append(profile)
+                if snapshot:
+                    for stat in diff:
+                        if stat.size_diff > 0:
+                            frame = stat.traceback[0]
+                            self.alloc_diffs[name][f"{frame.filename}:{frame.lineno}"] += stat.size_diff
+            if outer and outer[1]:
+                outer[1].enable()
+
+    # === SAMPLING ===
+    def _sample_loop(self):
+        while not self.stopped.wait(self.sample_interval):
+            frames = sys._current_frames()
+            with self.lock:
+                active = [(tid, stack[-1][0]) for tid, stack in self.active.items() if stack]
+                for tid, name in active:
+                    frame = frames.get(tid)
+                    if frame is None:
+                        continue
+                    parts = []
+                    while frame is not None:
+                        code = frame.f_code
+                        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                        frame = frame.f_back
+                    self.samples[name][';'.join(reversed(parts))] += 1
+
+    # === LAPORAN ===
+    def write_reports(self):
+        if not self.enabled:
+            return None
+        self.stopped.set()
+        if self.sampler:
+            self.sampler.join(timeout=1)
+        os.makedirs(self.run_dir, exist_ok=True)
+
+        summary = {"modes": sorted(self.modes), "stages": {}}
+        with self.lock:
+            for name in sorted(self.calls):
+                summary["stages"][name] = {
+                    "calls": self.calls[name],
+                    "wall_seconds": round(self.wall[name], 3),
+                }
+
+            for name, profiles in self.profiles.items():
+                out = io.StringIO()
+                stats = pstats.Stats(profiles[0], stream=out)
+                for profile in profiles[1:]:
+                    stats.add(profile)
+                stats.dump_stats(os.path.join(self.run_dir, f"cprofile-{name}.prof"))
+                stats.sort_stats('cumulative').print_stats(TOP_N)
+                _write(os.path.join(self.run_dir, f"cprofile-{name}.txt"), out.getvalue())
+                summary["stages"][name]["cprofile_skipped"] = self.skipped_profiles[name]
+
+            for name, sites in self.alloc_diffs.items():
+                lines = [f"# Top alokasi stage '{name}' ({self.alloc_snapshots[name]} snapshot)"]
+                for site, size in sites.most_common(TOP_N):
+                    lines.append(f"{size / 1024:10.1f} KiB  {site}")
+                _write(os.path.join(self.run_dir, f"tracemalloc-{name}.txt"), '\n'.join(lines) + '\n')
+                summary["stages"][name]["top_allocations"] = [
+                    {"site": site, "bytes": size} for site, size in sites.most_common(5)]
+
+            for name, stacks in self.samples.items():
+                # Format "collapsed stack", bisa langsung dipakai flamegraph.pl / speedscope
+                _write(os.path.join(self.run_dir, f"samples-{name}.folded"),
+                       ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+                leaves = Counter()
+                for stack, count in stacks.items():
+                    leaves[stack.rsplit(';', 1)[-1]] += count
+                total = sum(leaves.values())
+                lines = [f"# Sampling stage '{name}': {total} sample @ {self.sample_interval}s"]
+                for leaf, count in leaves.most_common(TOP_N):
+                    lines.append(f"{100.0 * count / total:6.1f}%  {leaf}")
+                _write(os.path.join(self.run_dir, f"samples-{name}.txt"), '\n'.join(lines) + '\n')
+                summary["stages"].setdefault(name, {})["samples"] = total
+
+        if "tracemalloc" in self.modes:
+            current, peak = tracemalloc.get_traced_memory()
+            summary["traced_memory"] = {"current_bytes": current, "peak_bytes": peak}
+            top = _snapshot().statistics('lineno')[:TOP_N]
+            _write(os.path.join(self.run_dir, "tracemalloc-final.txt"),
+                   ''.join(f"{stat}\n" for stat in top))
+
+        _write(os.path.join(self.run_dir, "summary.json"), json.dumps(summary, indent=2))
+        return self.run_dir
+
+def _snapshot():
+    # Buang alokasi milik tracemalloc/profiler sendiri dari laporan
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+
+def _write(path, content):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+# === HELPER UNTUK SCRIPT ===
+PROFILER = Profiler()
+
+def parse_modes(spec):
+    """'cprofile,sample' -> {'cprofile', 'sample'}; 'all' = semua mode"""
+    if not spec:
+        return set()
+    modes = {m.strip().lower() for m in spec.split(',') if m.strip()}
+    if 'all' in modes:
+        return set(MODES)
+    unknown = modes - set(MODES)
+    if unknown:
+        raise ValueError(f"Mode profile tidak dikenal: {', '.join(sorted(unknown))} (pilih: {', '.join(MODES)}, all)")
+    return modes
+
+def configure(modes, run_dir=None, sample_interval=SAMPLE_INTERVAL):
+    global PROFILER
+    if isinstance(modes, str):
+        modes = parse_modes(modes)
+    if not modes:
+        return
+    run_dir = run_dir or os.path.join(PROFILE_ROOT, datetime.now().strftime('%Y%m%d-%H%M%S'))
+    PROFILER = Profiler(modes, run_dir, sample_interval)
+
+def stage(name):
+    return PROFILER.stage(name)
+
+def finish(printer=print):
+    run_dir = PROFILER.write_reports()
+    if run_dir:
+        printer(f"[{now()}] Laporan profiling ditulis ke: {run_dir}")
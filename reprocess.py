@@ -0,0 +1,197 @@
+"""
+Re-extract semua komik di comics/ dari HTML yang sudah tersimpan, tanpa network.
+
+Sumber HTML: cache HTML (--html-cache, lihat html_cache.py) dan/atau rekaman
+transport (--record-dir, lihat transport.py). Untuk setiap komik, halaman
+detail di-parse ulang dengan extract_comic_info()/extract_chapters() dan
+hasilnya di-merge ke record yang ada:
+
+- metadata (status, genre, sinopsis, rating, ...) dan tanggal chapter diganti
+  hasil extractor terbaru, kecuali extractor tidak menemukan apa-apa atau
+  HTML-nya lebih lama dari detail yang jadi sumber record (scraped_at)
+- chapter dicocokkan per (nomor, url); chapter tanpa url (record lama
+  scrape_manga.py) per nomor dan dilengkapi url-nya
+- list images yang sudah terisi tidak pernah diubah; chapter dengan images
+  kosong diisi dari halaman chapter yang ada di cache
+- chapter baru hanya ditambahkan kalau halaman chapternya ada di cache
+
+Worker hanya mem-parse; record yang berubah disimpan proses utama lewat
+save_comic(), jadi change feed, index pencarian dan alias nama ikut diperbarui.
+
+    python reprocess.py --html-cache html_cache.sqlite [--workers 8] [--dry-run]
+"""
+import argparse, json, os, signal, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from bs4 import BeautifulSoup
+import html_cache, transport, schedule, shard, changefeed, searchindex, scrape
+from scrape import BASE_DIR, now, extract_comic_info, extract_chapters, extract_chapter_images
+
+# Field metadata yang boleh ditimpa hasil re-extract
+META_FIELDS = ("cover_image", "alternative_titles", "status", "author", "illustrator", "type",
+               "demographic", "themes", "genres", "rating", "votes", "synopsis", "last_updated")
+STALE_SLACK = 60  # detik; scraped_at di-stamp (presisi detik) sesaat setelah detail-nya di-fetch
+
+# === SUMBER HTML (per proses worker) ===
+_sources = {}
+
+def init_worker(cache_path, record_dir):
+    _sources['cache'] = html_cache.HtmlCache(cache_path) if cache_path else None
+    _sources['record_dir'] = record_dir
+
+def stored_html(url):
+    """(html, epoch saat diambil) dari cache / rekaman, atau (None, None)"""
+    cache = _sources.get('cache')
+    if cache:
+        html = cache.lookup(url, fresh=False)
+        if html is not None:
+            return html, cache.fetched_at(url)
+    record_dir = _sources.get('record_dir')
+    if record_dir:
+        r = transport.read_record(record_dir, url)
+        if r is not None and r.status_code < 400:
+            r.encoding = 'utf-8'
+            return r.text, schedule.stamp_epoch(r.recorded_at)
+    return None, None
+
+def html_fresh(fetched_at, record):
+    """HTML tidak lebih lama dari halaman detail sumber record. scraped_at di-stamp
+    extract_comic_info() saat detail itu di-parse; mtime file tidak dipakai
+    (berubah tiap save / checkout)."""
+    if fetched_at is None:
+        return False
+    scraped = schedule.scraped_epoch(record)
+    return scraped is None or fetched_at >= scraped - STALE_SLACK
+
+# === MERGE ===
+def merge(record, info, chapters, chapter_images, fresh=True):
+    """Merge hasil extract ke record; return daftar perubahan.
+    fresh=False (HTML lebih lama dari record): metadata dan tanggal tidak disentuh."""
+    changes = []
+    for field in META_FIELDS if fresh else ():
+        value = info.get(field)
+        if value in (None, "", [], 0, 0.0):
+            continue
+        if record.get(field) != value:
+            record[field] = value
+            changes.append(field)
+
+    # Nomor bisa dobel (mis. '276.HQ' dua kali): cocokkan nomor + url dulu
+    by_key = {shard.chapter_key(ch): ch for ch in record.get('chapters', [])}
+    no_url = {ch['number']: ch for ch in record.get('chapters', []) if not ch.get('url')}
+    added = 0
+    for ch in chapters:
+        existing = by_key.get(shard.chapter_key(ch)) or no_url.pop(ch['number'], None)
+        if existing is None:
+            images = chapter_images(ch['url'])
+            if images:
+                record.setdefault('chapters', []).append({**ch, "images": images})
+                added += 1
+            continue
+        if ch['url'] and not existing.get('url'):
+            existing['url'] = ch['url']
+            changes.append(f"url:{ch['number']}")
+        if fresh and ch['date'] and existing.get('date') != ch['date']:
+            existing['date'] = ch['date']
+            existing['dated_at'] = ch['dated_at']
+            changes.append(f"date:{ch['number']}")
+        if not existing.get('images'):
+            images = chapter_images(existing.get('url') or ch['url'])
+            if images:
+                existing['images'] = images
+                changes.append(f"images:{ch['number']}")
+
+    if added:
+        record['chapters'].sort(key=shard.chapter_sort_key)
+        changes.append(f"+{added} chapter")
+    return changes
+
+def chapter_images_from_store(url):
+    html = stored_html(url)[0] if url else None
+    if not html:
+        return []
+    return extract_chapter_images(BeautifulSoup(html, 'html.parser'))
+
+def reprocess_file(path):
+    """(path, status, perubahan, record baru atau None); tidak menulis file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        record = json.load(f)
+    url = record.get('url')
+    if not url:
+        return path, "no-url", [], None
+    html, fetched_at = stored_html(url)
+    if html is None:
+        return path, "no-html", [], None
+
+    s_detail = BeautifulSoup(html, 'html.parser')
+    info = extract_comic_info(s_detail, url, record.get('title', ''))
+    chapters = extract_chapters(s_detail)
+    if fetched_at is not None:
+        # Tanggal relatif berlaku saat HTML diambil, bukan saat reprocess
+        for ch in chapters:
+            ch['dated_at'] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(fetched_at))
+    fresh = html_fresh(fetched_at, record)
+    changes = merge(record, info, chapters, chapter_images_from_store, fresh)
+    if not changes:
+        return path, "unchanged" if fresh else "stale-html", [], None
+    return path, "updated", changes, record
+
+def save_record(path, record):
+    """Simpan lewat save_comic(); isi file lama jadi baseline change feed"""
+    with open(path, 'r', encoding='utf-8') as f:
+        changefeed.remember(json.load(f))
+    scrape.save_comic(record)
+
+# === MAIN ===
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract corpus komik dari HTML tersimpan (offline)")
+    parser.add_argument('--comics-dir', default=BASE_DIR)
+    parser.add_argument('--html-cache', metavar='FILE', help='Cache HTML (html_cache.py)')
+    parser.add_argument('--record-dir', metavar='DIR', help='Rekaman transport (transport.py)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--dry-run', action='store_true', help='Hanya laporkan perubahan, jangan tulis file')
+    parser.add_argument('--verbose', action='store_true', help='Cetak perubahan per komik')
+    parser.add_argument('--feed-dir', default=changefeed.FEED_DIR, metavar='DIR',
+                        help='Folder change feed JSON Lines per run (default feed)')
+    parser.add_argument('--no-feed', dest='feed_dir', action='store_const', const=None,
+                        help='Jangan tulis change feed')
+    parser.add_argument('--search-index', default=searchindex.INDEX_PATH, metavar='FILE',
+                        help=f'Index pencarian SQLite yang diperbarui setiap simpan (default {searchindex.INDEX_PATH})')
+    parser.add_argument('--no-search-index', dest='search_index', action='store_const', const=None,
+                        help='Jangan perbarui index pencarian')
+    args = parser.parse_args()
+    # scrape.py memasang handler Ctrl+C miliknya sendiri saat di-import
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    if not args.html_cache and not args.record_dir:
+        parser.error("butuh --html-cache dan/atau --record-dir sebagai sumber HTML")
+    scrape.OUTPUT_DIR = args.comics_dir
+    if not args.dry_run:
+        changefeed.configure(args.feed_dir)
+        searchindex.configure(args.search_index)
+
+    files = sorted(os.path.join(args.comics_dir, f) for f in os.listdir(args.comics_dir) if f.endswith('.json'))
+    print(f"[{now()}] Reprocess {len(files)} komik dengan {args.workers} proses...")
+    start = time.time()
+    counts = {}
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(args.html_cache, args.record_dir)) as executor:
+        futures = [executor.submit(reprocess_file, path) for path in files]
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                path, status, changes, record = future.result()
+            except Exception as e:
+                status, changes, path, record = "error", [str(e)], "?", None
+            if record is not None and not args.dry_run:
+                save_record(path, record)
+            counts[status] = counts.get(status, 0) + 1
+            if args.verbose and changes:
+                print(f"   {os.path.basename(path)}: {status} {', '.join(changes[:10])}")
+            if done % 200 == 0:
+                print(f"[{now()}]    {done}/{len(files)} ({done / (time.time() - start):.0f} komik/detik)")
+
+    summary = ', '.join(f"{k}={v}" for k, v in sorted(counts.items()))
+    print(f"[{now()}] Selesai dalam {time.time() - start:.1f}s: {summary}" + (" (dry-run)" if args.dry_run else ""))
+    changefeed.finish(print)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Revalidasi sampel list images chapter lama.
+
+Chapter yang images-nya sudah tersimpan tidak pernah dicek lagi oleh run
+update, jadi gambar yang di-upload ulang / dipindah situs diam-diam basi.
+Mode ini mengambil sampel chapter lama dengan budget request per run,
+berbobot umur chapter (tanggal relatif dihitung dari dated_at chapter) dan
+popularitas komik, lalu:
+
+1. fetch halaman chapter (selalu live; cache HTML dilewati tapi diperbarui)
+2. fingerprint murah: regex src img di container Baca_Komik (sampai </div>
+   pasangannya, div bersarang ikut dihitung), dibandingkan dengan sha1 list
+   images tersimpan
+3. hanya kalau fingerprint beda, parse penuh dengan extract_chapter_images()
+   dan simpan kalau hasilnya memang berubah
+
+Di akhir dicetak estimasi tingkat basi seluruh corpus (sampel diboboti
+balik dengan peluang terambilnya).
+
+    python revalidate.py --budget 200 [--min-age 30d] [--dry-run]
+"""
+import hashlib, heapq, math, random, re, signal, time
+from bs4 import BeautifulSoup
+import metrics, transport, html_cache, schedule, changefeed, searchindex
+from cli import build_parser, request_rate
+from scrape import HEADERS, DELAY_CHAPTER, now, save_comic, get_all_existing_comics, extract_chapter_images
+
+IMG_ATTRS = ("src", "data-src", "data-lazy-src", "data-original")
+CONTAINER = re.compile(r'<div[^>]+id=["\']Baca_Komik["\'][^>]*>', re.I)
+DIV_TAG = re.compile(r'<(/?)div\b[^>]*>', re.I)
+IMG_TAG = re.compile(r'<img\b[^>]*>', re.I)
+ATTR = re.compile(r'([\w-]+)\s*=\s*["\']([^"\']*)["\']')
+
+# === FINGERPRINT ===
+def fingerprint(images):
+    return hashlib.sha1('\n'.join(images).encode('utf-8')).hexdigest()
+
+def container_html(html):
+    """Isi div#Baca_Komik sampai </div> pasangannya, None kalau tidak ketemu / tidak tertutup"""
+    match = CONTAINER.search(html)
+    if not match:
+        return None
+    depth = 1
+    for tag in DIV_TAG.finditer(html, match.end()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return html[match.end():tag.start()]
+    return None
+
+def quick_images(html):
+    """List images via regex (tanpa BeautifulSoup), aturan sama dengan extract_plan.parse_images.
+    None kalau container tidak ketemu -> perlu parse penuh."""
+    container = container_html(html)
+    if container is None:
+        return None
+    images, seen = [], set()
+    for tag in IMG_TAG.findall(container):
+        attrs = dict(ATTR.findall(tag))
+        src = next((attrs[a] for a in IMG_ATTRS if attrs.get(a)), None)
+        if src and src.startswith(('http://', 'https://')):
+            src = src.split('?')[0].strip()
+            if src not in seen:
+                seen.add(src)
+                images.append(src)
+    return images
+
+# === SAMPLING ===
+def chapter_weight(age, popularity):
+    """Chapter lama + komik populer lebih mungkin dicek; age dari schedule.chapter_age"""
+    age_days = age / 86400 if age is not None else 365
+    return math.log1p(age_days) * (0.5 + popularity)
+
+def sample(comics, budget, min_age=None, rng=random):
+    """Weighted sampling tanpa pengembalian (Efraimidis-Spirakis).
+    Return (sampel, total kandidat, jumlah bobot)."""
+    max_votes = max((c.get('votes') or 0 for c in comics.values()), default=0)
+    at = time.time()
+    candidates = []
+    for record in comics.values():
+        popularity = schedule.popularity(record, max_votes)
+        for chapter in record.get('chapters', []):
+            if not chapter.get('images') or not chapter.get('url'):
+                continue
+            age = schedule.chapter_age(record, chapter, at)
+            if min_age and age is not None and age < min_age:
+                continue
+            weight = chapter_weight(age, popularity)
+            if weight > 0:
+                candidates.append((weight, record, chapter))
+    total_weight = sum(w for w, _, _ in candidates)
+    keyed = ((rng.random() ** (1 / w), w, record, chapter) for w, record, chapter in candidates)
+    picked = heapq.nlargest(budget, keyed, key=lambda item: item[0])
+    return [(w, record, chapter) for _, w, record, chapter in picked], len(candidates), total_weight
+
+# === FETCH ===
+def fetch(url):
+    start = time.perf_counter()
+    try:
+        r = transport.fetch(url, headers=HEADERS, timeout=15)
+        r.encoding = 'utf-8'
+        r.raise_for_status()
+    except Exception as e:
+        metrics.record_response(url, time.perf_counter() - start, error=True)
+        print(f"   Gagal: {e}")
+        return None
+    metrics.record_response(url, time.perf_counter() - start, r.content)
+    html_cache.store(url, r.text)
+    return r.text
+
+def revalidate(chapter):
+    """'sama' / 'berubah' / 'kosong' / 'gagal'; images chapter diperbarui kalau berubah"""
+    html = fetch(chapter['url'])
+    if html is None:
+        return "gagal"
+    quick = quick_images(html)
+    if quick is not None and fingerprint(quick) == fingerprint(chapter['images']):
+        return "sama"
+    with metrics.timer("scraper_parse_seconds", stage="soup"):
+        s_ch = BeautifulSoup(html, 'html.parser')
+    images = extract_chapter_images(s_ch)
+    if not images:
+        return "kosong"  # jangan timpa images lama dengan list kosong
+    if images == chapter['images']:
+        return "sama"
+    chapter['images'] = images
+    return "berubah"
+
+# === MAIN ===
+def main():
+    parser = build_parser("Revalidasi sampel images chapter lama")
+    parser.add_argument('--budget', type=int, default=200, help='Maksimum request chapter per run (default 200)')
+    parser.add_argument('--min-age', type=html_cache.parse_duration, metavar='DURASI',
+                        help='Hanya chapter yang lebih tua dari ini (mis. 30d)')
+    parser.add_argument('--seed', type=int, help='Seed sampling (untuk run yang bisa diulang)')
+    parser.add_argument('--dry-run', action='store_true', help='Jangan tulis perubahan ke file komik')
+    args = parser.parse_args()
+    # scrape.py memasang handler Ctrl+C miliknya sendiri saat di-import
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    metrics.configure(args.metrics_out, args.metrics_interval)
+    transport.configure(args.http_mode, args.record_dir, args.replay_latency, args.replay_jitter, request_rate(args),
+                        args.backend)
+    html_cache.configure(args.html_cache, args.cache_policy, args.cache_max_mb, args.cache_max_age)
+    changefeed.configure(args.feed_dir)
+    searchindex.configure(args.search_index)
+
+    comics = get_all_existing_comics()
+    picked, population, total_weight = sample(comics, args.budget, args.min_age, random.Random(args.seed))
+    print(f"[{now()}] Revalidasi {len(picked)} dari {population} chapter (budget {args.budget})")
+
+    counts = {}
+    changed_records = {}
+    # Estimasi Horvitz-Thompson: tiap sampel mewakili 1/p chapter, p ~ budget * w / W
+    est_changed = est_total = 0.0
+    for i, (weight, record, chapter) in enumerate(picked, 1):
+        try:
+            result = revalidate(chapter)
+        except KeyboardInterrupt:
+            print(f"\n[{now()}] Dihentikan oleh user (Ctrl+C), simpan hasil sejauh ini")
+            break
+        counts[result] = counts.get(result, 0) + 1
+        metrics.inc("scraper_revalidate_total", result=result)
+        if result == "gagal":
+            continue
+        inverse = 1 / min(1.0, len(picked) * weight / total_weight)
+        est_total += inverse
+        if result == "berubah":
+            est_changed += inverse
+            changed_records[record['url']] = record
+            print(f"[{now()}]    Berubah: {record['title']} chapter {chapter['number']}")
+        if i % 50 == 0:
+            print(f"[{now()}]    {i}/{len(picked)} dicek")
+        metrics.sleep(DELAY_CHAPTER)
+
+    if not args.dry_run:
+        for record in changed_records.values():
+            save_comic(record)
+
+    checked = sum(v for k, v in counts.items() if k != "gagal")
+    print(f"\n[{now()}] Hasil: {', '.join(f'{k}={v}' for k, v in sorted(counts.items()))}"
+          + (" (dry-run)" if args.dry_run else ""))
+    if checked:
+        raw = counts.get("berubah", 0) / checked
+        rate = est_changed / est_total
+        # Interval kasar dari proporsi sampel (normal approx)
+        margin = 1.96 * math.sqrt(raw * (1 - raw) / checked)
+        print(f"[{now()}] Tingkat basi sampel: {raw:.1%} ± {margin:.1%}; "
+              f"estimasi corpus (berbobot balik): {rate:.1%} ≈ {rate * population:.0f} dari {population} chapter")
+    changefeed.finish(print)
+    metrics.finish(print)
+
+if __name__ == "__main__":
+    main()
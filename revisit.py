@@ -0,0 +1,154 @@
+"""
+Tier revisit: komik tamat / tidur tidak perlu dicek halaman detailnya setiap run.
+
+Setiap komik yang sudah ada masuk satu tier dari status (extract_comic_info)
+dan umur chapter terbaru saat disimpan (tanggal relatif terkecil; tidak
+di-resolve terhadap scraped_at karena chapter hasil update diambil jauh
+setelah scraped_at dan akan terlihat lebih tua dari aslinya):
+
+    berjalan    status lain, chapter terbaru < 60 hari   -> setiap run
+    lambat      chapter terbaru 60 hari - 1 tahun        -> tiap 3 hari
+    dorman      chapter terbaru > 1 tahun                -> tiap 14 hari
+    hiatus      status Hiatus                            -> tiap 14 hari
+    tamat       status Tamat / Completed                 -> tiap 30 hari
+    dibatalkan  status Dibatalkan / Cancelled            -> tiap 90 hari
+
+Komik tetap diproses walaupun belum jatuh tempo kalau list menunjukkan
+chapter yang belum tersimpan (latest_chapter), lastmod sitemap lebih baru
+dari pengecekan terakhir, atau di-refresh paksa (--revisit all /
+--refresh URL / slug). Waktu pengecekan detail terakhir per komik disimpan di
+revisit_state.json (per shard); tanpa entry, scraped_at record dipakai.
+Di akhir run dicetak jumlah fetch detail yang dihemat per tier.
+"""
+import json, os, threading, time
+import metrics, model, naming, schedule, shard, sitemap
+
+# === KONFIGURASI ===
+STATE_PATH = "revisit_state.json"
+MODES = ("tiers", "all")
+DAY = 86400
+TIERS = {  # tier -> jeda minimal antar cek detail (detik)
+    "berjalan": 0,
+    "lambat": 3 * DAY,
+    "dorman": 14 * DAY,
+    "hiatus": 14 * DAY,
+    "tamat": 30 * DAY,
+    "dibatalkan": 90 * DAY,
+}
+SLOW_AFTER = 60 * DAY
+DORMANT_AFTER = 365 * DAY
+
+def state_path(shard_spec=None):
+    if not shard_spec:
+        return STATE_PATH
+    return f"revisit_state.shard-{shard_spec[0]}-of-{shard_spec[1]}.json"
+
+def tier(record):
+    status = (record.get('status') or '').lower()
+    if 'tamat' in status or 'complete' in status:
+        return "tamat"
+    if 'batal' in status or 'cancel' in status:
+        return "dibatalkan"
+    if 'hiatus' in status:
+        return "hiatus"
+    ages = [schedule.parse_age(date) for date in model.chapter_dates(record)]
+    ages = [a for a in ages if a is not None]
+    if not ages:
+        return "berjalan"
+    age = min(ages)
+    return "dorman" if age > DORMANT_AFTER else "lambat" if age > SLOW_AFTER else "berjalan"
+
+# === REVISIT ===
+class Revisit:
+    def __init__(self, mode="tiers", refresh=(), path=STATE_PATH):
+        self.mode = mode
+        self.refresh = {shard.canonical_url(u) for u in refresh}  # url komik atau slug-nya
+        self.path = path
+        self.checked = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.checked = json.load(f)
+        self.counts = {}  # tier -> {"dicek": n, "dilewati": n}
+        self.lock = threading.Lock()
+
+    def last_check(self, url, record):
+        return self.checked.get(url) or schedule.scraped_epoch(record)
+
+    def reason(self, comic, record, at):
+        """Alasan komik tetap diproses, atau None kalau belum jatuh tempo"""
+        if record is None:
+            return "baru"
+        if self.mode == "all" or {shard.canonical_url(comic['url']), naming.slug_of(comic['url']).lower()} & self.refresh:
+            return "paksa"
+        if comic.get('latest_chapter') and schedule.missing_chapters(comic, record):
+            return "chapter baru di list"
+        last = self.last_check(comic['url'], record)
+        modified = sitemap.parse_lastmod(comic.get('lastmod'))
+        if modified and (last is None or modified.timestamp() > last):
+            return "lastmod sitemap"
+        if last is None or at - last >= TIERS[tier(record)]:
+            return "jatuh tempo"
+        return None
+
+    def select(self, all_comics, existing_comics, printer=print):
+        at = time.time()
+        kept = []
+        for comic in all_comics:
+            record = existing_comics.get(comic['url'])
+            name = tier(record) if record else "baru"
+            keep = self.reason(comic, record, at) is not None
+            with self.lock:
+                counts = self.counts.setdefault(name, {"dicek": 0, "dilewati": 0})
+                counts["dicek" if keep else "dilewati"] += 1
+            metrics.inc("scraper_revisit_total", tier=name, result="dicek" if keep else "dilewati")
+            if keep:
+                kept.append(comic)
+            else:
+                sitemap.done(comic['url'])  # belum jatuh tempo, bukan tertunda
+        skipped = len(all_comics) - len(kept)
+        if skipped:
+            printer(f"   Revisit: {skipped} komik belum jatuh tempo dilewati, {len(kept)} diproses")
+        return kept
+
+    def mark(self, url):
+        with self.lock:
+            self.checked[url] = time.time()
+
+    def summary(self, printer=print):
+        with self.lock:
+            counts = {name: dict(c) for name, c in self.counts.items()}
+        if not counts:
+            return
+        saved = sum(c["dilewati"] for c in counts.values())
+        order = ["baru"] + list(TIERS)
+        printer(f"   Revisit ({self.mode}): {saved} fetch detail dihemat | " + ", ".join(
+            f"{name} {c['dicek']} dicek/{c['dilewati']} dilewati"
+            for name, c in sorted(counts.items(), key=lambda item: order.index(item[0]))))
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            checked = dict(self.checked)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(checked, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+# === HELPER UNTUK SCRIPT ===
+REVISIT = Revisit(path=None)
+
+def configure(mode="tiers", refresh=(), shard_spec=None):
+    global REVISIT
+    REVISIT = Revisit(mode, refresh, state_path(shard_spec))
+
+def select(all_comics, existing_comics, printer=print):
+    return REVISIT.select(all_comics, existing_comics, printer)
+
+def checked(url):
+    """Dipanggil setelah halaman detail komik yang sudah ada berhasil diambil"""
+    REVISIT.mark(url)
+
+def finish(printer=print):
+    REVISIT.summary(printer)
+    REVISIT.save()
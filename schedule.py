@@ -0,0 +1,138 @@
+"""
+Urutan proses komik berdasarkan nilai per request, bukan urutan halaman list.
+
+Untuk setiap komik dari discovery dihitung:
+- missing : perkiraan chapter yang belum ada (chapter terbaru di list - chapter
+            terakhir yang sudah tersimpan; komik baru = semua chapter)
+- weight  : 1 + kesegaran (umur update di list / posisi list) + popularitas
+            (rating dan votes dari record yang sudah ada)
+- score   : weight * nilai chapter / biaya request. Beberapa chapter terbaru
+            bernilai penuh, chapter backfill lama hanya BACKFILL_VALUE, dan
+            biayanya 1 request detail + 1 request per chapter.
+
+Hasilnya update inkremental yang murah (1-2 chapter baru di komik populer)
+jalan duluan, backfill ratusan chapter belakangan, dan komik yang sudah
+lengkap paling akhir.
+"""
+import math, re, time
+from datetime import datetime
+import model
+
+# === KONFIGURASI ===
+FRESH_CHAPTERS = 3       # chapter terbaru yang dihitung bernilai penuh
+BACKFILL_VALUE = 0.1     # nilai relatif chapter lama saat backfill
+FRESH_HALF_LIFE = 7      # hari; kesegaran turun setengah tiap sekian hari
+UNKNOWN_POPULARITY = 0.5 # komik baru belum punya rating/votes
+
+AGE_UNITS = {
+    "detik": 1, "menit": 60, "jam": 3600, "hari": 86400,
+    "minggu": 7 * 86400, "bulan": 30 * 86400, "tahun": 365 * 86400,
+}
+
+def parse_age(text):
+    """'3 jam yang lalu' / '5 tahun yang lalu' -> detik, None kalau bukan tanggal relatif"""
+    match = re.search(r'(\d+)\s*(detik|menit|jam|hari|minggu|bulan|tahun)', (text or '').lower())
+    if not match:
+        return None
+    return int(match.group(1)) * AGE_UNITS[match.group(2)]
+
+def age_precision(text):
+    """Ketelitian tanggal relatif dalam detik ('3 bulan yang lalu' -> 1 bulan), None kalau bukan tanggal relatif"""
+    match = re.search(r'\d+\s*(detik|menit|jam|hari|minggu|bulan|tahun)', (text or '').lower())
+    return AGE_UNITS[match.group(1)] if match else None
+
+def stamp_epoch(text):
+    """Waktu hasil now() ('2025-11-07 14:28:12', waktu lokal) -> epoch, None kalau kosong / rusak"""
+    try:
+        return datetime.strptime(text or '', '%Y-%m-%d %H:%M:%S').timestamp()
+    except ValueError:
+        return None
+
+def scraped_epoch(record):
+    """scraped_at record -> epoch, None kalau tidak ada"""
+    return stamp_epoch(record.get('scraped_at'))
+
+def dated_epoch(record, chapter):
+    """Kapan tanggal relatif chapter dibaca: dated_at chapter, record lama pakai scraped_at"""
+    return stamp_epoch(chapter.get('dated_at')) or scraped_epoch(record)
+
+def chapter_age(record, chapter, at=None):
+    """Umur chapter saat `at` (detik): tanggal relatif ditambah waktu sejak tanggal itu
+    dibaca (dated_epoch). None kalau bukan tanggal relatif."""
+    age = parse_age(chapter.get('date'))
+    anchor = dated_epoch(record, chapter)
+    if age is None or anchor is None:
+        return age
+    return age + max((at or time.time()) - anchor, 0)
+
+def release_times(record):
+    """(epoch rilis chapter, ketelitian) dari tanggal relatif terhadap waktu dibacanya, terbaru dulu"""
+    out = []
+    for chapter in record.get('chapters', []):
+        age = parse_age(chapter.get('date'))
+        anchor = dated_epoch(record, chapter)
+        if age is not None and anchor is not None:
+            out.append((anchor - age, age_precision(chapter.get('date'))))
+    return sorted(out, reverse=True)
+
+def chapter_number(text):
+    match = re.search(r'\d+(?:\.\d+)?', text or '')
+    return float(match.group()) if match else None
+
+def list_meta(a_element):
+    """Chapter terbaru + umur update dari kartu komik di halaman list"""
+    post = a_element.find_parent(class_='animepost')
+    latest = post.select_one('.lsch a') if post else None
+    date = post.select_one('.lsch .datech') if post else None
+    return {
+        "latest_chapter": latest.get_text(strip=True) if latest else None,
+        "latest_date": date.get_text(strip=True) if date else None,
+    }
+
+# === SKOR ===
+def popularity(record, max_votes):
+    if not record or not (record.get('rating') or record.get('votes')):
+        return UNKNOWN_POPULARITY
+    rating = min(float(record.get('rating') or 0), 10.0) / 10
+    votes = math.log1p(record.get('votes') or 0) / math.log1p(max_votes) if max_votes else 0.0
+    return (rating + votes) / 2
+
+def freshness(comic, total):
+    age = parse_age(comic.get('latest_date'))
+    if age is not None:
+        return 0.5 ** (age / 86400 / FRESH_HALF_LIFE)
+    # Halaman komik-terbaru sudah terurut dari update terbaru
+    return 1 - comic.get('position', total) / max(total, 1)
+
+def missing_chapters(comic, record):
+    latest = chapter_number(comic.get('latest_chapter'))
+    if not record:
+        return int(latest) if latest else FRESH_CHAPTERS
+    have = [chapter_number(number) for number in model.stored_numbers(record)]
+    have = [n for n in have if n is not None]
+    if latest is None:
+        return 1  # tidak tahu; anggap ada satu chapter baru
+    return max(int(latest - max(have, default=0)), 0)
+
+def estimate(comic, record, total, max_votes):
+    missing = missing_chapters(comic, record)
+    weight = 1 + freshness(comic, total) + popularity(record, max_votes)
+    value = min(missing, FRESH_CHAPTERS) + BACKFILL_VALUE * max(missing - FRESH_CHAPTERS, 0)
+    return {"missing": missing, "weight": round(weight, 3), "score": weight * value / (1 + missing)}
+
+def order(all_comics, existing_comics, printer=print):
+    """Urutkan komik dari skor tertinggi; skor disimpan di comic['schedule']"""
+    max_votes = max((c.get('votes') or 0 for c in existing_comics.values()), default=0)
+    for comic in all_comics:
+        comic['schedule'] = estimate(comic, existing_comics.get(comic['url']), len(all_comics), max_votes)
+    ranked = sorted(all_comics, key=lambda c: -c['schedule']['score'])
+
+    tiers = {"inkremental": 0, "backfill": 0, "lengkap": 0}
+    for comic in ranked:
+        s = comic['schedule']
+        tier = ("lengkap" if not s['missing'] else
+                "backfill" if comic['url'] not in existing_comics or s['missing'] > FRESH_CHAPTERS else "inkremental")
+        tiers[tier] += 1
+    printer(f"   Jadwal: {', '.join(f'{k}={v}' for k, v in tiers.items())}; "
+            f"teratas: {', '.join(c['title'] for c in ranked[:3])}")
+    return ranked
@@ -1,9 +1,12 @@
-import requests, json, os, time, signal, sys, re
+import json, os, time, signal, sys, re
 from bs4 import BeautifulSoup
 from datetime import datetime
+import metrics, profiling, transport, html_cache, extract_plan, chapterstream, sitemap, shard, schedule, budget, changefeed, comicmeta, searchindex, dedup, naming, revisit
+from cli import build_parser, request_rate
 
 # === KONFIGURASI ===
 BASE_DIR = "comics"
+OUTPUT_DIR = BASE_DIR  # beda dari BASE_DIR saat mode shard
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     "Referer": "https://komikindo.ch/"
@@ -17,21 +20,22 @@ def now():
 
 # === SAVE ON STOP ===
 def save_and_exit(sig=None, frame=None):
-    print(f"\n[{now()}] Dihentikan oleh user (Ctrl+C)")
+    if sig is not None:
+        print(f"\n[{now()}] Dihentikan oleh {'user (Ctrl+C)' if sig == signal.SIGINT else f'signal {sig}'}")
+    flush_in_progress()
     print(f"[{now()}] SELESAI (aman)! Semua data tersimpan per file.")
+    sitemap.finish(print)
+    revisit.finish(print)
+    budget.finish(print)
+    changefeed.finish(print)
+    extract_plan.report(print)
+    chapterstream.report(print)
+    metrics.finish(print)
+    profiling.finish(print)
     sys.exit(0)
 
 signal.signal(signal.SIGINT, save_and_exit)
-
-# === SANITIZE FILENAME ===
-def sanitize_filename(name):
-    # Normalize dan bersihkan nama
-    name = re.sub(r'\s+', ' ', name)  # Normalize spaces
-    name = re.sub(r'[<>:"/\\|?*]', '_', name)
-    name = name.strip('. ')
-    # Ganti spasi dengan dash untuk penamaan file
-    name = name.replace(' ', '-')
-    return name[:100]
+signal.signal(signal.SIGTERM, save_and_exit)
 
 # === CLEAN TITLE ===
 def clean_title(title):
@@ -44,67 +48,112 @@ def clean_title(title):
 
 # === GET & SOUP ===
 def get(url):
+    cached = html_cache.lookup(url)
+    if cached is not None:
+        return cached
+    start = time.perf_counter()
     try:
-        r = requests.get(url, headers=HEADERS, timeout=15)
+        r = transport.fetch(url, headers=HEADERS, timeout=15)
         r.encoding = 'utf-8'
         r.raise_for_status()
-        return r.text
+        metrics.record_response(url, time.perf_counter() - start, r.content)
+        html = r.text
+        html_cache.store(url, html)
+        return html
     except Exception as e:
+        metrics.record_response(url, time.perf_counter() - start, error=True)
         print(f"   Gagal: {e}")
         return None
 
 def soup(url):
     html = get(url)
-    return BeautifulSoup(html, 'html.parser') if html else None
+    if not html:
+        return None
+    with metrics.timer("scraper_parse_seconds", stage="soup"):
+        return BeautifulSoup(html, 'html.parser')
 
 # === SIMPAN KOMIK ===
 def save_comic(comic_data):
-    title = comic_data['title']
-    safe_title = sanitize_filename(title)
-    filename = f"{BASE_DIR}/{safe_title}.json"
-    with open(filename, 'w', encoding='utf-8') as f:
+    filename = naming.comic_path(OUTPUT_DIR, comic_data['url'])
+    start = time.perf_counter()
+    with profiling.stage("save"), open(filename, 'w', encoding='utf-8') as f:
         json.dump(comic_data, f, ensure_ascii=False, indent=2)
+        size = f.tell()
+    metrics.record_save(time.perf_counter() - start, size)
+    changefeed.record_save(comic_data)
+    searchindex.record_save(comic_data, filename, print)
+    naming.record_save(comic_data, filename, print)
     print(f"[{now()}]    Simpan: {filename} ({len(comic_data['chapters'])} chapter)")
 
+# === PROGRESS YANG BELUM TERSIMPAN ===
+IN_PROGRESS = {}  # url -> (record, chapter baru yang belum digabung ke record)
+
+def flush_in_progress():
+    """Simpan komik yang sedang diproses saat run berhenti di tengah jalan"""
+    for record, new_chapters in list(IN_PROGRESS.values()):
+        if new_chapters:
+            record = {**record, "chapters": sorted(record['chapters'] + new_chapters, key=shard.chapter_sort_key)}
+        if record.get('chapters'):
+            save_comic(record)
+    IN_PROGRESS.clear()
+
 # === LOAD KOMIK YANG SUDAH ADA ===
 def load_existing_comic(url):
     """Load existing comic by URL (more reliable than title)"""
     if not os.path.exists(BASE_DIR):
         return None
         
-    for f in os.listdir(BASE_DIR):
-        if f.endswith('.json'):
-            filepath = os.path.join(BASE_DIR, f)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as file:
-                    data = json.load(file)
-                    if data.get('url') == url:
-                        return data
-            except Exception as e:
-                print(f"   Warning: Gagal baca {filepath}: {e}")
+    # Nama file = slug URL; file lama berbasis title dicari lewat url di dalamnya
+    filepath = naming.comic_path(BASE_DIR, url)
+    if os.path.exists(filepath):
+        try:
+            with open(filepath, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('url') == url:
+                changefeed.remember(data)
+                return data
+        except Exception as e:
+            print(f"   Warning: Gagal baca {filepath}: {e}")
+
+    # Cek url dulu dengan pembaca metadata (berhenti setelah field url),
+    # baru file yang cocok di-load penuh
+    for header in comicmeta.iter_headers(BASE_DIR, fields=("url",), chapter_fields=None):
+        if header.get('url') != url:
+            continue
+        filepath = header['path']
+        try:
+            with open(filepath, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            changefeed.remember(data)
+            return data
+        except Exception as e:
+            print(f"   Warning: Gagal baca {filepath}: {e}")
     return None
 
 # === GET ALL EXISTING COMICS ===
 def get_all_existing_comics():
-    """Get all existing comics indexed by URL"""
+    """Get all existing comics indexed by URL (file di OUTPUT_DIR menimpa BASE_DIR)"""
     existing = {}
-    if not os.path.exists(BASE_DIR):
-        return existing
-        
-    for f in os.listdir(BASE_DIR):
-        if f.endswith('.json'):
-            filepath = os.path.join(BASE_DIR, f)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as file:
-                    data = json.load(file)
-                    url = data.get('url')
-                    if url:
-                        existing[url] = data
-            except Exception as e:
-                print(f"   Warning: Gagal baca {filepath}: {e}")
+    for directory in dict.fromkeys((BASE_DIR, OUTPUT_DIR)):
+        if not os.path.exists(directory):
+            continue
+            
+        for f in os.listdir(directory):
+            if f.endswith('.json'):
+                filepath = os.path.join(directory, f)
+                try:
+                    with open(filepath, 'r', encoding='utf-8') as file:
+                        data = json.load(file)
+                        url = data.get('url')
+                        if url:
+                            existing[url] = data
+                            changefeed.remember(data)
+                except Exception as e:
+                    print(f"   Warning: Gagal baca {filepath}: {e}")
     return existing
 
 # === EXTRACT COMIC INFO ===
+@metrics.timed("scraper_parse_seconds", stage="extract_comic_info")
 def extract_comic_info(s_detail, url, list_title):
     """Extract comic information from detail page - GUNAKAN TITLE DARI LIST"""
     info = {
@@ -125,6 +174,11 @@ def extract_comic_info(s_detail, url, list_title):
         "url": url,
         "scraped_at": now()
     }
+
+    # Discovery sitemap tidak punya title: ambil dari judul halaman detail
+    if not info['title']:
+        h1 = s_detail.select_one('h1.entry-title') or s_detail.find('h1')
+        info['title'] = clean_title(h1.get_text(strip=True)) if h1 else sitemap.title_from_url(url)
     
     # COVER: Tetap ambil dari halaman detail
     thumb = s_detail.find('div', class_='thumb')
@@ -166,69 +220,22 @@ def extract_comic_info(s_detail, url, list_title):
                     info['type'] = a.get_text(strip=True)
     
     # GENRE: Tetap ambil dari halaman detail
-    genre_elements = s_detail.select('.genre-info a, .series-genres a, .genres a')
-    if genre_elements:
-        info['genres'] = [a.get_text(strip=True) for a in genre_elements if a.get_text(strip=True)]
+    genres = extract_plan.GENRES.run(s_detail)
+    if genres:
+        info['genres'] = genres
     
-    # RATING: Tetap ambil dari halaman detail
-    rating_selectors = [
-        'i[itemprop="ratingValue"]',
-        '.ratingmanga i',
-        '.rtg i',
-        '.archiveanime-rating i'
-    ]
+    # RATING, VOTES, SINOPSIS: fallback selector lewat extract_plan
+    rating = extract_plan.RATING.run(s_detail)
+    if rating is not None:
+        info['rating'] = rating
     
-    for selector in rating_selectors:
-        rating_elem = s_detail.select_one(selector)
-        if rating_elem:
-            try:
-                rating_text = rating_elem.get_text(strip=True)
-                rating_match = re.search(r'(\d+\.\d+|\d+)', rating_text)
-                if rating_match:
-                    info['rating'] = float(rating_match.group(1))
-                    break
-            except (ValueError, AttributeError):
-                continue
-    
-    # VOTES: Tetap ambil dari halaman detail
-    votes_selectors = [
-        '.votescount',
-        '.rating-count',
-        '.vote-count'
-    ]
+    votes = extract_plan.VOTES.run(s_detail)
+    if votes is not None:
+        info['votes'] = votes
     
-    for selector in votes_selectors:
-        votes_elem = s_detail.select_one(selector)
-        if votes_elem:
-            votes_text = votes_elem.get_text(strip=True)
-            numbers = re.findall(r'\d+', votes_text)
-            if numbers:
-                info['votes'] = int(numbers[0])
-                break
-    
-    # SINOPSIS: Tetap ambil dari halaman detail
-    synopsis_selectors = [
-        '.entry-content.entry-content-single',
-        '.entry-content-single',
-        '.synopsis',
-        '.description'
-    ]
-    
-    for selector in synopsis_selectors:
-        synopsis_elem = s_detail.select_one(selector)
-        if synopsis_elem:
-            synopsis_text = synopsis_elem.get_text(separator='\n', strip=True)
-            # Hapus bagian yang tidak perlu
-            lines = synopsis_text.split('\n')
-            cleaned_lines = []
-            for line in lines:
-                line = line.strip()
-                if line and not re.match(r'^(Manhua|Manga|Manhwa)\s+', line, re.IGNORECASE):
-                    cleaned_lines.append(line)
-            
-            if cleaned_lines:
-                info['synopsis'] = '\n'.join(cleaned_lines)
-                break
+    synopsis = extract_plan.SYNOPSIS.run(s_detail)
+    if synopsis:
+        info['synopsis'] = synopsis
     
     # LAST UPDATED: Tetap ambil dari halaman detail
     last_update = s_detail.find('span', class_='datech')
@@ -238,6 +245,7 @@ def extract_comic_info(s_detail, url, list_title):
     return info
 
 # === EXTRACT CHAPTERS ===
+@metrics.timed("scraper_parse_seconds", stage="extract_chapters")
 def extract_chapters(s_detail):
     """Extract chapters from detail page"""
     chapters = []
@@ -266,37 +274,27 @@ def extract_chapters(s_detail):
     return chapters
 
 # === EXTRACT CHAPTER IMAGES ===
+@metrics.timed("scraper_parse_seconds", stage="extract_chapter_images")
 def extract_chapter_images(soup_obj):
     """Extract images from chapter page"""
-    images = []
-    
-    # Multiple container selectors
-    containers = [
-        soup_obj.find('div', id='Baca_Komik'),
-        soup_obj.find('div', class_='chapter-image'),
-        soup_obj.select_one('.reader-area'),
-        soup_obj.select_one('.chapter-body')
-    ]
-    
-    for container in containers:
-        if container:
-            for img in container.find_all('img'):
-                src = (img.get('src') or 
-                       img.get('data-src') or 
-                       img.get('data-lazy-src') or
-                       img.get('data-original'))
-                
-                if src and src.startswith(('http://', 'https://')):
-                    # Clean URL
-                    src = src.split('?')[0].strip()
-                    if src not in images:
-                        images.append(src)
-            
-            if images:
-                break
+    # Container pertama yang berisi gambar (#Baca_Komik, .chapter-image, ...)
+    images = extract_plan.CHAPTER_IMAGES.run(soup_obj) or []
     
     return images
 
+def chapter_images(url):
+    """Images satu chapter, atau None kalau halaman gagal diambil"""
+    if not chapterstream.ENABLED:
+        s_ch = soup(url)
+        return extract_chapter_images(s_ch) if s_ch else None
+    images, html = chapterstream.fetch_images(url, headers=HEADERS)
+    if images is not None or html is None:
+        return images
+    # Container tidak ketemu saat streaming: parse penuh seperti biasa
+    with metrics.timer("scraper_parse_seconds", stage="soup"):
+        s_ch = BeautifulSoup(html, 'html.parser')
+    return extract_chapter_images(s_ch)
+
 # === TAMPILKAN INFO KOMIK ===
 def display_comic_info(comic_data):
     """Display comic information in a formatted way"""
@@ -317,6 +315,7 @@ def display_comic_info(comic_data):
     print(f"   Total Chapter: {len(comic_data.get('chapters', []))}")
 
 # === EXTRACT TITLE FROM LIST PAGE ===
+@metrics.timed("scraper_parse_seconds", stage="extract_title_from_list")
 def extract_title_from_list(a_element):
     """
     Extract title dari halaman list/update - DIPERBAIKI
@@ -379,36 +378,24 @@ def is_comic_url(url):
     
     return False
 
-# === MAIN SCRIPT ===
-if __name__ == "__main__":
-    print(f"[{now()}] Memulai scraping komik dari KomikIndo...")
-    print(f"[{now()}] Fitur: Title dari halaman list, Sinopsis, Genre, Rating")
-    
-    # Load existing comics
-    existing_comics = get_all_existing_comics()
-    print(f"[{now()}] Loaded {len(existing_comics)} existing comics")
-    
-    # === SCRAPING SEMUA HALAMAN ===
+# === SCRAPE ALL PAGES ===
+def scrape_all_pages(max_pages=50):
     print(f"[{now()}] Mengambil daftar komik dari semua halaman...")
     all_comics = []
     page = 1
-    MAX_PAGES = 50  # Safety limit
 
-    while page <= MAX_PAGES:
+    while page <= max_pages:
         url = f"https://komikindo.ch/komik-terbaru/page/{page}/" if page > 1 else "https://komikindo.ch/komik-terbaru/"
         print(f"[{now()}] Halaman {page}: {url}")
         
         s = soup(url)
         if not s:
             print(f"[{now()}] Gagal akses halaman {page}. Coba lagi...")
-            time.sleep(DELAY_PAGE * 2)
+            metrics.sleep(DELAY_PAGE * 2)
             continue
 
         # Multiple selector fallbacks untuk list komik
-        posts = (s.select('.listupd .animepost .animposx a[itemprop="url"]') or 
-                 s.select('.animepost a[itemprop="url"]') or
-                 s.select('.animepost .thumb a') or
-                 s.select('.film-list a[itemprop="url"]'))
+        posts = extract_plan.LIST_POSTS.run(s)
 
         if not posts:
             print(f"[{now()}] Tidak ada komik di halaman {page}. Selesai.")
@@ -431,7 +418,9 @@ if __name__ == "__main__":
                 all_comics.append({
                     "title": title, 
                     "url": comic_url,
-                    "scraped_at": now()
+                    "scraped_at": now(),
+                    "position": len(all_comics),
+                    **schedule.list_meta(a)
                 })
                 print(f"[{now()}]      Found: {title}")
 
@@ -442,138 +431,236 @@ if __name__ == "__main__":
             break
             
         page += 1
-        time.sleep(DELAY_PAGE)
+        metrics.sleep(DELAY_PAGE)
 
     print(f"[{now()}] Ditemukan {len(all_comics)} komik dari {page} halaman.")
-
-    # === LOOP SETIAP KOMIK ===
-    for idx, comic in enumerate(all_comics, 1):
-        title, url = comic['title'], comic['url']
-        print(f"\n[{now()}] [{idx}/{len(all_comics)}] → {title}")
+    return all_comics
+
+def discover(args, existing_comics):
+    """Daftar komik dari sitemap (--discovery sitemap) atau paginasi halaman list"""
+    if args.discovery == 'sitemap':
+        found = sitemap.discover(existing_comics, args.shard, headers=HEADERS, printer=print)
+        if found is not None:
+            return found
+        print(f"[{now()}] Sitemap tidak ditemukan, pakai paginasi halaman list")
+    return scrape_all_pages()
+
+# === PROCESS SINGLE COMIC ===
+def process_comic(comic, existing_comics, detail=None, max_chapters=None):
+    """detail = (info, chapters) halaman detail yang sudah diambil (komik baru yang di-remap dedup).
+    max_chapters = batas fetch chapter (sisa budget request, watch.py); return jumlah
+    chapter yang ditunda karena batas itu."""
+    title, url = comic['title'], comic['url']
+    
+    # Skip jika URL tidak valid
+    if not url or not url.startswith('http'):
+        print(f"[{now()}]    URL tidak valid: {url}")
+        return
+    
+    # Cek existing berdasarkan URL (lebih reliable)
+    existing_data = existing_comics.get(url)
+    
+    if existing_data:
+        print(f"[{now()}]    Sudah ada {len(existing_data.get('chapters', []))} chapter. Cek update...")
         
-        # Skip jika URL tidak valid
-        if not url or not url.startswith('http'):
-            print(f"[{now()}]    URL tidak valid: {url}")
-            continue
+        # Update title dengan title dari list (jika berbeda)
+        if existing_data.get('title') != title:
+            print(f"[{now()}]    Update title: '{existing_data['title']}' → '{title}'")
+            existing_data['title'] = title
         
-        # Cek existing berdasarkan URL (lebih reliable)
-        existing_data = existing_comics.get(url)
+        # Tampilkan info komik yang sudah ada
+        display_comic_info(existing_data)
         
-        if existing_data:
-            print(f"[{now()}]    Sudah ada {len(existing_data.get('chapters', []))} chapter. Cek update...")
+        new_chapters = []
+
+        # Ambil halaman detail untuk update (kecuali sudah diambil sebelum remap dedup)
+        remapped = detail is not None
+        with profiling.stage("detail"):
+            if detail is None:
+                s_detail = soup(url)
+                if not s_detail:
+                    print(f"[{now()}]    Gagal akses detail. Skip update.")
+                    sitemap.retry(url)
+                    return
+                last_update = s_detail.find('span', class_='datech')
+                detail = ({"last_updated": last_update.get_text(strip=True)} if last_update else {},
+                          extract_chapters(s_detail))
+            revisit.checked(url)
+            info, chapters_data = detail
+
+            # Update last_updated dari chapter terbaru
+            if info.get('last_updated'):
+                existing_data['last_updated'] = info['last_updated']
+
+        # Cari chapter baru
+        # Nomor bisa dobel (mis. '276.HQ' dua kali): cocokkan nomor + url
+        missing = shard.missing_from(existing_data.get('chapters', []), chapters_data)
+        IN_PROGRESS[url] = (existing_data, new_chapters)
+        deferred = 0
+        for i, chapter in enumerate(missing):
+            if max_chapters is not None and i >= max_chapters:
+                deferred = len(missing) - i
+                print(f"[{now()}]    Budget request habis: {deferred} chapter ditunda")
+                break
+            if not budget.allows(budget.cost(1, DELAY_CHAPTER, detail=False)):
+                print(f"[{now()}]    Deadline dekat: {len(missing) - i} chapter ditunda")
+                budget.defer(title, url, "sebagian", len(missing) - i)
+                break
+            print(f"[{now()}]    → Chapter BARU: {chapter['number']}")
             
-            # Update title dengan title dari list (jika berbeda)
-            if existing_data.get('title') != title:
-                print(f"[{now()}]    Update title: '{existing_data['title']}' → '{title}'")
-                existing_data['title'] = title
+            with profiling.stage("chapters"):
+                images = chapter_images(chapter['url'])
+                if images is None:
+                    print(f"[{now()}]       Gagal akses chapter")
+                    continue
+            print(f"[{now()}]       Found {len(images)} images")
             
-            # Tampilkan info komik yang sudah ada
-            display_comic_info(existing_data)
+            new_chapters.append({
+                "number": chapter['number'],
+                "url": chapter['url'],
+                "date": chapter['date'],
+                "dated_at": now(),
+                "images": images
+            })
             
-            existing_chapters = {ch['number'] for ch in existing_data.get('chapters', [])}
-            new_chapters = []
-
-            # Ambil halaman detail untuk update
-            s_detail = soup(url)
-            if not s_detail:
-                print(f"[{now()}]    Gagal akses detail. Skip update.")
-                continue
-
-            # Update last_updated dari chapter terbaru
-            last_update = s_detail.find('span', class_='datech')
-            if last_update:
-                existing_data['last_updated'] = last_update.get_text(strip=True)
-
-            # Cari chapter baru
-            chapters_data = extract_chapters(s_detail)
-            for chapter in chapters_data:
-                if chapter['number'] not in existing_chapters:
-                    print(f"[{now()}]    → Chapter BARU: {chapter['number']}")
-                    
-                    s_ch = soup(chapter['url'])
-                    if not s_ch:
-                        print(f"[{now()}]       Gagal akses chapter")
-                        continue
-                        
-                    images = extract_chapter_images(s_ch)
-                    print(f"[{now()}]       Found {len(images)} images")
-                    
-                    new_chapters.append({
-                        "number": chapter['number'],
-                        "url": chapter['url'],
-                        "date": chapter['date'],
-                        "images": images
-                    })
-                    
-                    time.sleep(DELAY_CHAPTER)
-
-            # Tambahkan chapter baru
-            if new_chapters:
-                existing_data['chapters'].extend(new_chapters)
-                # Urutkan chapter secara numeric
-                existing_data['chapters'].sort(key=lambda x: 
-                    float(re.search(r'[\d.]+', x['number']).group()) if re.search(r'[\d.]+', x['number']) else 0)
-                save_comic(existing_data)
-                print(f"[{now()}]    Update selesai: +{len(new_chapters)} chapter baru.")
-            else:
-                print(f"[{now()}]    Tidak ada chapter baru.")
-            continue
-
-        # === KOMIK BARU: SCRAPING LENGKAP ===
-        print(f"[{now()}]    Komik baru, mulai scraping...")
-        
+            metrics.sleep(DELAY_CHAPTER)
+
+        # Tambahkan chapter baru
+        IN_PROGRESS.pop(url, None)
+        if new_chapters:
+            existing_data['chapters'].extend(new_chapters)
+            # Urutkan chapter secara numeric
+            existing_data['chapters'].sort(key=lambda x: 
+                float(re.search(r'[\d.]+', x['number']).group()) if re.search(r'[\d.]+', x['number']) else 0)
+            save_comic(existing_data)
+            print(f"[{now()}]    Update selesai: +{len(new_chapters)} chapter baru.")
+        else:
+            print(f"[{now()}]    Tidak ada chapter baru.")
+            if remapped:
+                save_comic(existing_data)  # URL baru hasil remap tetap harus sampai ke disk
+        return deferred
+
+    # === KOMIK BARU: SCRAPING LENGKAP ===
+    print(f"[{now()}]    Komik baru, mulai scraping...")
+    
+    with profiling.stage("detail"):
         s_detail = soup(url)
         if not s_detail:
             print(f"[{now()}]    Gagal akses detail. Skip.")
-            continue
+            sitemap.retry(url)
+            return
 
         # Extract comic info - GUNAKAN TITLE DARI LIST
-        comic_data = extract_comic_info(s_detail, url, title)
+        comic_data = extract_comic_info(s_detail, url, None if comic.get('guessed_title') else title)
         comic_data['chapters'] = []
 
-        # Tampilkan info komik yang baru di-scrape
-        display_comic_info(comic_data)
-
         # Extract semua chapter
         chapters_data = extract_chapters(s_detail)
-        print(f"[{now()}]    Ditemukan {len(chapters_data)} chapter")
 
-        # Scraping images untuk setiap chapter (dari chapter 1 ke terbaru)
-        chapter_count = 0
-        total_chapters = len(chapters_data)
-        
-        for chapter in reversed(chapters_data):  # dari chapter 1 ke terbaru
-            ch_num, ch_url = chapter['number'], chapter['url']
-            print(f"[{now()}]    → Chapter {ch_num} ({chapter_count + 1}/{total_chapters})")
+    # Slug berubah / di-list ulang: pakai record lama, hanya chapter yang belum ada yang diambil
+    if dedup.check(comic_data, chapters_data, existing_comics, print):
+        return process_comic(comic, existing_comics, (comic_data, chapters_data), max_chapters)
+
+    # Tampilkan info komik yang baru di-scrape
+    display_comic_info(comic_data)
+    print(f"[{now()}]    Ditemukan {len(chapters_data)} chapter")
+
+    # Scraping images untuk setiap chapter (dari chapter 1 ke terbaru)
+    chapter_count = 0
+    total_chapters = len(chapters_data)
+    IN_PROGRESS[url] = (comic_data, [])
+    
+    deferred = 0
+    for i, chapter in enumerate(reversed(chapters_data)):  # dari chapter 1 ke terbaru
+        if max_chapters is not None and i >= max_chapters:
+            deferred = total_chapters - i
+            print(f"[{now()}]    Budget request habis: {deferred} chapter ditunda")
+            break
+        if not budget.allows(budget.cost(1, DELAY_CHAPTER, detail=False)):
+            print(f"[{now()}]    Deadline dekat: {total_chapters - i} chapter ditunda")
+            budget.defer(title, url, "sebagian", total_chapters - i)
+            break
+        ch_num, ch_url = chapter['number'], chapter['url']
+        print(f"[{now()}]    → Chapter {ch_num} ({chapter_count + 1}/{total_chapters})")
 
-            s_ch = soup(ch_url)
-            if not s_ch: 
+        with profiling.stage("chapters"):
+            images = chapter_images(ch_url)
+            if images is None:
                 print(f"[{now()}]       Gagal akses chapter")
                 continue
-            
-            images = extract_chapter_images(s_ch)
-            print(f"[{now()}]       Found {len(images)} images")
-            
-            comic_data['chapters'].append({
-                "number": ch_num,
-                "url": ch_url,
-                "date": chapter['date'],
-                "images": images
-            })
-            
-            chapter_count += 1
-            
-            # Untuk komik baru, simpan setiap 10 chapter atau di akhir
-            if chapter_count % 10 == 0 or chapter_count == total_chapters:
-                save_comic(comic_data)
-                print(f"[{now()}]    Progress: {chapter_count}/{total_chapters} chapter")
-            
-            time.sleep(DELAY_CHAPTER)
+        print(f"[{now()}]       Found {len(images)} images")
+        
+        comic_data['chapters'].append({
+            "number": ch_num,
+            "url": ch_url,
+            "date": chapter['date'],
+            "dated_at": now(),
+            "images": images
+        })
+        
+        chapter_count += 1
+        
+        # Untuk komik baru, simpan setiap 10 chapter atau di akhir
+        if chapter_count % 10 == 0 or chapter_count == total_chapters:
+            save_comic(comic_data)
+            print(f"[{now()}]    Progress: {chapter_count}/{total_chapters} chapter")
+        
+        metrics.sleep(DELAY_CHAPTER)
+
+    # Final save
+    IN_PROGRESS.pop(url, None)
+    save_comic(comic_data)
+    existing_comics[url] = comic_data
+    dedup.add(comic_data)
+    print(f"[{now()}]    Selesai: {chapter_count} chapter tersimpan")
+    return deferred
+
+# === MAIN SCRIPT ===
+if __name__ == "__main__":
+    args = build_parser("Scraper KomikIndo").parse_args()
+    metrics.configure(args.metrics_out, args.metrics_interval)
+    profiling.configure(args.profile, args.profile_dir, args.profile_interval)
+    transport.configure(args.http_mode, args.record_dir, args.replay_latency, args.replay_jitter, request_rate(args),
+                        args.backend)
+    html_cache.configure(args.html_cache, args.cache_policy, args.cache_max_mb, args.cache_max_age)
+    chapterstream.configure(args.stream_chapters)
+    budget.configure(args.deadline, args.time_budget, args.deferred_out)
+    changefeed.configure(args.feed_dir)
+    searchindex.configure(args.search_index)
+    dedup.configure(args.dedup)
+    revisit.configure(args.revisit, args.refresh, args.shard)
+    if args.shard:
+        OUTPUT_DIR = shard.shard_dir(args.shard)
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        print(f"[{now()}] Mode shard {args.shard[0]}/{args.shard[1]} → output ke {OUTPUT_DIR}")
 
-        # Final save
-        save_comic(comic_data)
-        existing_comics[url] = comic_data
-        print(f"[{now()}]    Selesai: {chapter_count} chapter tersimpan")
+    print(f"[{now()}] Memulai scraping komik dari KomikIndo...")
+    print(f"[{now()}] Fitur: Title dari halaman list, Sinopsis, Genre, Rating")
+    
+    # Load existing comics
+    existing_comics = get_all_existing_comics()
+    print(f"[{now()}] Loaded {len(existing_comics)} existing comics")
+    
+    # === SCRAPING SEMUA HALAMAN ===
+    with profiling.stage("discovery"):
+        all_comics = discover(args, existing_comics)
+    if args.shard:
+        all_comics = [c for c in all_comics if shard.owns(c['url'], args.shard)]
+        print(f"[{now()}] Shard ini memegang {len(all_comics)} komik")
+    all_comics = revisit.select(all_comics, existing_comics, print)
+    if args.order == 'priority':
+        all_comics = schedule.order(all_comics, existing_comics, print)
+
+    # === LOOP SETIAP KOMIK ===
+    for idx, comic in enumerate(all_comics, 1):
+        # Jangan mulai komik yang perkiraannya tidak selesai sebelum deadline
+        missing = schedule.missing_chapters(comic, existing_comics.get(comic['url']))
+        if not budget.allows(budget.cost(missing, DELAY_CHAPTER)):
+            budget.defer(comic['title'], comic['url'], "tidak dimulai", missing)
+            continue
+        print(f"\n[{now()}] [{idx}/{len(all_comics)}] → {comic['title']}")
+        process_comic(comic, existing_comics)
+        sitemap.done(comic['url'])
 
     # === SELESAI ===
     print(f"\n[{now()}] SEMUA KOMIK SELESAI DIPROSES!")
@@ -1,6 +1,8 @@
-import requests, json, os, time, signal, sys, re
+import json, os, time, signal, sys, re
 from bs4 import BeautifulSoup
 from datetime import datetime
+import metrics, profiling, transport, html_cache, naming
+from cli import build_parser, request_rate
 
 # === KONFIGURASI ===
 BASE_DIR = "comics"
@@ -12,6 +14,16 @@ DELAY_PAGE = 1.0
 DELAY_CHAPTER = 0.3
 os.makedirs(BASE_DIR, exist_ok=True)
 
+parser = build_parser("Scraper manga KomikIndo (per judul)")
+args = parser.parse_args()
+if args.shard:
+    parser.error("--shard hanya untuk scrape.py / scrapemulti.py")
+metrics.configure(args.metrics_out, args.metrics_interval)
+profiling.configure(args.profile, args.profile_dir, args.profile_interval)
+transport.configure(args.http_mode, args.record_dir, args.replay_latency, args.replay_jitter, request_rate(args),
+                        args.backend)
+html_cache.configure(args.html_cache, args.cache_policy, args.cache_max_mb, args.cache_max_age)
+
 def now():
     return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
@@ -19,11 +31,13 @@ def now():
 def save_and_exit(sig=None, frame=None):
     print(f"\n[{now()}] Dihentikan oleh user (Ctrl+C)")
     print(f"[{now()}] SELESAI (aman)! Semua data tersimpan per file.")
+    metrics.finish()
+    profiling.finish()
     sys.exit(0)
 
 signal.signal(signal.SIGINT, save_and_exit)
 
-# === SANITIZE FILENAME ===
+# === SANITIZE FILENAME (nama file lama, sebelum naming.py) ===
 def sanitize_filename(name):
     name = name.replace(" ", "-")
     name = re.sub(r'[<>:"/\\|?*]', '_', name)
@@ -31,39 +45,62 @@ def sanitize_filename(name):
 
 # === GET & SOUP ===
 def get(url):
+    cached = html_cache.lookup(url)
+    if cached is not None:
+        return cached
+    start = time.perf_counter()
     try:
-        r = requests.get(url, headers=HEADERS, timeout=15)
+        r = transport.fetch(url, headers=HEADERS, timeout=15)
         r.raise_for_status()
-        return r.text
+        metrics.record_response(url, time.perf_counter() - start, r.content)
+        html = r.text
+        html_cache.store(url, html)
+        return html
     except Exception as e:
+        metrics.record_response(url, time.perf_counter() - start, error=True)
         print(f"   Gagal: {e}")
         return None
 
 def soup(url):
     html = get(url)
-    return BeautifulSoup(html, 'html.parser') if html else None
+    if not html:
+        return None
+    with metrics.timer("scraper_parse_seconds", stage="soup"):
+        return BeautifulSoup(html, 'html.parser')
 
 # === SIMPAN KOMIK ===
-def save_comic(comic_data):
-    title = comic_data['title']
-    safe_title = sanitize_filename(title)
-    filename = f"{BASE_DIR}/{safe_title}.json"
-    with open(filename, 'w', encoding='utf-8') as f:
+def save_comic(comic_data, legacy_path=None):
+    """Simpan ke comics/<slug URL>.json (sama dengan scrape.py). legacy_path = file
+    lama berbasis title tanpa url, dihapus setelah isinya pindah."""
+    filename = naming.comic_path(BASE_DIR, comic_data['url'])
+    start = time.perf_counter()
+    with profiling.stage("save"), open(filename, 'w', encoding='utf-8') as f:
         json.dump(comic_data, f, ensure_ascii=False, indent=2)
+        size = f.tell()
+    metrics.record_save(time.perf_counter() - start, size)
+    naming.record_save(comic_data, filename, print)
+    if legacy_path and os.path.exists(legacy_path) and not os.path.samefile(legacy_path, filename):
+        os.remove(legacy_path)
+        print(f"   File lama dihapus: {os.path.basename(legacy_path)} → {os.path.basename(filename)}")
     print(f"[{now()}]    Simpan: {filename} ({len(comic_data['chapters'])} chapter)")
 
 # === LOAD KOMIK YANG SUDAH ADA ===
-def load_existing_comic(title):
-    safe_title = sanitize_filename(title)
-    filepath = f"{BASE_DIR}/{safe_title}.json"
-    if not os.path.exists(filepath):
-        return None
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"   Gagal baca file lama: {e}")
-        return None
+def load_existing_comic(title, url):
+    """(record, path) dari file slug URL, atau dari file lama berbasis title
+    (versi lama script ini tidak menyimpan url); (None, None) kalau belum ada"""
+    for filepath in (naming.comic_path(BASE_DIR, url), os.path.join(BASE_DIR, f"{sanitize_filename(title)}.json")):
+        if not os.path.exists(filepath):
+            continue
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"   Gagal baca file lama: {e}")
+            continue
+        if data.get('url') in (None, url):
+            data['url'] = url
+            return data, filepath
+    return None, None
 
 # === DAFTAR KOMIK YANG SUDAH ADA (untuk skip) ===
 existing_titles = {
@@ -80,7 +117,8 @@ while True:
     url = f"https://komikindo.ch/komik-terbaru/page/{page}/" if page > 1 else "https://komikindo.ch/komik-terbaru/"
     print(f"[{now()}] Halaman {page}: {url}")
     
-    s = soup(url)
+    with profiling.stage("discovery"):
+        s = soup(url)
     if not s:
         print(f"[{now()}] Gagal akses halaman {page}. Stop.")
         break
@@ -102,7 +140,7 @@ while True:
         break
 
     page += 1
-    time.sleep(DELAY_PAGE)
+    metrics.sleep(DELAY_PAGE)
 
 print(f"[{now()}] Ditemukan {len(all_comics)} komik dari {page} halaman.")
 
@@ -112,7 +150,7 @@ for idx, comic in enumerate(all_comics, 1):
     print(f"\n[{now()}] [{idx}/{len(all_comics)}] → {title}")
 
     # === CEK APAKAH SUDAH ADA ===
-    existing_data = load_existing_comic(title)
+    existing_data, existing_path = load_existing_comic(title, url)
     
     if existing_data and existing_data.get('chapters'):
         print(f"[{now()}]    Sudah ada {len(existing_data['chapters'])} chapter. Cek update...")
@@ -121,7 +159,8 @@ for idx, comic in enumerate(all_comics, 1):
         new_chapters = []
 
         # === AMBIL HALAMAN DETAIL ===
-        s_detail = soup(url)
+        with profiling.stage("detail"):
+            s_detail = soup(url)
         if not s_detail:
             print(f"[{now()}]    Gagal akses detail. Skip update.")
             continue
@@ -148,7 +187,8 @@ for idx, comic in enumerate(all_comics, 1):
                     continue  # sudah ada
 
                 print(f"[{now()}]    → Chapter BARU: {ch_num}")
-                s_ch = soup(ch_url)
+                with profiling.stage("chapters"):
+                    s_ch = soup(ch_url)
                 if not s_ch: 
                     print(f"[{now()}]       Gagal akses chapter")
                     continue
@@ -168,17 +208,19 @@ for idx, comic in enumerate(all_comics, 1):
                     "number": ch_num,
                     "images": images
                 })
-                time.sleep(DELAY_CHAPTER)
+                metrics.sleep(DELAY_CHAPTER)
 
         # === TAMBAHKAN CHAPTER BARU ===
         if new_chapters:
             existing_data['chapters'].extend(new_chapters)
             # Urutkan chapter dari 01 ke terbaru
             existing_data['chapters'].sort(key=lambda x: int(re.sub(r'\D', '', x['number']) or 0))
-            save_comic(existing_data)
+            save_comic(existing_data, existing_path)
             print(f"[{now()}]    Update selesai: +{len(new_chapters)} chapter baru.")
         else:
             print(f"[{now()}]    Tidak ada chapter baru.")
+            if existing_path != naming.comic_path(BASE_DIR, url):
+                save_comic(existing_data, existing_path)  # pindahkan file lama berbasis title
         continue
 
     # === KOMIK BARU: SCRAPING LENGKAP ===
@@ -188,10 +230,12 @@ for idx, comic in enumerate(all_comics, 1):
         "cover_image": None,
         "alternative_titles": [], "status": "", "author": [], "illustrator": [],
         "type": "", "demographic": "", "themes": [], "genres": [],
-        "rating": 0.0, "votes": 0, "synopsis": "", "last_updated": "", "chapters": []
+        "rating": 0.0, "votes": 0, "synopsis": "", "last_updated": "", "url": url, "scraped_at": now(),
+        "chapters": []
     }
 
-    s_detail = soup(url)
+    with profiling.stage("detail"):
+        s_detail = soup(url)
     if not s_detail:
         print(f"[{now()}]    Gagal akses detail. Skip.")
         continue
@@ -259,7 +303,8 @@ for idx, comic in enumerate(all_comics, 1):
 
             print(f"[{now()}]    → Chapter {ch_num}")
 
-            s_ch = soup(ch_url)
+            with profiling.stage("chapters"):
+                s_ch = soup(ch_url)
             if not s_ch: continue
             container = s_ch.find('div', id='Baca_Komik') or s_ch.find('div', class_='chapter-image')
             if not container: continue
@@ -275,10 +320,10 @@ for idx, comic in enumerate(all_comics, 1):
                 "images": images
             })
 
-            save_comic(comic_data)
-            time.sleep(DELAY_CHAPTER)
+            save_comic(comic_data, existing_path)
+            metrics.sleep(DELAY_CHAPTER)
 
-    save_comic(comic_data)
+    save_comic(comic_data, existing_path)
     existing_titles.add(title)
 
 # === SELESAI ===
@@ -2,10 +2,13 @@ import requests, json, os, time, signal, sys, re
 import concurrent.futures
 from bs4 import BeautifulSoup
 from datetime import datetime
+import metrics, profiling, transport, html_cache, extract_plan, chapterstream, sitemap, shard, schedule, budget, changefeed, model, searchindex, dedup, naming, revisit
+from cli import build_parser, request_rate
 import threading
 
 # === KONFIGURASI ===
 BASE_DIR = "comics"
+OUTPUT_DIR = BASE_DIR  # beda dari BASE_DIR saat mode shard
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     "Referer": "https://komikindo.ch/"
@@ -26,19 +29,23 @@ def now():
 
 # === SAVE ON STOP ===
 def save_and_exit(sig=None, frame=None):
-    safe_print(f"\n[{now()}] Dihentikan oleh user (Ctrl+C)")
+    STOPPING.set()
+    if sig is not None:
+        safe_print(f"\n[{now()}] Dihentikan oleh {'user (Ctrl+C)' if sig == signal.SIGINT else f'signal {sig}'}")
+    flush_in_progress()
     safe_print(f"[{now()}] SELESAI (aman)! Semua data tersimpan per file.")
+    sitemap.finish(safe_print)
+    revisit.finish(safe_print)
+    budget.finish(safe_print)
+    changefeed.finish(safe_print)
+    extract_plan.report(safe_print)
+    chapterstream.report(safe_print)
+    metrics.finish(safe_print)
+    profiling.finish(safe_print)
     sys.exit(0)
 
 signal.signal(signal.SIGINT, save_and_exit)
-
-# === SANITIZE FILENAME ===
-def sanitize_filename(name):
-    name = re.sub(r'\s+', ' ', name)
-    name = re.sub(r'[<>:"/\\|?*]', '_', name)
-    name = name.strip('. ')
-    name = name.replace(' ', '-')
-    return name[:100]
+signal.signal(signal.SIGTERM, save_and_exit)
 
 def clean_title(title):
     title = re.sub(r'^Komik\s+', '', title, flags=re.IGNORECASE)
@@ -53,48 +60,71 @@ def create_session():
 
 # === GET & SOUP dengan Session ===
 def get(session, url):
+    cached = html_cache.lookup(url)
+    if cached is not None:
+        return cached
+    start = time.perf_counter()
     try:
-        r = session.get(url, timeout=15)
+        r = transport.fetch(url, session=session, timeout=15)
         r.encoding = 'utf-8'
         r.raise_for_status()
-        return r.text
+        metrics.record_response(url, time.perf_counter() - start, r.content)
+        html = r.text
+        html_cache.store(url, html)
+        return html
     except Exception as e:
+        metrics.record_response(url, time.perf_counter() - start, error=True)
         safe_print(f"   Gagal: {e}")
         return None
 
 def soup(session, url):
     html = get(session, url)
-    return BeautifulSoup(html, 'html.parser') if html else None
+    if not html:
+        return None
+    with metrics.timer("scraper_parse_seconds", stage="soup"):
+        return BeautifulSoup(html, 'html.parser')
 
 # === SIMPAN KOMIK ===
 def save_comic(comic_data):
-    title = comic_data['title']
-    safe_title = sanitize_filename(title)
-    filename = f"{BASE_DIR}/{safe_title}.json"
-    with open(filename, 'w', encoding='utf-8') as f:
+    filename = naming.comic_path(OUTPUT_DIR, comic_data['url'])
+    start = time.perf_counter()
+    with profiling.stage("save"), open(filename, 'w', encoding='utf-8') as f:
         json.dump(comic_data, f, ensure_ascii=False, indent=2)
+        size = f.tell()
+    metrics.record_save(time.perf_counter() - start, size)
+    changefeed.record_save(comic_data)
+    searchindex.record_save(comic_data, filename, safe_print)
+    naming.record_save(comic_data, filename, safe_print)
     safe_print(f"[{now()}]    Simpan: {filename} ({len(comic_data['chapters'])} chapter)")
 
 # === LOAD EXISTING COMICS ===
+# === PROGRESS YANG BELUM TERSIMPAN ===
+IN_PROGRESS = {}  # url -> (record, chapter baru yang belum digabung ke record)
+STOPPING = threading.Event()  # thread lain berhenti mulai komik/chapter baru
+
+def flush_in_progress():
+    """Simpan komik yang sedang diproses thread lain saat run berhenti di tengah jalan"""
+    for record, new_chapters in list(IN_PROGRESS.values()):
+        try:
+            if isinstance(record, model.Comic):
+                record = record.to_dict()
+            chapters = list(record['chapters']) + list(new_chapters)
+            if chapters:
+                save_comic({**record, "chapters": sorted(chapters, key=shard.chapter_sort_key)})
+        except Exception as e:
+            safe_print(f"   Warning: Gagal simpan progress {record.get('title')}: {e}")
+    IN_PROGRESS.clear()
+
 def get_all_existing_comics():
+    """Komik yang sudah ada sebagai model.Comic (tanpa images) di-index by URL;
+    file di OUTPUT_DIR menimpa BASE_DIR"""
     existing = {}
-    if not os.path.exists(BASE_DIR):
-        return existing
-        
-    for f in os.listdir(BASE_DIR):
-        if f.endswith('.json'):
-            filepath = os.path.join(BASE_DIR, f)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as file:
-                    data = json.load(file)
-                    url = data.get('url')
-                    if url:
-                        existing[url] = data
-            except Exception as e:
-                safe_print(f"   Warning: Gagal baca {filepath}: {e}")
+    for directory in dict.fromkeys((BASE_DIR, OUTPUT_DIR)):
+        existing.update(model.load_dir(directory, safe_print))
     return existing
 
 # === EXTRACT COMIC INFO ===
+@metrics.timed("scraper_parse_seconds", stage="extract_comic_info")
 def extract_comic_info(session, s_detail, url, list_title):
     info = {
         "title": list_title,
@@ -114,6 +144,11 @@ def extract_comic_info(session, s_detail, url, list_title):
         "url": url,
         "scraped_at": now()
     }
+
+    # Discovery sitemap tidak punya title: ambil dari judul halaman detail
+    if not info['title']:
+        h1 = s_detail.select_one('h1.entry-title') or s_detail.find('h1')
+        info['title'] = clean_title(h1.get_text(strip=True)) if h1 else sitemap.title_from_url(url)
     
     # Cover image
     thumb = s_detail.find('div', class_='thumb')
@@ -155,68 +190,22 @@ def extract_comic_info(session, s_detail, url, list_title):
                     info['type'] = a.get_text(strip=True)
     
     # Genre
-    genre_elements = s_detail.select('.genre-info a, .series-genres a, .genres a')
-    if genre_elements:
-        info['genres'] = [a.get_text(strip=True) for a in genre_elements if a.get_text(strip=True)]
-    
-    # Rating
-    rating_selectors = [
-        'i[itemprop="ratingValue"]',
-        '.ratingmanga i',
-        '.rtg i',
-        '.archiveanime-rating i'
-    ]
-    
-    for selector in rating_selectors:
-        rating_elem = s_detail.select_one(selector)
-        if rating_elem:
-            try:
-                rating_text = rating_elem.get_text(strip=True)
-                rating_match = re.search(r'(\d+\.\d+|\d+)', rating_text)
-                if rating_match:
-                    info['rating'] = float(rating_match.group(1))
-                    break
-            except (ValueError, AttributeError):
-                continue
+    genres = extract_plan.GENRES.run(s_detail)
+    if genres:
+        info['genres'] = genres
     
-    # Votes
-    votes_selectors = [
-        '.votescount',
-        '.rating-count',
-        '.vote-count'
-    ]
+    # Rating, votes, sinopsis (fallback selector lewat extract_plan)
+    rating = extract_plan.RATING.run(s_detail)
+    if rating is not None:
+        info['rating'] = rating
     
-    for selector in votes_selectors:
-        votes_elem = s_detail.select_one(selector)
-        if votes_elem:
-            votes_text = votes_elem.get_text(strip=True)
-            numbers = re.findall(r'\d+', votes_text)
-            if numbers:
-                info['votes'] = int(numbers[0])
-                break
-    
-    # Sinopsis
-    synopsis_selectors = [
-        '.entry-content.entry-content-single',
-        '.entry-content-single',
-        '.synopsis',
-        '.description'
-    ]
+    votes = extract_plan.VOTES.run(s_detail)
+    if votes is not None:
+        info['votes'] = votes
     
-    for selector in synopsis_selectors:
-        synopsis_elem = s_detail.select_one(selector)
-        if synopsis_elem:
-            synopsis_text = synopsis_elem.get_text(separator='\n', strip=True)
-            lines = synopsis_text.split('\n')
-            cleaned_lines = []
-            for line in lines:
-                line = line.strip()
-                if line and not re.match(r'^(Manhua|Manga|Manhwa)\s+', line, re.IGNORECASE):
-                    cleaned_lines.append(line)
-            
-            if cleaned_lines:
-                info['synopsis'] = '\n'.join(cleaned_lines)
-                break
+    synopsis = extract_plan.SYNOPSIS.run(s_detail)
+    if synopsis:
+        info['synopsis'] = synopsis
     
     # Last updated
     last_update = s_detail.find('span', class_='datech')
@@ -226,6 +215,7 @@ def extract_comic_info(session, s_detail, url, list_title):
     return info
 
 # === EXTRACT CHAPTERS ===
+@metrics.timed("scraper_parse_seconds", stage="extract_chapters")
 def extract_chapters(s_detail):
     chapters = []
     
@@ -253,37 +243,30 @@ def extract_chapters(s_detail):
 
 # === EXTRACT CHAPTER IMAGES ===
 def extract_chapter_images(session, chapter_url):
-    s_ch = soup(session, chapter_url)
+    with profiling.stage("chapters"):
+        return _extract_chapter_images(session, chapter_url)
+
+def _extract_chapter_images(session, chapter_url):
+    if chapterstream.ENABLED:
+        images, html = chapterstream.fetch_images(chapter_url, session=session, printer=safe_print)
+        if images is not None or html is None:
+            return images or []
+        # Container tidak ketemu saat streaming: parse penuh seperti biasa
+        with metrics.timer("scraper_parse_seconds", stage="soup"):
+            s_ch = BeautifulSoup(html, 'html.parser')
+    else:
+        s_ch = soup(session, chapter_url)
     if not s_ch:
         return []
     
-    images = []
-    containers = [
-        s_ch.find('div', id='Baca_Komik'),
-        s_ch.find('div', class_='chapter-image'),
-        s_ch.select_one('.reader-area'),
-        s_ch.select_one('.chapter-body')
-    ]
-    
-    for container in containers:
-        if container:
-            for img in container.find_all('img'):
-                src = (img.get('src') or 
-                       img.get('data-src') or 
-                       img.get('data-lazy-src') or
-                       img.get('data-original'))
-                
-                if src and src.startswith(('http://', 'https://')):
-                    src = src.split('?')[0].strip()
-                    if src not in images:
-                        images.append(src)
-            
-            if images:
-                break
+    start = time.perf_counter()
+    images = extract_plan.CHAPTER_IMAGES.run(s_ch) or []
     
+    metrics.observe("scraper_parse_seconds", time.perf_counter() - start, stage="extract_chapter_images")
     return images
 
 # === EXTRACT TITLE FROM LIST PAGE ===
+@metrics.timed("scraper_parse_seconds", stage="extract_title_from_list")
 def extract_title_from_list(a_element):
     try:
         animepost_parent = a_element.find_parent('.animepost')
@@ -347,13 +330,10 @@ def scrape_all_pages(session):
         s = soup(session, url)
         if not s:
             safe_print(f"[{now()}] Gagal akses halaman {page}. Coba lagi...")
-            time.sleep(DELAY_PAGE * 2)
+            metrics.sleep(DELAY_PAGE * 2)
             continue
 
-        posts = (s.select('.listupd .animepost .animposx a[itemprop="url"]') or 
-                 s.select('.animepost a[itemprop="url"]') or
-                 s.select('.animepost .thumb a') or
-                 s.select('.film-list a[itemprop="url"]'))
+        posts = extract_plan.LIST_POSTS.run(s)
 
         if not posts:
             safe_print(f"[{now()}] Tidak ada komik di halaman {page}. Selesai.")
@@ -374,7 +354,9 @@ def scrape_all_pages(session):
                 all_comics.append({
                     "title": title, 
                     "url": comic_url,
-                    "scraped_at": now()
+                    "scraped_at": now(),
+                    "position": len(all_comics),
+                    **schedule.list_meta(a)
                 })
                 safe_print(f"[{now()}]      Found: {title}")
 
@@ -385,85 +367,127 @@ def scrape_all_pages(session):
             break
             
         page += 1
-        time.sleep(DELAY_PAGE)
+        metrics.sleep(DELAY_PAGE)
 
     safe_print(f"[{now()}] Ditemukan {len(all_comics)} komik dari {page} halaman.")
     return all_comics
 
+def discover(args, session, existing_comics):
+    """Daftar komik dari sitemap (--discovery sitemap) atau paginasi halaman list"""
+    if args.discovery == 'sitemap':
+        found = sitemap.discover(existing_comics, args.shard, session=session, printer=safe_print)
+        if found is not None:
+            return found
+        safe_print(f"[{now()}] Sitemap tidak ditemukan, pakai paginasi halaman list")
+    return scrape_all_pages(session)
+
 # === PROCESS SINGLE COMIC ===
-def process_comic(comic, existing_comics, session, thread_id):
+def process_comic(comic, existing_comics, session, thread_id, detail=None):
+    """detail = (info, chapters) halaman detail yang sudah diambil (komik baru yang di-remap dedup)"""
     title, url = comic['title'], comic['url']
-    safe_print(f"\n[{now()}] [Thread-{thread_id}] → {title}")
+    if detail is None:
+        safe_print(f"\n[{now()}] [Thread-{thread_id}] → {title}")
     
     if not url or not url.startswith('http'):
         safe_print(f"[{now()}]    URL tidak valid: {url}")
         return
 
+    # Jangan mulai komik yang perkiraannya tidak selesai sebelum deadline
+    missing = schedule.missing_chapters(comic, existing_comics.get(url))
+    if STOPPING.is_set() or not budget.allows(budget.cost(missing, DELAY_CHAPTER)):
+        budget.defer(title, url, "dihentikan" if STOPPING.is_set() else "tidak dimulai", missing)
+        return
+
     # Cek existing
     existing_data = existing_comics.get(url)
     
     if existing_data:
         safe_print(f"[{now()}]    Sudah ada {len(existing_data.get('chapters', []))} chapter. Cek update...")
         
-        if existing_data.get('title') != title:
-            safe_print(f"[{now()}]    Update title: '{existing_data['title']}' → '{title}'")
-            existing_data['title'] = title
+        if existing_data.title != title:
+            safe_print(f"[{now()}]    Update title: '{existing_data.title}' → '{title}'")
+            existing_data.title = title
         
-        existing_chapters = {ch['number'] for ch in existing_data.get('chapters', [])}
         new_chapters = []
 
-        s_detail = soup(session, url)
-        if not s_detail:
-            safe_print(f"[{now()}]    Gagal akses detail. Skip update.")
-            return
-
-        last_update = s_detail.find('span', class_='datech')
-        if last_update:
-            existing_data['last_updated'] = last_update.get_text(strip=True)
-
-        chapters_data = extract_chapters(s_detail)
-        for chapter in chapters_data:
-            if chapter['number'] not in existing_chapters:
-                safe_print(f"[{now()}]    → Chapter BARU: {chapter['number']}")
-                
-                images = extract_chapter_images(session, chapter['url'])
-                safe_print(f"[{now()}]       Found {len(images)} images")
-                
-                new_chapters.append({
-                    "number": chapter['number'],
-                    "url": chapter['url'],
-                    "date": chapter['date'],
-                    "images": images
-                })
-                
-                time.sleep(DELAY_CHAPTER)
+        remapped = detail is not None  # detail sudah diambil sebelum remap dedup
+        with profiling.stage("detail"):
+            if detail is None:
+                s_detail = soup(session, url)
+                if not s_detail:
+                    safe_print(f"[{now()}]    Gagal akses detail. Skip update.")
+                    sitemap.retry(url)
+                    return
+                last_update = s_detail.find('span', class_='datech')
+                detail = ({"last_updated": last_update.get_text(strip=True)} if last_update else {},
+                          extract_chapters(s_detail))
+            revisit.checked(url)
+            info, chapters_data = detail
+
+            if info.get('last_updated'):
+                existing_data.last_updated = info['last_updated']
+
+        # Nomor bisa dobel (mis. '276.HQ' dua kali): cocokkan nomor + url
+        missing = shard.missing_from(existing_data.chapter_refs, chapters_data)
+        IN_PROGRESS[url] = (existing_data, new_chapters)
+        for i, chapter in enumerate(missing):
+            if STOPPING.is_set() or not budget.allows(budget.cost(1, DELAY_CHAPTER, detail=False)):
+                safe_print(f"[{now()}]    {'Dihentikan' if STOPPING.is_set() else 'Deadline dekat'}: {len(missing) - i} chapter {title} ditunda")
+                budget.defer(title, url, "sebagian", len(missing) - i)
+                break
+            safe_print(f"[{now()}]    → Chapter BARU: {chapter['number']}")
+            
+            images = extract_chapter_images(session, chapter['url'])
+            safe_print(f"[{now()}]       Found {len(images)} images")
+            
+            new_chapters.append({
+                "number": chapter['number'],
+                "url": chapter['url'],
+                "date": chapter['date'],
+                "dated_at": now(),
+                "images": images
+            })
+            
+            metrics.sleep(DELAY_CHAPTER)
 
+        IN_PROGRESS.pop(url, None)
         if new_chapters:
-            existing_data['chapters'].extend(new_chapters)
-            existing_data['chapters'].sort(key=lambda x: 
-                float(re.search(r'[\d.]+', x['number']).group()) if re.search(r'[\d.]+', x['number']) else 0)
-            save_comic(existing_data)
+            existing_data.add_chapters(new_chapters)
+            save_comic(existing_data.to_dict())
             safe_print(f"[{now()}]    Update selesai: +{len(new_chapters)} chapter baru.")
+        elif remapped:
+            save_comic(existing_data.to_dict())  # URL baru hasil remap tetap harus sampai ke disk
         return
 
     # KOMIK BARU
     safe_print(f"[{now()}]    Komik baru, mulai scraping...")
     
-    s_detail = soup(session, url)
-    if not s_detail:
-        safe_print(f"[{now()}]    Gagal akses detail. Skip.")
-        return
+    with profiling.stage("detail"):
+        s_detail = soup(session, url)
+        if not s_detail:
+            safe_print(f"[{now()}]    Gagal akses detail. Skip.")
+            sitemap.retry(url)
+            return
+
+        comic_data = extract_comic_info(session, s_detail, url, None if comic.get('guessed_title') else title)
+        comic_data['chapters'] = []
 
-    comic_data = extract_comic_info(session, s_detail, url, title)
-    comic_data['chapters'] = []
+        chapters_data = extract_chapters(s_detail)
 
-    chapters_data = extract_chapters(s_detail)
+    # Slug berubah / di-list ulang: pakai record lama, hanya chapter yang belum ada yang diambil
+    if dedup.check(comic_data, chapters_data, existing_comics, safe_print):
+        return process_comic(comic, existing_comics, session, thread_id, (comic_data, chapters_data))
     safe_print(f"[{now()}]    Ditemukan {len(chapters_data)} chapter")
 
     chapter_count = 0
     total_chapters = len(chapters_data)
+    IN_PROGRESS[url] = (comic_data, [])
     
-    for chapter in reversed(chapters_data):
+    for i, chapter in enumerate(reversed(chapters_data)):
+        if STOPPING.is_set() or not budget.allows(budget.cost(1, DELAY_CHAPTER, detail=False)):
+            safe_print(f"[{now()}]    {'Dihentikan' if STOPPING.is_set() else 'Deadline dekat'}: {total_chapters - i} chapter {title} ditunda")
+            budget.defer(title, url, "sebagian", total_chapters - i)
+            break
         ch_num, ch_url = chapter['number'], chapter['url']
         safe_print(f"[{now()}]    → Chapter {ch_num} ({chapter_count + 1}/{total_chapters})")
 
@@ -474,6 +498,7 @@ def process_comic(comic, existing_comics, session, thread_id):
             "number": ch_num,
             "url": ch_url,
             "date": chapter['date'],
+            "dated_at": now(),
             "images": images
         })
         
@@ -483,13 +508,31 @@ def process_comic(comic, existing_comics, session, thread_id):
             save_comic(comic_data)
             safe_print(f"[{now()}]    Progress: {chapter_count}/{total_chapters} chapter")
         
-        time.sleep(DELAY_CHAPTER)
+        metrics.sleep(DELAY_CHAPTER)
 
+    IN_PROGRESS.pop(url, None)
     save_comic(comic_data)
     safe_print(f"[{now()}]    Selesai: {chapter_count} chapter tersimpan")
 
 # === MAIN SCRIPT ===
 if __name__ == "__main__":
+    args = build_parser("Scraper KomikIndo multithread").parse_args()
+    metrics.configure(args.metrics_out, args.metrics_interval, safe_print)
+    profiling.configure(args.profile, args.profile_dir, args.profile_interval)
+    transport.configure(args.http_mode, args.record_dir, args.replay_latency, args.replay_jitter, request_rate(args),
+                        args.backend)
+    html_cache.configure(args.html_cache, args.cache_policy, args.cache_max_mb, args.cache_max_age)
+    chapterstream.configure(args.stream_chapters)
+    budget.configure(args.deadline, args.time_budget, args.deferred_out)
+    changefeed.configure(args.feed_dir)
+    searchindex.configure(args.search_index)
+    dedup.configure(args.dedup)
+    revisit.configure(args.revisit, args.refresh, args.shard)
+    if args.shard:
+        OUTPUT_DIR = shard.shard_dir(args.shard)
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        safe_print(f"[{now()}] Mode shard {args.shard[0]}/{args.shard[1]} → output ke {OUTPUT_DIR}")
+
     safe_print(f"[{now()}] Memulai scraping komik dari KomikIndo...")
     safe_print(f"[{now()}] MODE: MULTITHREADING ({MAX_THREADS} threads)")
     
@@ -498,27 +541,34 @@ if __name__ == "__main__":
     safe_print(f"[{now()}] Loaded {len(existing_comics)} existing comics")
     
     # Scrape semua halaman
-    with create_session() as session:
-        all_comics = scrape_all_pages(session)
+    with create_session() as session, profiling.stage("discovery"):
+        all_comics = discover(args, session, existing_comics)
+    if args.shard:
+        all_comics = [c for c in all_comics if shard.owns(c['url'], args.shard)]
+        safe_print(f"[{now()}] Shard ini memegang {len(all_comics)} komik")
+    all_comics = revisit.select(all_comics, existing_comics, safe_print)
+    if args.order == 'priority':
+        all_comics = schedule.order(all_comics, existing_comics, safe_print)
     
     safe_print(f"[{now()}] Memulai proses {len(all_comics)} komik dengan {MAX_THREADS} threads...")
     
     # Process comics dengan multithreading
     with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
-        futures = []
+        futures = {}
         for i, comic in enumerate(all_comics):
             # Buat session baru untuk setiap thread
             thread_session = create_session()
             future = executor.submit(process_comic, comic, existing_comics, thread_session, i % MAX_THREADS + 1)
-            futures.append(future)
+            futures[future] = comic['url']
             
             # Delay kecil antara submission untuk hindari flood
-            time.sleep(0.1)
+            metrics.sleep(0.1)
         
         # Tunggu semua thread selesai
         for future in concurrent.futures.as_completed(futures):
             try:
                 future.result()
+                sitemap.done(futures[future])
             except Exception as e:
                 safe_print(f"[{now()}] ERROR dalam thread: {e}")
 
@@ -0,0 +1,348 @@
+"""
+Index pencarian komik (title, alternative_titles, synopsis) di SQLite.
+
+Inverted index sendiri (bukan FTS5) supaya normalisasi sama untuk semua
+bahasa di alternative_titles:
+- NFKC + casefold + buang diakritik huruf non-CJK (NFKD lalu hapus
+  combining mark; kana dan Hangul tidak diurai)
+- teks CJK (Han, kana, Hangul) di-index per karakter, jadi '俺だけ' cocok
+  dengan '俺だけレベルアップな件'
+- token terakhir query dicocokkan sebagai prefix (range scan di index)
+- kalau pencarian kata tidak ketemu apa-apa, fallback ke kemiripan trigram
+  pada title + alternative_titles (salah ketik, potongan kata)
+
+Facet genres/themes/type/status disimpan per komik untuk filter dan hitungan.
+
+Index diperbarui di save_comic() (hanya kalau teks/facet berubah) dan bisa
+dibangun ulang dari folder comics:
+
+    python searchindex.py build [--dir comics]
+    python searchindex.py query "solo level" [--genre Action] [--type Manhwa] [--status Berjalan]
+    python searchindex.py stats
+"""
+import argparse, functools, hashlib, json, re, sqlite3, sys, threading, time, unicodedata
+import comicmeta
+
+# === KONFIGURASI ===
+INDEX_PATH = "search.sqlite"
+FIELD_WEIGHTS = {"title": 3.0, "alternative_titles": 2.0, "synopsis": 1.0}
+FACETS = ("genres", "themes", "type", "status")
+PREFIX_WEIGHT = 0.7       # skor kecocokan prefix relatif terhadap kata utuh
+TRIGRAM_THRESHOLD = 0.3   # minimal proporsi trigram query yang cocok
+INDEX_FIELDS = ("url", "title", "alternative_titles", "synopsis") + FACETS
+
+_CJK_RANGES = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff'
+CJK = re.compile(f'[{_CJK_RANGES}]')
+CJK_SPLIT = re.compile(f'[{_CJK_RANGES}]|[^{_CJK_RANGES}]+')
+WORD = re.compile(r'\w+')
+
+# === NORMALISASI & TOKEN ===
+@functools.lru_cache(maxsize=4096)
+def fold(ch):
+    """'é' -> 'e'; karakter CJK dibiarkan (dakuten kana dan jamo Hangul bukan diakritik)"""
+    if CJK.match(ch):
+        return ch
+    return ''.join(c for c in unicodedata.normalize('NFKD', ch) if not unicodedata.combining(c))
+
+def normalize(text):
+    text = unicodedata.normalize('NFKC', (text or '').casefold())
+    return ''.join(map(fold, text))
+
+def tokens(text):
+    """Token ternormalisasi; run CJK dipecah per karakter"""
+    out = []
+    for word in WORD.findall(normalize(text)):
+        if CJK.search(word):
+            # '俺だけlevel' -> '俺', 'だ', 'け', 'level'
+            out.extend(CJK_SPLIT.findall(word))
+        else:
+            out.append(word)
+    return out
+
+def trigrams(word):
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def as_list(value):
+    if not value:
+        return []
+    return value if isinstance(value, list) else [value]
+
+# === INDEX ===
+class SearchIndex:
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.local = threading.local()
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                title TEXT,
+                path TEXT,
+                signature TEXT,
+                updated_at REAL);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                doc INTEGER NOT NULL,
+                weight REAL NOT NULL,
+                PRIMARY KEY (term, doc)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+            CREATE TABLE IF NOT EXISTS grams (
+                gram TEXT NOT NULL,
+                doc INTEGER NOT NULL,
+                PRIMARY KEY (gram, doc)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS grams_doc ON grams (doc);
+            CREATE TABLE IF NOT EXISTS facets (
+                name TEXT NOT NULL,
+                value TEXT NOT NULL,
+                doc INTEGER NOT NULL,
+                PRIMARY KEY (name, value, doc)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS facets_doc ON facets (doc);
+        """)
+
+    def _conn(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # --- tulis ---
+    def add(self, record, path=None, conn=None):
+        """Index / perbarui satu record; False kalau teks dan facet tidak berubah"""
+        url = record.get('url')
+        if not url:
+            return False
+        values = {field: record.get(field) for field in INDEX_FIELDS}
+        signature = hashlib.sha1(json.dumps(values, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+        own = conn is None
+        conn = conn or self._conn()
+        if own:
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT id, signature, path FROM docs WHERE url = ?", (url,)).fetchone()
+            if row and row[1] == signature:
+                if path and row[2] != path:
+                    conn.execute("UPDATE docs SET path = ? WHERE id = ?", (path, row[0]))
+                changed = False
+            else:
+                self._replace(conn, row[0] if row else None, record, path or (row[2] if row else None), signature)
+                changed = True
+        except BaseException:
+            if own:
+                conn.execute("ROLLBACK")
+            raise
+        if own:
+            conn.execute("COMMIT")
+        return changed
+
+    def _replace(self, conn, doc, record, path, signature):
+        if doc is not None:
+            for table in ("postings", "grams", "facets"):
+                conn.execute(f"DELETE FROM {table} WHERE doc = ?", (doc,))
+            conn.execute("UPDATE docs SET title = ?, path = ?, signature = ?, updated_at = ? WHERE id = ?",
+                         (record.get('title'), path, signature, time.time(), doc))
+        else:
+            doc = conn.execute("INSERT INTO docs (url, title, path, signature, updated_at) VALUES (?, ?, ?, ?, ?)",
+                               (record['url'], record.get('title'), path, signature, time.time())).lastrowid
+
+        weights, grams = {}, set()
+        for field, weight in FIELD_WEIGHTS.items():
+            for text in as_list(record.get(field)):
+                for token in tokens(text):
+                    weights[token] = max(weights.get(token, 0.0), weight)
+                    if field != "synopsis" and not CJK.match(token):
+                        grams |= trigrams(token)
+        conn.executemany("INSERT INTO postings (term, doc, weight) VALUES (?, ?, ?)",
+                         [(term, doc, weight) for term, weight in weights.items()])
+        conn.executemany("INSERT INTO grams (gram, doc) VALUES (?, ?)", [(gram, doc) for gram in grams])
+        conn.executemany("INSERT OR IGNORE INTO facets (name, value, doc) VALUES (?, ?, ?)",
+                         [(name, value, doc) for name in FACETS for value in as_list(record.get(name))])
+        return doc
+
+    def remove(self, url):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT id FROM docs WHERE url = ?", (url,)).fetchone()
+        if row:
+            for table in ("postings", "grams", "facets"):
+                conn.execute(f"DELETE FROM {table} WHERE doc = ?", (row[0],))
+            conn.execute("DELETE FROM docs WHERE id = ?", (row[0],))
+        conn.execute("COMMIT")
+
+    def build(self, directory, printer=print):
+        """Index semua file di folder; dokumen yang file-nya sudah tidak ada dibuang"""
+        conn = self._conn()
+        seen, changed = set(), 0
+        conn.execute("BEGIN IMMEDIATE")
+        for header in comicmeta.iter_headers(directory, INDEX_FIELDS, None, printer):
+            if header.get('url'):
+                seen.add(header['url'])
+                changed += self.add(header, header['path'], conn)
+        stale = [url for (url,) in conn.execute("SELECT url FROM docs") if url not in seen]
+        conn.execute("COMMIT")
+        for url in stale:
+            self.remove(url)
+        printer(f"   Index: {len(seen)} komik, {changed} diperbarui, {len(stale)} dibuang")
+
+    # --- baca ---
+    def _matches(self, conn, token, last):
+        """{doc: skor} untuk satu token query"""
+        scores = {}
+        for doc, weight in conn.execute("SELECT doc, weight FROM postings WHERE term = ?", (token,)):
+            scores[doc] = weight
+        if last and not CJK.match(token):
+            for doc, weight in conn.execute("SELECT doc, MAX(weight) FROM postings WHERE term > ? AND term < ? GROUP BY doc",
+                                            (token, token + '\U0010ffff')):
+                scores[doc] = max(scores.get(doc, 0.0), weight * PREFIX_WEIGHT)
+        return scores
+
+    def _fuzzy(self, conn, words):
+        """{doc: skor} dari proporsi trigram query yang ada di title/alternative_titles"""
+        grams = set()
+        for word in words:
+            if not CJK.match(word):
+                grams |= trigrams(word)
+        if not grams:
+            return {}
+        marks = ','.join('?' * len(grams))
+        rows = conn.execute(f"SELECT doc, COUNT(*) FROM grams WHERE gram IN ({marks}) GROUP BY doc", list(grams))
+        return {doc: count / len(grams) for doc, count in rows if count / len(grams) >= TRIGRAM_THRESHOLD}
+
+    def _filtered(self, conn, filters):
+        """Set doc yang lolos semua filter facet (None = tanpa filter). Satu facet
+        dengan beberapa nilai = semua nilai harus ada (mis. genre Action + Comedy)."""
+        allowed = None
+        for name, values in filters.items():
+            for value in as_list(values):
+                docs = {doc for (doc,) in conn.execute("SELECT doc FROM facets WHERE name = ? AND value = ?", (name, value))}
+                allowed = docs if allowed is None else allowed & docs
+        return allowed
+
+    def search(self, query, limit=20, **filters):
+        """Cari komik. filters: genres/themes/type/status (string atau list).
+        Return {"hits": [...], "total": n, "fuzzy": bool, "facets": {...}, "ms": waktu}"""
+        start = time.perf_counter()
+        conn = self._conn()
+        words = tokens(query)
+        allowed = self._filtered(conn, {k: v for k, v in filters.items() if k in FACETS and v})
+        fuzzy = False
+        if words:
+            scores = None
+            for i, word in enumerate(words):
+                matches = self._matches(conn, word, i == len(words) - 1)
+                scores = matches if scores is None else {doc: s + matches[doc] for doc, s in scores.items() if doc in matches}
+                if not scores:
+                    break
+            if not scores:
+                scores, fuzzy = self._fuzzy(conn, words), True
+        else:
+            # Query kosong = browse dengan filter saja
+            scores = {doc: 0.0 for (doc,) in conn.execute("SELECT id FROM docs")}
+        if allowed is not None:
+            scores = {doc: s for doc, s in scores.items() if doc in allowed}
+
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        top = ranked[:limit]
+        rows = {}
+        if top:
+            marks = ','.join('?' * len(top))
+            rows = {row[0]: row for row in conn.execute(f"SELECT id, url, title, path FROM docs WHERE id IN ({marks})",
+                                                        [doc for doc, _ in top])}
+        hits = [{"url": rows[doc][1], "title": rows[doc][2], "path": rows[doc][3], "score": round(score, 3)}
+                for doc, score in top if doc in rows]
+        return {"hits": hits, "total": len(ranked), "fuzzy": fuzzy,
+                "facets": self.facet_counts(conn, [doc for doc, _ in ranked]),
+                "ms": round((time.perf_counter() - start) * 1000, 2)}
+
+    def facet_counts(self, conn, docs):
+        """{facet: {nilai: jumlah}} untuk hasil pencarian"""
+        counts = {name: {} for name in FACETS}
+        docs = list(docs)
+        for i in range(0, len(docs), 900):
+            chunk = docs[i:i + 900]
+            marks = ','.join('?' * len(chunk))
+            for name, value, count in conn.execute(f"SELECT name, value, COUNT(*) FROM facets WHERE doc IN ({marks}) "
+                                                   f"GROUP BY name, value", chunk):
+                counts[name][value] = counts[name].get(value, 0) + count
+        return {name: dict(sorted(values.items(), key=lambda item: -item[1])) for name, values in counts.items()}
+
+    def stats(self):
+        conn = self._conn()
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("docs", "postings", "grams", "facets")}
+
+# === HELPER UNTUK SCRIPT ===
+INDEX = None
+_index_lock = threading.Lock()
+_renamed = {}  # url baru -> url lama (remap dedup), dokumen lama dibuang saat simpan
+
+def configure(path=INDEX_PATH):
+    """path None = index tidak diperbarui saat simpan"""
+    global INDEX
+    INDEX = SearchIndex(path) if path else None
+
+def rename(old_url, new_url):
+    """Record di-remap ke URL baru: dokumen URL lama dibuang saat record disimpan"""
+    if INDEX is not None and old_url and old_url != new_url:
+        with _index_lock:
+            _renamed[new_url] = old_url
+
+def record_save(record, path=None, printer=print):
+    """Dipanggil save_comic(); error index tidak boleh menggagalkan simpan komik"""
+    if INDEX is None:
+        return False
+    try:
+        with _index_lock:
+            old_url = _renamed.pop(record.get('url'), None)
+            if old_url:
+                INDEX.remove(old_url)
+            return INDEX.add(record, path)
+    except sqlite3.Error as e:
+        printer(f"   Warning: Gagal update index pencarian: {e}")
+        return False
+
+# === CLI ===
+def main():
+    parser = argparse.ArgumentParser(description="Index pencarian komik")
+    parser.add_argument('--index', default=INDEX_PATH, help=f'File index SQLite (default {INDEX_PATH})')
+    sub = parser.add_subparsers(dest='command', required=True)
+    bd = sub.add_parser('build', help='Bangun / sinkronkan index dari folder komik')
+    bd.add_argument('--dir', default="comics")
+    qr = sub.add_parser('query', help='Cari komik')
+    qr.add_argument('text', nargs='?', default='')
+    qr.add_argument('--genre', dest='genres', action='append')
+    qr.add_argument('--theme', dest='themes', action='append')
+    qr.add_argument('--type')
+    qr.add_argument('--status')
+    qr.add_argument('--limit', type=int, default=10)
+    qr.add_argument('--json', action='store_true', help='Cetak hasil mentah sebagai JSON')
+    sub.add_parser('stats', help='Jumlah dokumen / posting')
+    args = parser.parse_args()
+
+    index = SearchIndex(args.index)
+    if args.command == 'build':
+        start = time.time()
+        index.build(args.dir)
+        print(f"   Selesai dalam {time.time() - start:.1f}s")
+    elif args.command == 'stats':
+        print(json.dumps(index.stats(), indent=2))
+    else:
+        result = index.search(args.text, args.limit, genres=args.genres, themes=args.themes,
+                              type=args.type, status=args.status)
+        if args.json:
+            json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+            print()
+            return
+        print(f"{result['total']} hasil{' (fuzzy)' if result['fuzzy'] else ''} dalam {result['ms']} ms")
+        for hit in result['hits']:
+            print(f"  {hit['score']:6.2f}  {hit['title']}  ({hit['url']})")
+        for name in FACETS:
+            top = list(result['facets'][name].items())[:5]
+            if top:
+                print(f"  {name}: " + ", ".join(f"{value} ({count})" for value, count in top))
+
+if __name__ == "__main__":
+    main()
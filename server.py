@@ -0,0 +1,309 @@
+"""
+HTTP API read-only di atas folder comics (http.server bawaan, tanpa framework).
+
+    GET /comics                           daftar komik (metadata ringkas)
+    GET /comics/<id>                      metadata satu komik (tanpa chapters)
+    GET /comics/<id>/chapters             daftar chapter: number, url, date, has_images
+    GET /comics/<id>/chapters/<chapter>   satu chapter lengkap dengan images
+    GET /search?q=...&genre=...&limit=20  lewat searchindex (kalau file index ada), limit 1..100
+
+<id> = nama file tanpa .json. <chapter> = slug URL chapter (segmen terakhir,
+mis. black-clover-chapter-276-hq-2) atau nomor chapter; nomor yang dipakai
+lebih dari satu chapter dijawab 300 dengan daftar slug kandidatnya.
+
+Record yang sudah di-parse (metadata, daftar chapter, offset byte tiap
+chapter) disimpan di LRU; satu chapter dibaca dengan seek ke offset-nya,
+jadi file 3 MB tidak pernah di-parse atau di-serialisasi ulang utuh. ETag (weak) = mtime_ns + ukuran file. Body gzip /
+brotli dikompresi sekali lalu disimpan bersama entry LRU; save_comic() yang
+menulis ulang file mengubah mtime, jadi entry (dan semua body-nya) dibuang
+pada request berikutnya.
+
+    python server.py [--dir comics] [--port 8000] [--cache-size 256]
+"""
+import argparse, gzip, hashlib, json, os, threading, time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+import comicmeta, searchindex
+
+try:
+    import brotli
+except ImportError:  # opsional
+    brotli = None
+
+# === KONFIGURASI ===
+COMICS_DIR = "comics"
+CACHE_SIZE = 256          # jumlah komik di LRU
+MIN_COMPRESS = 512        # body lebih kecil dari ini tidak dikompresi
+LIST_FIELDS = ("url", "title", "status", "type", "rating", "votes", "last_updated")
+MAX_SEARCH_LIMIT = 100
+
+def encode(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+# === ENTRY ===
+class Entry:
+    """Satu komik di LRU: metadata, daftar chapter, offset byte chapter, body response"""
+
+    def __init__(self, path, stat):
+        self.path = path
+        self.version = (stat.st_mtime_ns, stat.st_size)
+        self.etag = f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'  # weak: sama untuk semua encoding
+        header = comicmeta.read_header(path, fields=None, chapter_fields=("number", "url", "date"))
+        self.meta = {k: v for k, v in header.items() if k not in ("path", "chapters", "empty_chapters", "chapter_info")}
+        self.chapters = header.get("chapter_info", [])
+        self.spans = comicmeta.chapter_spans(path)
+        self.bodies = Bodies()
+
+    def chapter_indexes(self, key):
+        """Index chapter untuk slug URL (unik) atau nomor (bisa dobel, mis. dua '276.HQ')"""
+        found = [i for i, ch in enumerate(self.chapters) if chapter_slug(ch) == key]
+        return found or [i for i, ch in enumerate(self.chapters) if ch.get('number') == key]
+
+    def read_chapter(self, i):
+        start, end = self.spans[i]
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            return json.loads(f.read(end - start))
+
+def chapter_slug(chapter):
+    return (chapter.get('url') or '').rstrip('/').rsplit('/', 1)[-1]
+
+class Bodies:
+    """Body response per (route, encoding): identity dibangun sekali, tiap kompresi sekali"""
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, route, encoding, build):
+        key = (route, encoding)
+        with self.lock:
+            cached = self.data.get(key)
+        if cached is not None:
+            return cached
+        raw = self.get(route, "identity", build) if encoding != "identity" else build()
+        data = raw if encoding == "identity" else compress(raw, encoding)
+        with self.lock:
+            self.data[key] = data
+        return data
+
+def compress(raw, encoding):
+    if encoding == "br":
+        return brotli.compress(raw, quality=9)
+    return gzip.compress(raw, 6)
+
+def pick_encoding(accept, size):
+    """br > gzip > identity sesuai Accept-Encoding client"""
+    if size < MIN_COMPRESS or not accept:
+        return "identity"
+    offered = {part.split(';')[0].strip() for part in accept.split(',')
+               if not part.strip().endswith(('q=0', 'q=0.0'))}
+    if brotli and "br" in offered:
+        return "br"
+    if "gzip" in offered or "*" in offered:
+        return "gzip"
+    return "identity"
+
+# === STORE ===
+class Store:
+    def __init__(self, directory=COMICS_DIR, cache_size=CACHE_SIZE):
+        self.directory = directory
+        self.cache_size = cache_size
+        self.entries = OrderedDict()
+        self.catalog = {}   # nama file -> (versi, ringkasan) untuk /comics
+        self.listing_bodies = (None, Bodies())
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def path(self, comic_id):
+        name = os.path.basename(comic_id)
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get(self, comic_id):
+        """Entry yang masih sesuai file di disk, atau None kalau komik tidak ada"""
+        path = self.path(comic_id)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            with self.lock:
+                self.entries.pop(path, None)
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry.version == version:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        entry = Entry(path, stat)
+        with self.lock:
+            self.entries[path] = entry
+            self.entries.move_to_end(path)
+            while len(self.entries) > self.cache_size:
+                self.entries.popitem(last=False)
+        return entry
+
+    def drop(self, comic_id):
+        with self.lock:
+            self.entries.pop(self.path(comic_id), None)
+
+    def listing(self):
+        """Ringkasan semua komik; hanya file yang berubah sejak request sebelumnya dibaca ulang"""
+        names = sorted(f for f in os.listdir(self.directory) if f.endswith('.json'))
+        catalog = {}
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = self.catalog.get(name)
+            if cached and cached[0] == version:
+                catalog[name] = cached
+                continue
+            try:
+                header = comicmeta.read_header(path, LIST_FIELDS)
+            except (ValueError, IndexError):
+                continue
+            summary = {"id": name[:-5], **{f: header.get(f) for f in LIST_FIELDS}, "chapters": len(header["chapters"])}
+            catalog[name] = (version, summary)
+        self.catalog = catalog
+        etag = 'W/"' + hashlib.sha1(repr([(name, v) for name, (v, _) in catalog.items()]).encode()).hexdigest()[:16] + '"'
+        if self.listing_bodies[0] != etag:
+            self.listing_bodies = (etag, Bodies())
+        return etag, [summary for _, summary in catalog.values()], self.listing_bodies[1]
+
+# === HANDLER ===
+class Handler(BaseHTTPRequestHandler):
+    store = None
+    index = None
+    server_version = "scrapemik"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head=False):
+        parts = urlsplit(self.path)
+        segments = [unquote(p) for p in parts.path.strip('/').split('/') if p]
+        try:
+            if segments == ["comics"]:
+                etag, comics, bodies = self.store.listing()
+                return self.respond(etag, lambda: encode(comics), (bodies, "list"), head)
+            if segments == ["search"]:
+                return self.search(parse_qs(parts.query), head)
+            if len(segments) >= 2 and segments[0] == "comics":
+                return self.comic(segments[1], segments[2:], head)
+            self.error(404, "Route tidak dikenal")
+        except (ValueError, IndexError, OSError) as e:
+            self.error(500, f"Gagal baca data: {e}")
+
+    def comic(self, comic_id, rest, head, retry=True):
+        entry = self.store.get(comic_id)
+        if entry is None:
+            return self.error(404, "Komik tidak ditemukan")
+        if not rest:
+            return self.respond(entry.etag, lambda: encode(entry.meta), (entry.bodies, "meta"), head)
+        if rest == ["chapters"]:
+            return self.respond(entry.etag, lambda: encode(entry.chapters), (entry.bodies, "chapters"), head)
+        if len(rest) == 2 and rest[0] == "chapters":
+            found = entry.chapter_indexes(rest[1])
+            if not found:
+                return self.error(404, "Chapter tidak ditemukan")
+            if len(found) > 1:
+                candidates = [{"number": entry.chapters[i].get('number'), "url": entry.chapters[i].get('url'),
+                               "slug": chapter_slug(entry.chapters[i])} for i in found]
+                return self.send(300, encode({"error": "Nomor chapter dipakai lebih dari satu chapter, pakai slug",
+                                              "chapters": candidates}), "identity", None, head, cache=False)
+            i = found[0]
+            try:
+                return self.respond(entry.etag, lambda: encode(entry.read_chapter(i)), (entry.bodies, f"chapter:{i}"), head)
+            except ValueError:
+                # File ditulis ulang setelah offset dibaca; ambil entry baru sekali lagi
+                if retry:
+                    self.store.drop(comic_id)
+                    return self.comic(comic_id, rest, head, retry=False)
+                raise
+        self.error(404, "Route tidak dikenal")
+
+    def search(self, query, head):
+        if self.index is None:
+            return self.error(404, "Index pencarian tidak tersedia")
+        try:
+            limit = int(query.get('limit', ['20'])[0])
+        except ValueError:
+            return self.error(400, "limit harus bilangan bulat")
+        if not 1 <= limit <= MAX_SEARCH_LIMIT:
+            return self.error(400, f"limit harus 1..{MAX_SEARCH_LIMIT}")
+        result = self.index.search(query.get('q', [''])[0], limit,
+                                   genres=query.get('genre'), themes=query.get('theme'),
+                                   type=query.get('type', [None])[0], status=query.get('status', [None])[0])
+        body = encode(result)
+        self.send(200, body, "identity", None, head, cache=False)
+
+    def respond(self, etag, build, cache_key, head):
+        if etag and etag in [t.strip() for t in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        accept = self.headers.get('Accept-Encoding', '')
+        bodies, route = cache_key
+        raw = bodies.get(route, "identity", build)
+        encoding = pick_encoding(accept, len(raw))
+        self.send(200, bodies.get(route, encoding, build), encoding, etag, head)
+
+    def send(self, status, body, encoding, etag, head, cache=True):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache" if cache else "no-store")
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def error(self, status, message):
+        self.send(status, encode({"error": message}), "identity", None, False, cache=False)
+
+    def do_POST(self):
+        self.error(405, "Server read-only")
+
+    do_PUT = do_DELETE = do_PATCH = do_POST
+
+# === MAIN ===
+def main():
+    parser = argparse.ArgumentParser(description="HTTP API read-only untuk folder komik")
+    parser.add_argument('--dir', default=COMICS_DIR)
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE, help=f'Jumlah komik di LRU (default {CACHE_SIZE})')
+    parser.add_argument('--search-index', default=searchindex.INDEX_PATH, metavar='FILE',
+                        help='Index untuk /search (dilewati kalau file tidak ada)')
+    args = parser.parse_args()
+
+    Handler.store = Store(args.dir, args.cache_size)
+    Handler.index = searchindex.SearchIndex(args.search_index) if os.path.exists(args.search_index) else None
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Melayani {args.dir} di http://{args.host}:{args.port} "
+          f"(LRU {args.cache_size} komik, kompresi: gzip{', br' if brotli else ''})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        store = Handler.store
+        print(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] Berhenti. Cache: {store.hits} hit, {store.misses} miss")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Sharding crawl ke beberapa proses / mesin.
+
+Setiap runner (scrape.py / scrapemulti.py --shard I/N) hanya memproses komik
+dengan stable_hash(url) % N == I dan menulis ke folder shard sendiri
+(shards/shard-I-of-N/). Runner tidak berbagi apa pun selain budget request
+global opsional (--global-rate dibagi rata ke N runner). Setelah semua shard
+selesai, `merge` melipat hasilnya ke comics/ secara deterministik.
+
+    python shard.py launch --shards 4 [--script scrapemulti.py] -- --http-mode replay
+    python shard.py merge [--shard-root shards] [--dry-run]
+    python shard.py check [--base-dir comics]
+"""
+import argparse, hashlib, json, os, re, subprocess, sys
+
+# === KONFIGURASI ===
+SHARD_ROOT = "shards"
+BASE_DIR = "comics"
+
+def parse_shard(value):
+    """'I/N' (I mulai dari 0) -> (I, N)"""
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', value or '')
+    if not match:
+        raise ValueError(f"Format shard harus I/N, dapat: {value}")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard {index}/{count} tidak valid (0 <= I < N)")
+    return index, count
+
+def canonical_url(url):
+    return url.strip().rstrip('/').lower()
+
+def shard_of(url, count):
+    # hash() Python di-salt per proses, jadi pakai sha1 supaya semua runner sepakat
+    digest = hashlib.sha1(canonical_url(url).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count
+
+def owns(url, shard):
+    if not shard:
+        return True
+    index, count = shard
+    return shard_of(url, count) == index
+
+def shard_dir(shard, root=SHARD_ROOT):
+    index, count = shard
+    return os.path.join(root, f"shard-{index}-of-{count}")
+
+# === MERGE ===
+def chapter_sort_key(chapter):
+    match = re.search(r'[\d.]+', chapter.get('number', ''))
+    try:
+        return float(match.group()) if match else 0
+    except ValueError:
+        return 0
+
+def chapter_key(chapter):
+    """Identitas chapter: nomor bisa dobel (mis. '276.HQ' dua kali), jadi pakai nomor + url"""
+    return chapter['number'], canonical_url(chapter.get('url') or '')
+
+def keyed_chapters(chapters):
+    """(nomor, url, kemunculan ke-n) -> chapter; entry kembar persis tetap dua"""
+    seen, keyed = {}, {}
+    for ch in chapters:
+        key = chapter_key(ch)
+        seen[key] = seen.get(key, 0) + 1
+        keyed[key + (seen[key],)] = ch
+    return keyed
+
+def missing_from(stored, listed):
+    """Chapter di `listed` (halaman detail) yang belum ada di `stored`. Dicocokkan per
+    chapter_key; chapter tersimpan tanpa url (record lama scrape_manga.py) per nomor."""
+    have = {chapter_key(ch) for ch in stored}
+    no_url = {ch['number'] for ch in stored if not ch.get('url')}
+    return [ch for ch in listed if chapter_key(ch) not in have and ch['number'] not in no_url]
+
+def merge_record(base, update):
+    """Gabungkan record shard ke record kanonik. Metadata dari shard (lebih baru),
+    chapter di-union per (nomor, url); images yang sudah terisi tidak ditimpa list
+    kosong. Urutan chapter base dipertahankan kalau tidak ada chapter baru."""
+    if base is None:
+        return update
+    merged = {k: v for k, v in update.items() if k != 'chapters'}
+    chapters = keyed_chapters(base.get('chapters', []))
+    added = False
+    for key, ch in keyed_chapters(update.get('chapters', [])).items():
+        old = chapters.get(key)
+        added = added or old is None
+        if old and old.get('images') and not ch.get('images'):
+            chapters[key] = {**ch, "images": old['images']}
+        else:
+            chapters[key] = ch
+    merged['chapters'] = list(chapters.values())
+    if added:
+        merged['chapters'].sort(key=lambda ch: (chapter_sort_key(ch), ch['number']))
+    return merged
+
+def check_dir(directory=BASE_DIR, printer=print):
+    """Merge setiap record dengan dirinya sendiri harus tidak mengubah apa pun"""
+    changed = 0
+    for _, (path, data) in sorted(load_dir(directory).items()):
+        merged = merge_record(data, json.loads(json.dumps(data)))
+        if merged != data:
+            changed += 1
+            printer(f"   {path}: {len(data.get('chapters', []))} -> {len(merged.get('chapters', []))} chapter")
+    return changed
+
+def load_dir(directory):
+    """url -> (path, data) untuk semua file komik di folder"""
+    records = {}
+    if not os.path.isdir(directory):
+        return records
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.json'):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"   Warning: Gagal baca {path}: {e}")
+            continue
+        if data.get('url'):
+            records[canonical_url(data['url'])] = (path, data)
+    return records
+
+def merge_shards(shard_root=SHARD_ROOT, base_dir=BASE_DIR, dry_run=False):
+    import naming  # naming butuh canonical_url dari modul ini
+
+    shard_dirs = sorted(os.path.join(shard_root, d) for d in os.listdir(shard_root)
+                        if os.path.isdir(os.path.join(shard_root, d)))
+    canonical = load_dir(base_dir)
+    written = 0
+    for directory in shard_dirs:
+        for key, (_, update) in sorted(load_dir(directory).items()):
+            path, base = canonical.get(key, (None, None))
+            merged = merge_record(base, update)
+            if merged == base:
+                continue
+            path = path or naming.comic_path(base_dir, merged['url'])
+            canonical[key] = (path, merged)
+            written += 1
+            print(f"   {'(dry-run) ' if dry_run else ''}{os.path.basename(directory)} -> {path} ({len(merged['chapters'])} chapter)")
+            if not dry_run:
+                tmp = f"{path}.tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(merged, f, ensure_ascii=False, indent=2)
+                os.replace(tmp, path)
+    return written
+
+# === LAUNCH LOKAL ===
+def launch(count, script, extra):
+    procs = []
+    for index in range(count):
+        cmd = [sys.executable, script, '--shard', f"{index}/{count}", *extra]
+        print(f"   start: {' '.join(cmd)}")
+        log = open(os.path.join(SHARD_ROOT, f"shard-{index}-of-{count}.log"), 'w', encoding='utf-8')
+        procs.append((subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT), log))
+    failed = 0
+    for index, (proc, log) in enumerate(procs):
+        code = proc.wait()
+        log.close()
+        print(f"   shard {index}/{count} selesai (exit {code})")
+        failed += code != 0
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharding crawl komikindo")
+    sub = parser.add_subparsers(dest='command', required=True)
+    mg = sub.add_parser('merge', help='Gabungkan semua shard ke folder komik kanonik')
+    mg.add_argument('--shard-root', default=SHARD_ROOT)
+    mg.add_argument('--base-dir', default=BASE_DIR)
+    mg.add_argument('--dry-run', action='store_true')
+    ck = sub.add_parser('check', help='Pastikan merge record dengan dirinya sendiri tidak mengubah apa pun')
+    ck.add_argument('--base-dir', default=BASE_DIR)
+    ln = sub.add_parser('launch', help='Jalankan N runner shard lokal lalu tunggu semuanya selesai')
+    ln.add_argument('--shards', type=int, required=True)
+    ln.add_argument('--script', default='scrapemulti.py')
+    ln.add_argument('extra', nargs=argparse.REMAINDER, help='Argumen tambahan untuk script (setelah --)')
+    args = parser.parse_args()
+
+    if args.command == 'launch':
+        os.makedirs(SHARD_ROOT, exist_ok=True)
+        extra = args.extra[1:] if args.extra[:1] == ['--'] else args.extra
+        sys.exit(1 if launch(args.shards, args.script, extra) else 0)
+    if args.command == 'check':
+        changed = check_dir(args.base_dir)
+        print(f"Check selesai: {changed} komik berubah saat di-merge dengan dirinya sendiri")
+        sys.exit(1 if changed else 0)
+
+    written = merge_shards(args.shard_root, args.base_dir, args.dry_run)
+    print(f"Merge selesai: {written} komik {'akan ' if args.dry_run else ''}ditulis ke {args.base_dir}")
+
+if __name__ == "__main__":
+    main()
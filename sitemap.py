@@ -0,0 +1,292 @@
+"""
+Discovery komik dari XML sitemap WordPress, pengganti paginasi komik-terbaru.
+
+Sitemap index dicari dari robots.txt (baris Sitemap:) lalu lokasi umum
+WordPress/Yoast (SITEMAP_URLS). Dari index hanya sitemap komik yang dibaca
+(nama cocok COMIC_SITEMAP, kalau tidak ada yang cocok semua sitemap), dan
+sitemap yang <lastmod>-nya tidak berubah sejak run sebelumnya dilewati.
+Body dibaca per chunk lewat transport.stream dan di-feed ke XMLPullParser,
+jadi sitemap besar (atau .xml.gz) tidak pernah dimuat utuh.
+
+Yang diantrekan hanya URL komik dengan <lastmod> lebih baru dari run
+sebelumnya, komik yang belum ada di corpus, dan komik yang belum selesai
+diproses di run sebelumnya (ditunda deadline / dihentikan / detail gagal). State disimpan di
+sitemap_state.json (per shard kalau --shard):
+
+    {"since": "<lastmod terbaru yang sudah diproses>", "pending": [url, ...],
+     "sitemaps": {"<loc>": "<lastmod>"}}
+
+Kalau tidak ada sitemap, scraper kembali ke paginasi halaman list.
+
+    python sitemap.py check [--index URL] [--state FILE] [--http-mode replay --record-dir DIR]
+
+Fixture sitemap (bench/fixtures/sitemap) bisa dipasang sebagai rekaman
+transport.py supaya discovery jalan tanpa network:
+
+    python sitemap.py import-fixtures --record-dir DIR
+    python scrapemulti.py --discovery sitemap --http-mode replay --record-dir DIR
+
+Hasil discovery atas fixture dicek otomatis (exit 1 kalau ada yang beda):
+
+    python bench/check_sitemap.py
+"""
+import argparse, json, os, re, threading, time, zlib
+from datetime import datetime, timezone
+import xml.etree.ElementTree as ET
+import metrics, transport, shard, budget
+
+# === KONFIGURASI ===
+BASE_URL = "https://komikindo.ch"
+SITEMAP_URLS = (f"{BASE_URL}/sitemap_index.xml", f"{BASE_URL}/wp-sitemap.xml", f"{BASE_URL}/sitemap.xml")
+COMIC_SITEMAP = re.compile(r'(komik|manga|manhwa|manhua|series)[^/]*sitemap|sitemap[^/]*(komik|manga|manhwa|manhua|series)', re.I)
+STATE_PATH = "sitemap_state.json"
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench", "fixtures", "sitemap")
+CHUNK_SIZE = 65536
+
+def state_path(shard_spec=None):
+    if not shard_spec:
+        return STATE_PATH
+    return f"sitemap_state.shard-{shard_spec[0]}-of-{shard_spec[1]}.json"
+
+def parse_lastmod(value):
+    """'2025-03-01T10:00:00+07:00' / '2025-03-01' -> datetime UTC, None kalau tidak valid"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def is_comic(url):
+    """URL halaman detail komik (bukan chapter, bukan arsip /komik/)"""
+    return metrics.page_type(url) == "detail" and re.search(r'/komik/[^/?#]+', url) is not None
+
+def title_from_url(url):
+    """Perkiraan title dari slug (seperti fallback extract_title_from_list)"""
+    match = re.search(r'/komik/([^/]+)/', url)
+    return match.group(1).replace('-', ' ').title() if match else url
+
+# === PARSER STREAMING ===
+def read_entries(url, session=None, headers=None):
+    """(tag, loc, lastmod) untuk setiap <sitemap> / <url>; None kalau tidak ada sitemap di url ini"""
+    start = time.perf_counter()
+    with transport.stream(url, session=session, headers=headers, timeout=30) as r:
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        parser = ET.XMLPullParser(events=("end",))
+        inflate = None
+        entries = []
+        for chunk in transport.iter_chunks(r, CHUNK_SIZE):
+            if inflate is None:
+                # .xml.gz tanpa Content-Encoding: decompress sendiri
+                inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if chunk[:2] == b'\x1f\x8b' else False
+            if inflate:
+                chunk = inflate.decompress(chunk)
+            try:
+                parser.feed(chunk)
+            except ET.ParseError:
+                return None  # bukan XML (mis. halaman HTML 200 untuk URL yang tidak ada)
+            for _, elem in parser.read_events():
+                tag = elem.tag.rsplit('}', 1)[-1]
+                if tag not in ("sitemap", "url"):
+                    continue
+                loc = lastmod = None
+                for child in elem:
+                    name = child.tag.rsplit('}', 1)[-1]
+                    if name == "loc":
+                        loc = (child.text or '').strip()
+                    elif name == "lastmod":
+                        lastmod = (child.text or '').strip()
+                if loc:
+                    entries.append((tag, loc, lastmod))
+                elem.clear()
+    metrics.record_response(url, time.perf_counter() - start)
+    return entries
+
+def find_index(session=None, headers=None, urls=None, printer=print):
+    """(url, entries) sitemap pertama yang ada; robots.txt dicek dulu kalau urls tidak diberikan"""
+    if urls:
+        candidates, urls = list(urls), []
+    else:
+        candidates, urls = [], SITEMAP_URLS
+    try:
+        if urls:
+            r = transport.fetch(f"{BASE_URL}/robots.txt", session=session, headers=headers)
+            if r.status_code == 200:
+                candidates += re.findall(r'(?im)^\s*sitemap:\s*(\S+)', r.text)
+    except Exception as e:
+        printer(f"   robots.txt tidak bisa dibaca: {e}")
+    for url in candidates + [u for u in urls if u not in candidates]:
+        try:
+            entries = read_entries(url, session, headers)
+        except Exception as e:
+            printer(f"   Sitemap {url}: {e}")
+            continue
+        if entries:
+            return url, entries
+    return None, None
+
+# === DISCOVERY ===
+class Discovery:
+    def __init__(self, path=STATE_PATH):
+        self.path = path
+        self.state = {"since": None, "pending": [], "sitemaps": {}}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.state.update(json.load(f))
+        self.queued = set()
+        self.done = set()
+        self.failed = set()
+        self.newest = parse_lastmod(self.state["since"])
+        self.sitemaps = dict(self.state["sitemaps"])
+        self.lock = threading.Lock()
+
+    def run(self, existing_comics, shard_spec=None, session=None, headers=None, printer=print, index=None):
+        """List komik seperti scrape_all_pages(), atau None kalau tidak ada sitemap"""
+        index_url, entries = find_index(session, headers, [index] if index else None, printer)
+        if not entries:
+            return None
+        since = parse_lastmod(self.state["since"])
+        children = [(loc, lastmod) for tag, loc, lastmod in entries if tag == "sitemap"]
+        urls = [(loc, lastmod) for tag, loc, lastmod in entries if tag == "url"]
+        skipped = 0
+        if children:
+            wanted = [c for c in children if COMIC_SITEMAP.search(c[0])] or children
+            for loc, lastmod in wanted:
+                if since and lastmod and self.state["sitemaps"].get(loc) == lastmod:
+                    skipped += 1  # isi sitemap tidak berubah sejak run sebelumnya
+                    continue
+                try:
+                    child = read_entries(loc, session, headers) or []
+                except Exception as e:
+                    printer(f"   Sitemap {loc}: {e}")
+                    continue
+                urls += [(u, m) for tag, u, m in child if tag == "url"]
+                self.sitemaps[loc] = lastmod
+
+        pending = set(self.state["pending"])
+        urls += [(url, None) for url in sorted(pending)]  # bisa ada di sitemap yang dilewati
+        found, seen = [], set()
+        for url, lastmod in urls:
+            if not is_comic(url) or url in seen:
+                continue
+            seen.add(url)
+            if shard_spec and not shard.owns(url, shard_spec):
+                continue
+            modified = parse_lastmod(lastmod)
+            if modified and (self.newest is None or modified > self.newest):
+                self.newest = modified
+            record = existing_comics.get(url)
+            changed = since is None or modified is None or modified > since
+            if not (changed or record is None or url in pending):
+                continue
+            found.append({
+                "title": (record.get('title') if record else None) or title_from_url(url),
+                "url": url,
+                "scraped_at": metrics.now(),
+                "lastmod": lastmod,
+                "guessed_title": not (record and record.get('title')),
+                "latest_chapter": None,
+                "latest_date": None,
+            })
+        # Paling baru berubah dulu (dipakai schedule.freshness lewat position)
+        found.sort(key=lambda c: parse_lastmod(c['lastmod']) or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
+        for position, comic in enumerate(found):
+            comic['position'] = position
+        self.queued = {c['url'] for c in found}
+        printer(f"[{metrics.now()}] Sitemap {index_url}: {len(seen)} komik, {len(found)} diantrekan "
+                f"(berubah sejak {self.state['since'] or 'awal'}, baru, atau tertunda)"
+                + (f", {skipped} sitemap tidak berubah dilewati" if skipped else ""))
+        return found
+
+    def mark_done(self, url):
+        with self.lock:
+            self.done.add(url)
+
+    def mark_failed(self, url):
+        with self.lock:
+            self.failed.add(url)
+
+    def save(self, printer=print):
+        deferred = {item['url'] for item in budget.BUDGET.deferred}
+        with self.lock:
+            pending = sorted((self.queued - self.done) | (self.queued & deferred) | self.failed
+                             | (set(self.state["pending"]) - self.done - self.queued))
+        state = {"since": self.newest.isoformat() if self.newest else None, "pending": pending,
+                 "sitemaps": self.sitemaps, "updated_at": metrics.now()}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+        printer(f"   Sitemap state: since {state['since']}, {len(pending)} komik tertunda → {self.path}")
+
+# === HELPER UNTUK SCRIPT ===
+DISCOVERY = None
+
+def discover(existing_comics, shard_spec=None, session=None, headers=None, printer=print):
+    global DISCOVERY
+    DISCOVERY = Discovery(state_path(shard_spec))
+    found = DISCOVERY.run(existing_comics, shard_spec, session, headers, printer)
+    if found is None:
+        DISCOVERY = None
+    return found
+
+def done(url):
+    if DISCOVERY is not None:
+        DISCOVERY.mark_done(url)
+
+def retry(url):
+    """Detail gagal diakses: tetap tertunda walaupun sitemap-nya nanti dilewati"""
+    if DISCOVERY is not None:
+        DISCOVERY.mark_failed(url)
+
+def finish(printer=print):
+    if DISCOVERY is not None:
+        DISCOVERY.save(printer)
+
+def import_fixtures(record_dir, fixture_dir=FIXTURE_DIR, printer=print):
+    """Pasang file fixture sebagai rekaman transport untuk BASE_URL/<nama file>"""
+    for name in sorted(os.listdir(fixture_dir)):
+        with open(os.path.join(fixture_dir, name), 'rb') as f:
+            content = f.read()
+        content_type = "text/plain" if name.endswith('.txt') else "application/xml"
+        transport.write_record(record_dir, f"{BASE_URL}/{name}", 200, {"content-type": content_type}, content)
+        printer(f"   {BASE_URL}/{name}")
+
+# === CLI ===
+def main():
+    parser = argparse.ArgumentParser(description="Cek discovery sitemap tanpa scraping")
+    sub = parser.add_subparsers(dest='command', required=True)
+    ck = sub.add_parser('check', help='Tampilkan komik yang akan diantrekan (state tidak diubah)')
+    ck.add_argument('--index', help='URL sitemap index (default: robots.txt lalu lokasi umum)')
+    ck.add_argument('--state', default=STATE_PATH)
+    ck.add_argument('--dir', default="comics", help='Corpus untuk menandai komik baru')
+    ck.add_argument('--http-mode', choices=transport.MODES, default='live')
+    ck.add_argument('--record-dir', default=transport.RECORD_DIR)
+    fx = sub.add_parser('import-fixtures', help=f'Pasang fixture {FIXTURE_DIR} sebagai rekaman {BASE_URL}/<nama>')
+    fx.add_argument('--record-dir', default=transport.RECORD_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'import-fixtures':
+        import_fixtures(args.record_dir)
+        return
+
+    import model
+    transport.configure(args.http_mode, args.record_dir)
+    discovery = Discovery(args.state)
+    existing = model.load_dir(args.dir) if os.path.isdir(args.dir) else {}
+    found = discovery.run(existing, printer=print, index=args.index)
+    if found is None:
+        print("Tidak ada sitemap; scraper akan memakai paginasi halaman list")
+        return
+    for comic in found[:50]:
+        print(f"   {comic['lastmod'] or '-':25} {comic['url']}{' (baru)' if comic['guessed_title'] else ''}")
+    if len(found) > 50:
+        print(f"   ... dan {len(found) - 50} lainnya")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Transport HTTP di bawah get()/soup(): live, record, atau replay.
+
+- live   : request biasa ke situs (perilaku lama)
+- record : request live, lalu simpan pasangan request -> response ke RECORD_DIR
+- replay : tidak ada network sama sekali, response dilayani dari rekaman
+
+Backend request live/record:
+- requests : perilaku lama, HTTP/1.1, satu request per koneksi pada satu waktu
+- httpx    : satu httpx.Client bersama untuk semua thread dengan HTTP/2, jadi
+             request chapter paralel di-multiplex di satu koneksi per host
+             (butuh pip install 'httpx[http2]')
+
+Kedua backend mengirim Accept-Encoding br/gzip (br hanya kalau paket brotli
+terpasang, supaya body bisa di-decode) dan mencatat byte di kabel vs byte
+setelah decode per page type (metrics scraper_wire_bytes_total dan
+scraper_decoded_bytes_total).
+
+Rekaman disimpan per URL sebagai file gzip: satu baris JSON metadata
+(url, status, header penting, durasi asli) lalu body mentah.
+
+    python transport.py ls [--record-dir DIR]
+    python transport.py import URL FILE.html [--record-dir DIR]
+"""
+import argparse, gzip, hashlib, json, os, random, sys, threading, time
+from contextlib import contextmanager
+import requests
+import metrics
+
+try:
+    import httpx
+except ImportError:  # opsional, hanya untuk --backend httpx
+    httpx = None
+
+try:
+    import brotli  # dipakai urllib3 / httpx untuk decode Content-Encoding: br
+except ImportError:
+    brotli = None
+
+# === KONFIGURASI ===
+MODES = ("live", "record", "replay")
+BACKENDS = ("requests", "httpx")
+ACCEPT_ENCODING = "br, gzip" if brotli else "gzip, deflate"
+MAX_CONNECTIONS = 20  # httpx: batas koneksi di pool (HTTP/2 cukup satu per host)
+RECORD_DIR = "recordings"
+KEPT_HEADERS = ("content-type", "content-length", "content-encoding", "etag", "last-modified", "date")
+
+def record_path(record_dir, url):
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return os.path.join(record_dir, key[:2], f"{key}.gz")
+
+# === RESPONSE DARI REKAMAN ===
+class RecordedResponse:
+    """Pengganti requests.Response secukupnya untuk get() di scraper"""
+
+    def __init__(self, url, status_code, headers, content, elapsed=0.0, recorded_at=None):
+        self.url = url
+        self.recorded_at = recorded_at  # '%Y-%m-%d %H:%M:%S' waktu lokal saat direkam
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.content = content
+        self.elapsed_seconds = elapsed
+        self.encoding = requests.utils.get_encoding_from_headers(self.headers)
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def iter_content(self, chunk_size=8192):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error (replay) for url: {self.url}", response=self)
+
+def write_record(record_dir, url, status_code, headers, content, elapsed=0.0):
+    path = record_path(record_dir, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    meta = {
+        "url": url,
+        "status": status_code,
+        "headers": {k: v for k, v in headers.items() if k.lower() in KEPT_HEADERS},
+        "elapsed": round(elapsed, 4),
+        "recorded_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with gzip.open(tmp, 'wb') as f:
+        f.write(json.dumps(meta, ensure_ascii=False).encode('utf-8') + b'\n')
+        f.write(content)
+    os.replace(tmp, path)
+    return path
+
+def read_record(record_dir, url):
+    path = record_path(record_dir, url)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, 'rb') as f:
+        meta = json.loads(f.readline())
+        content = f.read()
+    return RecordedResponse(meta["url"], meta["status"], meta["headers"], content, meta.get("elapsed", 0.0),
+                            meta.get("recorded_at"))
+
+# === BYTE DI KABEL ===
+def wire_bytes(r):
+    """Byte body yang lewat network (sebelum decode gzip/br); None kalau tidak diketahui (replay)"""
+    if httpx is not None and isinstance(r, httpx.Response):
+        return r.num_bytes_downloaded
+    raw = getattr(r, 'raw', None)
+    if raw is not None and hasattr(raw, 'tell'):
+        return raw.tell()  # urllib3: byte yang dibaca dari socket
+    return None
+
+def protocol(r):
+    if httpx is not None and isinstance(r, httpx.Response):
+        return r.http_version
+    version = getattr(getattr(r, 'raw', None), 'version', None)
+    return {10: "HTTP/1.0", 11: "HTTP/1.1", 20: "HTTP/2"}.get(version, "unknown")
+
+def iter_chunks(r, chunk_size):
+    """Body yang sudah di-decode (gzip/br) per chunk, untuk response requests, httpx, atau rekaman"""
+    if httpx is not None and isinstance(r, httpx.Response):
+        return r.iter_bytes(chunk_size)
+    return r.iter_content(chunk_size)
+
+def record_transfer(url, r):
+    wire = wire_bytes(r)
+    if wire is None:
+        return
+    metrics.record_transfer(url, wire, len(r.content), r.headers.get('content-encoding') or "identity", protocol(r))
+
+def make_client(http2=True, prior_knowledge=False):
+    """httpx.Client bersama; prior_knowledge = HTTP/2 tanpa TLS (h2c), untuk server test lokal"""
+    if httpx is None:
+        raise ValueError("Backend httpx butuh paket httpx: pip install 'httpx[http2]'")
+    try:
+        return httpx.Client(http1=not prior_knowledge, http2=http2, follow_redirects=True,
+                            limits=httpx.Limits(max_connections=MAX_CONNECTIONS))
+    except ImportError as e:  # http2=True tanpa paket h2
+        raise ValueError(f"HTTP/2 butuh paket h2: pip install 'httpx[http2]' ({e})")
+
+# === RATE LIMIT ===
+class RateLimiter:
+    """Token bucket sederhana: rata-rata `rate` request/detik, burst kecil"""
+
+    def __init__(self, rate, burst=1.0):
+        self.rate = rate
+        self.capacity = max(burst, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+            metrics.inc("scraper_sleep_seconds_total", wait)
+        return wait
+
+# === TRANSPORT ===
+class Transport:
+    def __init__(self, mode="live", record_dir=RECORD_DIR, latency=0.0, jitter=0.0, rate=None,
+                 backend="requests", client=None):
+        if mode not in MODES:
+            raise ValueError(f"Mode HTTP tidak dikenal: {mode}")
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend HTTP tidak dikenal: {backend}")
+        self.mode = mode
+        self.record_dir = record_dir
+        self.latency = latency      # detik, atau "recorded" = pakai durasi asli saat direkam
+        self.jitter = jitter
+        self.limiter = RateLimiter(rate) if rate else None
+        self.backend = backend
+        self.client = client
+        if backend == "httpx" and client is None and mode != "replay":
+            self.client = make_client()
+
+    def fetch(self, url, session=None, headers=None, timeout=15):
+        """Sama seperti requests.get / session.get, tapi lewat mode transport"""
+        if self.limiter:
+            self.limiter.acquire()
+        if self.mode == "replay":
+            r = read_record(self.record_dir, url)
+            if r is None:
+                raise requests.ConnectionError(f"Tidak ada rekaman untuk {url}")
+            delay = r.elapsed_seconds if self.latency == "recorded" else float(self.latency)
+            if self.jitter:
+                delay += random.uniform(0, self.jitter)
+            if delay > 0:
+                time.sleep(delay)
+            return r
+
+        start = time.perf_counter()
+        headers = {"Accept-Encoding": ACCEPT_ENCODING, **(headers or {})}
+        if self.client is not None:
+            if session is not None:  # header session requests (scrapemulti) ikut dikirim
+                headers = {k: v for k, v in {**session.headers, **headers}.items() if k.lower() != "connection"}
+            r = self.client.get(url, headers=headers, timeout=timeout)
+        else:
+            r = (session or requests).get(url, headers=headers, timeout=timeout)
+        record_transfer(url, r)
+        if self.mode == "record":
+            write_record(self.record_dir, url, r.status_code, r.headers, r.content, time.perf_counter() - start)
+        return r
+
+    @contextmanager
+    def stream(self, url, session=None, headers=None, timeout=15):
+        """Response yang body-nya belum dibaca (iter_chunks); berhenti membaca lalu
+        keluar dari with = koneksi ditutup. Replay dan record membaca body penuh."""
+        if self.mode != "live":
+            yield self.fetch(url, session=session, headers=headers, timeout=timeout)
+            return
+        if self.limiter:
+            self.limiter.acquire()
+        headers = {"Accept-Encoding": ACCEPT_ENCODING, **(headers or {})}
+        if self.client is not None:
+            if session is not None:
+                headers = {k: v for k, v in {**session.headers, **headers}.items() if k.lower() != "connection"}
+            with self.client.stream("GET", url, headers=headers, timeout=timeout) as r:
+                yield r
+            return
+        r = (session or requests).get(url, headers=headers, timeout=timeout, stream=True)
+        try:
+            yield r
+        finally:
+            r.close()
+
+# === HELPER UNTUK SCRIPT ===
+TRANSPORT = Transport()
+
+def parse_latency(value):
+    """'recorded' atau angka detik (>= 0)"""
+    if value == "recorded":
+        return value
+    latency = float(value)
+    if latency < 0:
+        raise ValueError("latency tidak boleh negatif")
+    return latency
+
+def configure(mode="live", record_dir=RECORD_DIR, latency=0.0, jitter=0.0, rate=None, backend="requests"):
+    global TRANSPORT
+    TRANSPORT = Transport(mode, record_dir, latency, jitter, rate, backend)
+
+def fetch(url, session=None, headers=None, timeout=15):
+    return TRANSPORT.fetch(url, session=session, headers=headers, timeout=timeout)
+
+def stream(url, session=None, headers=None, timeout=15):
+    return TRANSPORT.stream(url, session=session, headers=headers, timeout=timeout)
+
+# === CLI ===
+def main():
+    parser = argparse.ArgumentParser(description="Kelola rekaman HTTP untuk mode replay")
+    parser.add_argument('--record-dir', default=RECORD_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('ls', help='Daftar URL yang sudah direkam')
+    imp = sub.add_parser('import', help='Tambah rekaman dari file HTML lokal (mis. fixture)')
+    imp.add_argument('url')
+    imp.add_argument('file')
+    imp.add_argument('--status', type=int, default=200)
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        with open(args.file, 'rb') as f:
+            content = f.read()
+        path = write_record(args.record_dir, args.url, args.status,
+                            {"content-type": "text/html; charset=UTF-8"}, content)
+        print(f"{args.url} -> {path}")
+        return
+
+    total = 0
+    for dirpath, _, files in os.walk(args.record_dir):
+        for name in sorted(files):
+            if not name.endswith('.gz'):
+                continue
+            with gzip.open(os.path.join(dirpath, name), 'rb') as f:
+                meta = json.loads(f.readline())
+            print(f"{meta['status']}  {meta.get('recorded_at', '')}  {meta['url']}")
+            total += 1
+    print(f"Total: {total} rekaman", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Daemon watch: cek ulang setiap komik sesuai ritme rilisnya sendiri.
+
+Run biasa mengecek semua komik sama rata. Di sini setiap komik punya jadwal:
+
+- cadence : jarak rata-rata antar chapter. Awalnya dari tanggal chapter
+            ('3 hari yang lalu') yang di-resolve terhadap waktu tanggal itu
+            dibaca (dated_at chapter, record lama scraped_at; 10 chapter
+            terakhir); setelah daemon sendiri melihat rilis baru
+            minimal MIN_OBSERVED kali, dari waktu pengamatan itu.
+- due     : rilis terakhir + cadence (komik mingguan dicek sekitar hari
+            rilisnya). Kalau sudah lewat tapi belum ada chapter, dicek lagi
+            tiap cadence / LATE_CHECKS; kalau sudah lebih dari DORMANT x cadence
+            tanpa chapter baru, jeda mundur ke (sejak rilis terakhir) / 4,
+            maksimal MAX_INTERVAL.
+
+Komik diambil dari heap berurutan due. Pengecekan memakai process_comic()
+(halaman detail + chapter yang belum ada), record selalu dibaca ulang dari
+disk supaya tidak menimpa hasil run lain. Request per jam dibatasi
+--hourly-budget (dihitung dari scraper_requests_total): sisa budget ikut
+diteruskan sebagai batas fetch chapter, chapter yang tidak kebagian diambil
+begitu budget tersedia lagi; kalau habis, daemon menunggu sampai request
+lama keluar dari jendela 1 jam. Jadwal disimpan di
+watch_state.json (bersama request jam terakhir) sehingga restart
+melanjutkan jadwal dan budget yang sama:
+
+    {"comics": {"<url>": {"due": epoch, "checked": epoch, "cadence": detik,
+                          "last_release": epoch, "observed": [epoch, ...],
+                          "deferred": chapter yang ditunda budget}},
+     "spent": [[epoch, request], ...]}
+
+    python watch.py [--hourly-budget 300] [--plan]
+"""
+import heapq, json, os, signal, statistics, time
+from collections import deque
+from datetime import datetime
+import metrics, transport, html_cache, extract_plan, chapterstream, schedule, changefeed, searchindex, dedup
+from cli import build_parser, request_rate
+from scrape import now, get_all_existing_comics, load_existing_comic, process_comic, flush_in_progress
+
+# === KONFIGURASI ===
+STATE_PATH = "watch_state.json"
+HOURLY_BUDGET = 300
+HISTORY = 10              # chapter / pengamatan terakhir untuk cadence
+MIN_OBSERVED = 3
+DEFAULT_CADENCE = 7 * 86400
+MIN_INTERVAL = 3600
+MAX_INTERVAL = 30 * 86400
+LATE_CHECKS = 4           # cek per cadence setelah rilis terlambat
+DORMANT = 3               # x cadence tanpa chapter = komik tidur, backoff
+SAVE_EVERY = 10           # simpan state tiap N pengecekan
+MIN_DEFERRED = 60         # jeda minimal sebelum melanjutkan chapter yang ditunda budget
+
+# === CADENCE ===
+def cadence_of(record, entry):
+    """Jarak rata-rata antar chapter dalam detik"""
+    observed = sorted(entry.get('observed', []))[-HISTORY:]
+    if len(observed) >= MIN_OBSERVED:
+        gaps = [b - a for a, b in zip(observed, observed[1:])]
+        return min(max(statistics.median(gaps), MIN_INTERVAL), MAX_INTERVAL)
+    releases = schedule.release_times(record)[:HISTORY]
+    if len(releases) < 2:
+        return DEFAULT_CADENCE
+    # Tanggal 'bulan' / 'tahun' kasar: rentang minimal sebesar ketelitian tanggal terbaru
+    span = max(releases[0][0] - releases[-1][0], releases[0][1])
+    return min(max(span / (len(releases) - 1), MIN_INTERVAL), MAX_INTERVAL)
+
+def next_due(entry, at):
+    """Waktu cek berikutnya dari cadence dan rilis terakhir"""
+    cadence, last = entry['cadence'], entry.get('last_release')
+    if last is None:
+        return at + cadence
+    expected = last + cadence
+    if expected > at:
+        due = expected  # sekitar hari rilis berikutnya
+    elif at - last < DORMANT * cadence:
+        due = at + cadence / LATE_CHECKS  # terlambat: cek lebih rapat
+    else:
+        due = at + min((at - last) / 4, MAX_INTERVAL)  # tidur: mundur
+    if not entry.get('checked'):
+        # Belum pernah dicek daemon: tanggal chapter bisa basi (scraped_at lama), cek minimal sekali per cadence
+        return min(due, at + cadence)
+    return max(due, at + MIN_INTERVAL)
+
+def plan_entry(record, entry=None):
+    entry = dict(entry or {})
+    releases = schedule.release_times(record)
+    if releases:
+        entry['last_release'] = max(entry.get('last_release') or 0, releases[0][0])
+    entry['cadence'] = cadence_of(record, entry)
+    if 'due' not in entry:
+        entry['due'] = next_due(entry, time.time())
+    return entry
+
+# === BUDGET PER JAM ===
+class HourlyBudget:
+    """Jendela geser 1 jam atas jumlah request yang sudah dipakai"""
+
+    def __init__(self, limit, spent=()):
+        self.limit = limit
+        self.spent = deque(tuple(item) for item in spent)  # (epoch, request)
+
+    def used(self, at):
+        while self.spent and self.spent[0][0] <= at - 3600:
+            self.spent.popleft()
+        return sum(n for _, n in self.spent)
+
+    def wait(self, at):
+        """Detik sampai ada sisa budget untuk satu pengecekan (0 = boleh sekarang)"""
+        used = self.used(at)
+        if used < self.limit:
+            return 0.0
+        # Tunggu sampai request lama yang cukup keluar dari jendela
+        freed = 0
+        for when, n in self.spent:
+            freed += n
+            if used - freed < self.limit:
+                return when + 3600 - at
+        return 3600.0
+
+    def add(self, at, requests):
+        if requests:
+            self.spent.append((at, requests))
+
+# === STATE ===
+def load_state(path):
+    if not os.path.exists(path):
+        return {"comics": {}, "spent": []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(state, hourly, path):
+    hourly.used(time.time())  # buang request yang sudah lewat 1 jam
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({"comics": state, "spent": list(hourly.spent)}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def describe(entry, at):
+    def days(seconds):
+        return f"{seconds / 86400:.1f} hari" if seconds >= 86400 else f"{seconds / 3600:.1f} jam"
+    return f"cadence {days(entry['cadence'])}, cek lagi {'sekarang' if entry['due'] <= at else 'dalam ' + days(entry['due'] - at)}"
+
+# === DAEMON ===
+def newest_number(record):
+    numbers = (schedule.chapter_number(ch.get('number')) for ch in record.get('chapters', []))
+    return max((n for n in numbers if n is not None), default=None)
+
+def check(url, entry, existing_comics, remaining):
+    """Satu pengecekan dengan sisa budget `remaining` request (1 untuk halaman
+    detail, sisanya chapter); return (chapter baru, nomor terbaru naik,
+    request terpakai, chapter ditunda)"""
+    record = load_existing_comic(url) or existing_comics[url]
+    existing_comics[url] = record
+    before, newest = len(record.get('chapters', [])), newest_number(record)
+    requests_before = metrics.REGISTRY.value("scraper_requests_total")
+    print(f"\n[{now()}] Cek {record['title']} ({describe(entry, time.time())})")
+    deferred = process_comic({"title": record['title'], "url": url}, existing_comics, max_chapters=max(remaining - 1, 0))
+    record = existing_comics.get(url, record)
+    after = newest_number(record)
+    released = after is not None and (newest is None or after > newest)
+    return (len(record.get('chapters', [])) - before, released,
+            int(metrics.REGISTRY.value("scraper_requests_total") - requests_before), deferred or 0)
+
+def run(state, existing_comics, hourly, state_path, totals):
+    heap = [(entry['due'], url) for url, entry in state.items()]
+    heapq.heapify(heap)
+    unsaved = 0
+    while heap:
+        due, url = heap[0]
+        at = time.time()
+        wait = max(due - at, hourly.wait(at))
+        if wait > 0:
+            if unsaved:
+                save_state(state, hourly, state_path)
+                unsaved = 0
+            time.sleep(min(wait, 60))
+            continue
+        heapq.heappop(heap)
+        if url not in existing_comics:
+            state.pop(url, None)
+            continue
+        new, released, spent, deferred = check(url, state[url], existing_comics, hourly.limit - hourly.used(at))
+        at = time.time()
+        hourly.add(at, spent)
+        metrics.inc("scraper_watch_checks_total", result="baru" if new > 0 else "sama")
+        entry = state[url]
+        entry['checked'] = at
+        totals['chapters'] += max(new, 0)
+        # Hanya rilis baru yang jadi pengamatan cadence; backfill chapter lama dan
+        # lanjutan chapter yang ditunda budget tidak
+        if released and not entry.get('deferred'):
+            entry['last_release'] = at
+            entry['observed'] = (entry.get('observed', []) + [at])[-HISTORY:]
+        entry = plan_entry(existing_comics[url], {k: v for k, v in entry.items() if k not in ('due', 'deferred')})
+        if deferred:
+            entry['deferred'] = deferred
+            # Chapter tertunda karena budget: lanjutkan begitu budget tersedia lagi
+            entry['due'] = at + max(hourly.wait(at), MIN_DEFERRED)
+        state[url] = entry
+        heapq.heappush(heap, (entry['due'], url))
+        totals['checks'] += 1
+        print(f"[{now()}]    {'+' + str(new) + ' chapter, ' if new > 0 else ''}{describe(entry, at)}; "
+              f"{hourly.used(at)}/{hourly.limit} request dalam 1 jam terakhir")
+        unsaved += 1
+        if unsaved >= SAVE_EVERY:
+            save_state(state, hourly, state_path)
+            unsaved = 0
+
+# === MAIN ===
+def main():
+    parser = build_parser("Daemon watch dengan jadwal cek per komik")
+    parser.add_argument('--hourly-budget', type=int, default=HOURLY_BUDGET, metavar='N',
+                        help=f'Maksimum request per jam (default {HOURLY_BUDGET})')
+    parser.add_argument('--state', default=STATE_PATH, help=f'File jadwal (default {STATE_PATH})')
+    parser.add_argument('--plan', action='store_true', help='Tampilkan jadwal terdekat lalu keluar')
+    args = parser.parse_args()
+    # scrape.py memasang handler Ctrl+C miliknya sendiri saat di-import
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    metrics.configure(args.metrics_out, args.metrics_interval)
+    transport.configure(args.http_mode, args.record_dir, args.replay_latency, args.replay_jitter, request_rate(args),
+                        args.backend)
+    html_cache.configure(args.html_cache, args.cache_policy, args.cache_max_mb, args.cache_max_age)
+    chapterstream.configure(args.stream_chapters)
+    changefeed.configure(args.feed_dir)
+    searchindex.configure(args.search_index)
+    dedup.configure(args.dedup)
+
+    existing_comics = get_all_existing_comics()
+    saved = load_state(args.state)
+    state = {url: plan_entry(record, saved["comics"].get(url)) for url, record in existing_comics.items()}
+    hourly = HourlyBudget(args.hourly_budget, saved.get("spent", []))
+    at = time.time()
+    due_now = sum(entry['due'] <= at for entry in state.values())
+    print(f"[{now()}] Watch {len(state)} komik ({len(saved['comics'])} dari state), {due_now} jatuh tempo, "
+          f"budget {args.hourly_budget} request/jam ({hourly.used(at)} terpakai)")
+    if args.plan:
+        for url, entry in sorted(state.items(), key=lambda item: item[1]['due'])[:30]:
+            print(f"   {datetime.fromtimestamp(entry['due']).strftime('%Y-%m-%d %H:%M')}  "
+                  f"{existing_comics[url]['title'][:50]:50} {describe(entry, at)}")
+        return
+
+    totals = {"checks": 0, "chapters": 0}
+    try:
+        run(state, existing_comics, hourly, args.state, totals)
+    except KeyboardInterrupt:
+        print(f"\n[{now()}] Dihentikan, simpan jadwal")
+        flush_in_progress()
+    save_state(state, hourly, args.state)
+    print(f"[{now()}] {totals['checks']} pengecekan, {totals['chapters']} chapter baru; jadwal tersimpan di {args.state}")
+    changefeed.finish(print)
+    extract_plan.report(print)
+    chapterstream.report(print)
+    metrics.finish(print)
+
+if __name__ == "__main__":
+    main()